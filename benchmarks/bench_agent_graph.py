@@ -0,0 +1,80 @@
+"""
+Micro-benchmark: per-lead overhead of building the LangGraph workflow.
+
+Compares rebuilding and compiling the graph for every lead (the old
+``run_agent`` behaviour) against reusing the cached compiled agent.
+Generation is stubbed out so only graph overhead is measured.
+
+Usage:
+    python -m benchmarks.bench_agent_graph [--leads 500]
+"""
+
+import argparse
+import time
+
+from src.agent import create_sms_graph, get_agent
+from src.agent.graph import _initial_state
+from src.models import Lead
+
+
+class StubGroqClient:
+    """Returns a fixed message without any network I/O."""
+
+    def generate(self, system_prompt: str, user_prompt: str) -> str:
+        return "Hey! Still interested? Reply YES to hold one for you."
+
+
+def make_leads(count: int) -> list:
+    """Build synthetic first-contact leads."""
+    return [
+        Lead(row_number=i + 2, name=f"Lead {i}", phone="+15550000000", product="Air Fryer")
+        for i in range(count)
+    ]
+
+
+def bench_rebuild(leads: list, client) -> float:
+    """Compile a new graph for every lead."""
+    start = time.perf_counter()
+    for lead in leads:
+        create_sms_graph(client).invoke(_initial_state(lead))
+    return time.perf_counter() - start
+
+
+def bench_cached(leads: list, client) -> float:
+    """Reuse one compiled agent for every lead."""
+    start = time.perf_counter()
+    agent = get_agent(client)
+    for lead in leads:
+        agent.invoke(lead)
+    return time.perf_counter() - start
+
+
+def bench_batch(leads: list, client) -> float:
+    """Run all leads through the cached agent's batch API."""
+    start = time.perf_counter()
+    get_agent(client).batch(leads)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--leads", type=int, default=500)
+    args = parser.parse_args()
+
+    leads = make_leads(args.leads)
+    client = StubGroqClient()
+
+    results = {
+        "rebuild per lead": bench_rebuild(leads, client),
+        "cached agent": bench_cached(leads, client),
+        "cached agent (batch)": bench_batch(leads, client),
+    }
+
+    print(f"{args.leads} leads")
+    for name, elapsed in results.items():
+        per_lead_ms = elapsed / args.leads * 1000
+        print(f"  {name:<22} {elapsed:8.3f}s  {per_lead_ms:8.3f} ms/lead")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Startup benchmark: import time of the CLI and its packages.
+
+Runs ``python -X importtime -c "import <module>"`` in fresh interpreters,
+reports the best cumulative import time of each module with its slowest
+dependencies, and fails (exit status 1) when ``main`` goes over the budget
+or loads a heavy SDK at import time. Keeps short cron runs and ``--help``
+fast as the code grows.
+
+Usage:
+    python -m benchmarks.bench_import_time [--budget-ms 150] [--runs 5] [--top 8]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+
+MODULES = ["main", "src.config", "src.utils", "src.services", "src.agent"]
+
+# SDKs that must only load when a service is actually used
+HEAVY = ["gspread", "google.auth", "twilio", "httpx", "langgraph", "langchain_core"]
+
+
+def import_times(module: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Import ``module`` in a fresh interpreter and parse ``-X importtime``.
+
+    Returns:
+        Imported module name -> (self, cumulative) microseconds
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def best_of(module: str, runs: int) -> Dict[str, Tuple[int, int]]:
+    """The run with the lowest total import time (least OS noise)."""
+    samples = [import_times(module) for _ in range(runs)]
+    return min(samples, key=lambda times: times[module][1])
+
+
+def slowest(times: Dict[str, Tuple[int, int]], top: int) -> List[Tuple[str, int]]:
+    """Modules with the most self time."""
+    ranked = sorted(times.items(), key=lambda item: item[1][0], reverse=True)
+    return [(name, own) for name, (own, _) in ranked[:top]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=150.0,
+                        help="Max cumulative import time of main")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports listed for main")
+    args = parser.parse_args()
+
+    failures = []
+    results = {module: best_of(module, args.runs) for module in MODULES}
+    print(f"  {'module':<16} {'import ms':>10}")
+    for module, times in results.items():
+        print(f"  {module:<16} {times[module][1] / 1000:>10.1f}")
+
+    main_times = results["main"]
+    print("\nSlowest imports under main (self ms):")
+    for name, own in slowest(main_times, args.top):
+        print(f"  {name:<40} {own / 1000:>8.1f}")
+
+    total_ms = main_times["main"][1] / 1000
+    if total_ms > args.budget_ms:
+        failures.append(f"main imports in {total_ms:.1f} ms (budget {args.budget_ms:g} ms)")
+    loaded = [name for name in HEAVY if name in main_times]
+    if loaded:
+        failures.append(f"main loads {', '.join(loaded)} at import time")
+
+    if failures:
+        print("\nFAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print(f"\nOK: main imports in {total_ms:.1f} ms (budget {args.budget_ms:g} ms)")
+
+
+if __name__ == "__main__":
+    main()
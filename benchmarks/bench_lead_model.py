@@ -0,0 +1,143 @@
+"""
+Benchmark: memory and speed of building and filtering leads.
+
+Builds leads from synthetic sheet rows with ``Lead.from_rows`` and runs
+the same derived-field accesses the sheet filters perform. A copy of the
+original (unslotted) Lead is included for comparison. Times are the best
+of three runs without tracing; memory is measured in a separate build.
+
+Usage:
+    python -m benchmarks.bench_lead_model [--rows 100000]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+from src.models import Lead
+
+
+@dataclass
+class LegacyLead:
+    """The Lead model before slots and precomputed fields."""
+
+    row_number: int
+    name: str
+    phone: str
+    product: str
+    last_visit: Optional[str] = None
+    sms_sent: Optional[str] = None
+    chat_history: Optional[str] = None
+
+    @property
+    def first_name(self) -> str:
+        return self.name.split()[0] if self.name else ""
+
+    @property
+    def has_been_contacted(self) -> bool:
+        return bool(self.sms_sent and self.sms_sent.strip())
+
+    @property
+    def has_chat_history(self) -> bool:
+        return bool(self.chat_history and self.chat_history.strip())
+
+    @property
+    def needs_followup(self) -> bool:
+        return self.has_chat_history
+
+    @classmethod
+    def from_row(cls, row_number: int, row_data: list) -> "LegacyLead":
+        def safe_get(index: int) -> Optional[str]:
+            try:
+                value = row_data[index]
+                return str(value).strip() if value else None
+            except IndexError:
+                return None
+
+        return cls(
+            row_number=row_number,
+            name=safe_get(0) or "",
+            phone=safe_get(1) or "",
+            product=safe_get(2) or "",
+            last_visit=safe_get(3),
+            sms_sent=safe_get(4),
+            chat_history=safe_get(5),
+        )
+
+    @classmethod
+    def from_rows(cls, rows: list, start_row: int = 2) -> list:
+        return [cls.from_row(i, row) for i, row in enumerate(rows, start=start_row) if row and row[0]]
+
+
+def make_rows(count: int) -> list:
+    """Synthetic sheet rows: a third contacted, a sixth with chat history."""
+    products = ["Air Fryer", "Standing Desk", "Road Bike", "Espresso Machine"]
+    rows = []
+    for i in range(count):
+        row = [f"Customer {i} Smith", f"+1555{i:07d}", products[i % len(products)], "2024-05-01"]
+        if i % 3 == 0:
+            row.append("Hey! Still interested?")
+            if i % 2 == 0:
+                row.append(
+                    "[2024-05-01 10:00] ASSISTANT: Hey! Still interested?\n"
+                    "[2024-05-01 12:30] CUSTOMER: Yes, what colours do you have?"
+                )
+        rows.append(row)
+    return rows
+
+
+def filter_pass(leads: list) -> int:
+    """Derived-field accesses done by the contact and follow-up filters."""
+    not_contacted = [lead for lead in leads if not lead.has_been_contacted]
+    followups = [lead for lead in leads if lead.needs_followup]
+    names = [lead.first_name for lead in not_contacted + followups]
+    return len(names)
+
+
+def measure(model, rows: list, repeat: int = 3) -> dict:
+    """Best-of-``repeat`` timings, then memory in a separate traced build."""
+    build_s = filter_s = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        leads = model.from_rows(rows)
+        build_s = min(build_s, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(2):  # contact + follow-up selection each run
+            filter_pass(leads)
+        filter_s = min(filter_s, time.perf_counter() - start)
+        del leads
+
+    # Timed separately: tracemalloc slows allocation-heavy code unevenly
+    gc.collect()
+    tracemalloc.start()
+    leads = model.from_rows(rows)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del leads
+
+    return {"build_s": build_s, "filter_s": filter_s, "mem_mb": current / 2**20, "peak_mb": peak / 2**20}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    print(f"{args.rows} rows")
+    print(f"  {'model':<12} {'build':>9} {'filters':>9} {'retained':>11} {'peak':>11}")
+    for label, model in (("legacy", LegacyLead), ("slotted", Lead)):
+        r = measure(model, rows)
+        print(
+            f"  {label:<12} {r['build_s']:8.3f}s {r['filter_s']:8.3f}s "
+            f"{r['mem_mb']:8.1f} MB {r['peak_mb']:8.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
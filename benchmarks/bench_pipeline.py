@@ -0,0 +1,265 @@
+"""
+End-to-end benchmark of the lead pipeline against in-process fake APIs.
+
+Drives ``run_agent``, ``process_lead`` (generate, send, queue write-back)
+and the full ``main.run`` over synthetic sheets of several sizes, with the
+Groq, Twilio and Sheets APIs replaced by fakes with configurable latency,
+error and 429 rates (see ``benchmarks.fakes``). Reports leads/sec, p50/p99
+per-lead latency and API call counts per service.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--sizes 10,100,1000] [--concurrency 8]
+        [--groq-latency 0.05] [--groq-429-rate 0.02] [--twilio-error-rate 0.01]
+"""
+
+import argparse
+import contextlib
+import io
+import threading
+import time
+from typing import Callable, Dict, List
+from unittest import mock
+
+import main as app
+from benchmarks.fakes import (
+    BenchGroqClient,
+    BenchSheetHandler,
+    BenchSMSSender,
+    FakeGroqAPI,
+    FakeTwilioClient,
+    FakeWorksheet,
+    Faults,
+    bench_settings,
+    make_sheet,
+)
+from src import services
+from src.agent import AgentOptions, run_agent
+from src.models import LeadSnapshot
+from src.services import SMSDispatcher
+from src.utils import WorkPlanner, bounded_map
+
+
+LEVELS = ("run_agent", "process_lead", "main")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Timer:
+    """Collects per-call latencies from concurrent workers."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self._lock = threading.Lock()
+
+    def wrap(self, fn: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self.latencies.append(elapsed)
+        return timed
+
+
+class Scenario:
+    """Fresh fakes and clients for one benchmark run."""
+
+    def __init__(self, args: argparse.Namespace, size: int):
+        self.settings = bench_settings(
+            twilio_messages_per_second=args.twilio_mps,
+            twilio_concurrency=args.concurrency,
+            groq_concurrency=args.concurrency,
+            llm_batch_size=args.batch_size,
+        )
+        self.groq_api = FakeGroqAPI(Faults(
+            latency=args.groq_latency, jitter=args.groq_latency / 2,
+            error_rate=args.groq_error_rate, rate_limit_rate=args.groq_429_rate,
+            retry_after=args.retry_after,
+        ), seed=args.seed)
+        self.twilio = FakeTwilioClient(Faults(
+            latency=args.twilio_latency, jitter=args.twilio_latency / 2,
+            error_rate=args.twilio_error_rate, rate_limit_rate=args.twilio_429_rate,
+            retry_after=args.retry_after,
+        ), seed=args.seed)
+        self.worksheet = FakeWorksheet(
+            make_sheet(size, args.followup_share, args.seed),
+            faults=Faults(latency=args.sheet_latency, error_rate=args.sheet_error_rate),
+            seed=args.seed,
+        )
+        self.groq_client = BenchGroqClient(self.settings, self.groq_api)
+        self.options = AgentOptions.from_settings(self.settings)
+        self.concurrency = args.concurrency
+        self.timer = Timer()
+
+    def planned(self) -> list:
+        """Planned ``(lead, E.164 phone)`` pairs of the synthetic sheet."""
+        snapshot = LeadSnapshot.from_rows(self.worksheet.rows)
+        return list(WorkPlanner().plan(snapshot.leads).items())
+
+    def leads(self) -> list:
+        return [lead for lead, _ in self.planned()]
+
+    def sheet_handler(self, settings=None, target=None) -> BenchSheetHandler:
+        return BenchSheetHandler(settings or self.settings, self.worksheet, target)
+
+    def sms_sender(self, settings=None) -> BenchSMSSender:
+        return BenchSMSSender(settings or self.settings, self.twilio)
+
+    def dispatcher(self) -> SMSDispatcher:
+        return SMSDispatcher(
+            self.sms_sender(),
+            self.settings.twilio_phone_numbers,
+            messages_per_second=self.settings.twilio_messages_per_second,
+            workers=self.settings.twilio_concurrency,
+            max_retries=self.settings.twilio_max_retries,
+        )
+
+    def close(self) -> None:
+        self.groq_client.close()
+
+
+def bench_run_agent(scenario: Scenario) -> int:
+    """Generation only: the agent graph against the fake Groq API."""
+    leads = scenario.leads()
+    work = scenario.timer.wrap(lambda lead: run_agent(lead, scenario.groq_client, scenario.options))
+    for _ in bounded_map(work, leads, scenario.concurrency):
+        pass
+    return len(leads)
+
+
+def bench_process_lead(scenario: Scenario) -> int:
+    """Generate, send through the dispatcher and queue the sheet write."""
+    planned = scenario.planned()
+    handler = scenario.sheet_handler()
+    handler.connect()
+    dispatcher = scenario.dispatcher()
+
+    def work(item):
+        lead, phone = item
+        outcome = app.process_lead(lead, phone, scenario.groq_client, dispatcher, handler,
+                                   options=scenario.options)
+        return app.finish_send(outcome, handler)
+
+    try:
+        for _ in bounded_map(scenario.timer.wrap(work), planned, scenario.concurrency):
+            pass
+    finally:
+        dispatcher.close()
+        handler.flush_updates()
+    return len(planned)
+
+
+def bench_main(scenario: Scenario) -> int:
+    """The full ``main.run`` pipeline (read, generate, send, write back)."""
+    leads = len(scenario.leads())
+    args = app.parse_args(["--concurrency", str(scenario.concurrency)])
+    # main imports services on first use, so patch them where they're looked up
+    with mock.patch.object(services, "SheetHandler", scenario.sheet_handler), \
+            mock.patch.object(services, "SMSSender", scenario.sms_sender), \
+            mock.patch.object(app, "process_lead", scenario.timer.wrap(app.process_lead)), \
+            contextlib.redirect_stdout(io.StringIO()):
+        app.run(scenario.settings, args, scenario.groq_client)
+    return leads
+
+
+BENCHES: Dict[str, Callable[[Scenario], int]] = {
+    "run_agent": bench_run_agent,
+    "process_lead": bench_process_lead,
+    "main": bench_main,
+}
+
+
+def run_level(level: str, size: int, args: argparse.Namespace) -> dict:
+    """Run one level on a fresh sheet and collect its metrics."""
+    scenario = Scenario(args, size)
+    try:
+        start = time.perf_counter()
+        leads = BENCHES[level](scenario)
+        elapsed = time.perf_counter() - start
+    finally:
+        scenario.close()
+
+    latencies = scenario.timer.latencies
+    return {
+        "level": level,
+        "size": size,
+        "leads": leads,
+        "elapsed": elapsed,
+        "leads_per_sec": leads / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "groq": scenario.groq_api.stats(),
+        "twilio": scenario.twilio.stats(),
+        "sheets": scenario.worksheet.stats(),
+    }
+
+
+def format_calls(stats: dict) -> str:
+    return f"{stats['calls']}({stats['rate_limited']}x429,{stats['error']}err)"
+
+
+def print_report(results: List[dict]) -> None:
+    print(
+        f"  {'level':<13}{'size':>6}{'leads/s':>10}{'p50 ms':>9}{'p99 ms':>9}"
+        f"  {'groq':<16}{'twilio':<16}sheets"
+    )
+    for r in results:
+        print(
+            f"  {r['level']:<13}{r['size']:>6}{r['leads_per_sec']:>10.1f}"
+            f"{r['p50_ms']:>9.1f}{r['p99_ms']:>9.1f}"
+            f"  {format_calls(r['groq']):<16}{format_calls(r['twilio']):<16}"
+            f"{format_calls(r['sheets'])}"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10,100,1000",
+                        help="Comma-separated sheet sizes (lead rows)")
+    parser.add_argument("--levels", default=",".join(LEVELS),
+                        help=f"Comma-separated subset of {', '.join(LEVELS)}")
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=1, help="LLM_BATCH_SIZE")
+    parser.add_argument("--followup-share", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+
+    parser.add_argument("--groq-latency", type=float, default=0.05)
+    parser.add_argument("--groq-error-rate", type=float, default=0.0)
+    parser.add_argument("--groq-429-rate", type=float, default=0.0)
+    parser.add_argument("--twilio-latency", type=float, default=0.02)
+    parser.add_argument("--twilio-error-rate", type=float, default=0.0)
+    parser.add_argument("--twilio-429-rate", type=float, default=0.0)
+    parser.add_argument("--twilio-mps", type=float, default=0.0,
+                        help="Per-number send limit (0 disables throttling)")
+    parser.add_argument("--sheet-latency", type=float, default=0.1)
+    parser.add_argument("--sheet-error-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=0.2,
+                        help="retry-after seconds on fake 429s")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+    levels = [level.strip() for level in args.levels.split(",")]
+    unknown = set(levels) - set(LEVELS)
+    if unknown:
+        raise SystemExit(f"Unknown levels: {', '.join(sorted(unknown))}")
+
+    results = [run_level(level, size, args) for size in sizes for level in levels]
+    print(f"concurrency {args.concurrency}, groq latency {args.groq_latency}s, "
+          f"twilio latency {args.twilio_latency}s, sheet latency {args.sheet_latency}s")
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()
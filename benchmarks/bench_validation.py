@@ -0,0 +1,116 @@
+"""
+Benchmark: validating and normalising a large column of leads.
+
+Compares the original per-lead checks (``is_valid_lead`` plus the
+character loops of ``format_phone`` for the dedup key and
+``SMSSender._format_phone`` at send time, run for every lead) with one
+``validate_leads`` pass over the whole batch, whose E.164 numbers serve
+both purposes. Copies of the original functions are included.
+
+Usage:
+    python -m benchmarks.bench_validation [--rows 1000000]
+"""
+
+import argparse
+import random
+import time
+from collections import Counter, namedtuple
+
+from src.utils import validate_leads
+
+
+Row = namedtuple("Row", "name phone product")
+
+
+def legacy_is_valid_phone(phone: str) -> bool:
+    digits = "".join(c for c in phone if c.isdigit())
+    return 10 <= len(digits) <= 15
+
+
+def legacy_is_valid_lead(lead) -> tuple[bool, str]:
+    if not lead.name or not lead.name.strip():
+        return False, "Lead missing name"
+    if not lead.phone or not legacy_is_valid_phone(lead.phone):
+        return False, f"Invalid phone for {lead.name}"
+    if not lead.product or not lead.product.strip():
+        return False, f"Lead {lead.name} missing product interest"
+    return True, ""
+
+
+def legacy_format_phone(phone: str) -> str:
+    return "".join(c for c in phone if c.isdigit())
+
+
+def legacy_to_e164(phone: str) -> str:
+    """``SMSSender._format_phone`` as it was (its "+" check never matched)."""
+    digits = "".join(c for c in phone if c.isdigit())
+    if not digits.startswith("+"):
+        digits = "+" + digits
+    return digits
+
+
+def make_rows(count: int, seed: int = 0) -> list:
+    """Lead rows with a realistic mix of phone formats and bad cells."""
+    rng = random.Random(seed)
+    formats = [
+        (0.50, lambda i: f"+1555{i % 10**7:07d}"),
+        (0.20, lambda i: f"(555) {i % 1000:03d}-{i % 10000:04d}"),
+        (0.10, lambda i: f"1.555.{i % 1000:03d}.{i % 10000:04d}"),
+        (0.08, lambda i: f"00 44 7700 {i % 10**6:06d}"),
+        (0.04, lambda i: ""),
+        (0.04, lambda i: "call after 5"),
+        (0.04, lambda i: f"{i % 10**5}"),
+    ]
+    rows = []
+    for i in range(count):
+        roll, cumulative = rng.random(), 0.0
+        for share, phone in formats:
+            cumulative += share
+            if roll < cumulative:
+                break
+        name = "" if i % 97 == 0 else f"Lead {i}"
+        rows.append(Row(name, phone(i), "Air Fryer"))
+    return rows
+
+
+def bench_legacy(rows: list) -> int:
+    """Per-lead validation, dedup key and send-time formatting."""
+    valid = 0
+    for row in rows:
+        ok, _ = legacy_is_valid_lead(row)
+        if ok:
+            legacy_format_phone(row.phone)
+            legacy_to_e164(row.phone)
+            valid += 1
+    return valid
+
+
+def bench_bulk(rows: list) -> int:
+    """One bulk pass: E.164 numbers (also the dedup key) and reasons."""
+    validation = validate_leads(rows)
+    return len(validation) - validation.rejected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    results = {}
+    for label, bench in (("per-lead (legacy)", bench_legacy), ("bulk validate_leads", bench_bulk)):
+        start = time.perf_counter()
+        valid = bench(rows)
+        elapsed = time.perf_counter() - start
+        results[label] = elapsed
+        print(f"  {label:<22} {elapsed:8.3f}s  {args.rows / elapsed / 1e6:6.2f}M rows/s  "
+              f"{valid} valid")
+
+    legacy, bulk = results.values()
+    print(f"\n  speedup: {legacy / bulk:.1f}x")
+    reasons = Counter(reason.value for reason in validate_leads(rows).reasons if reason)
+    print("  rejected: " + ", ".join(f"{count} {reason}" for reason, count in reasons.most_common()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+In-process fakes of the Groq, Twilio and Google Sheets APIs for benchmarks.
+
+Each fake sleeps for a configurable latency, fails a configurable share
+of calls (with 429 rate limiting modelled separately from other errors)
+and counts every call, so the real clients, retries and rate limiters
+run unchanged against them.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import List, Optional
+
+import httpx
+from gspread.utils import a1_to_rowcol
+from twilio.base.exceptions import TwilioRestException
+
+from src.config import Settings
+from src.config.constants import SHEET_HEADERS
+from src.services import GroqClient, SheetHandler, SMSSender
+
+
+OK = "ok"
+RATE_LIMITED = "rate_limited"
+ERROR = "error"
+
+FIRST_NAMES = ["Amira", "Ben", "Chloe", "Dmitri", "Elena", "Farid", "Grace", "Hugo"]
+PRODUCTS = ["Air Fryer", "Espresso Machine", "Robot Vacuum", "Blender", "Smart Kettle"]
+
+
+@dataclass
+class Faults:
+    """Latency and failure behaviour of a fake API."""
+
+    latency: float = 0.0          # Seconds per call
+    jitter: float = 0.0           # Extra uniform random latency (0..jitter)
+    error_rate: float = 0.0       # Share of calls failing with a 5xx
+    rate_limit_rate: float = 0.0  # Share of calls rejected with a 429
+    retry_after: float = 1.0      # retry-after sent with 429s
+
+
+class FakeService:
+    """Shared latency/fault injection and call counting."""
+
+    name = "service"
+
+    def __init__(self, faults: Optional[Faults] = None, seed: Optional[int] = None):
+        self.faults = faults or Faults()
+        self.calls: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _call(self, endpoint: str) -> str:
+        """Simulate one call and return its outcome (OK, RATE_LIMITED or ERROR)."""
+        faults = self.faults
+        with self._lock:
+            roll = self._random.random()
+            delay = faults.latency + self._random.random() * faults.jitter
+            if roll < faults.rate_limit_rate:
+                outcome = RATE_LIMITED
+            elif roll < faults.rate_limit_rate + faults.error_rate:
+                outcome = ERROR
+            else:
+                outcome = OK
+            self.calls[(endpoint, outcome)] += 1
+        if delay > 0:
+            time.sleep(delay)
+        return outcome
+
+    def stats(self) -> dict:
+        """Call counts by outcome, plus the total."""
+        with self._lock:
+            counts = Counter()
+            for (_, outcome), count in self.calls.items():
+                counts[outcome] += count
+        return {"calls": sum(counts.values()), **{k: counts[k] for k in (OK, RATE_LIMITED, ERROR)}}
+
+
+class FakeGroqAPI(FakeService):
+    """
+    Groq chat completions endpoint, served through ``httpx.MockTransport``.
+
+    JSON-mode requests from the batch generator get one message per
+    request id. Responses include ``usage`` so the token limiter settles.
+    """
+
+    name = "groq"
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        outcome = self._call("chat.completions")
+        if outcome == RATE_LIMITED:
+            return httpx.Response(
+                429,
+                headers={"retry-after": str(self.faults.retry_after)},
+                json={"error": {"message": "Rate limit reached"}},
+            )
+        if outcome == ERROR:
+            return httpx.Response(503, json={"error": {"message": "Service unavailable"}})
+
+        payload = json.loads(request.content)
+        user_prompt = payload["messages"][-1]["content"]
+        if payload.get("response_format", {}).get("type") == "json_object":
+            ids = [item["id"] for item in json.loads(user_prompt)["requests"]]
+            content = json.dumps({"messages": {i: self._message(i) for i in ids}})
+        else:
+            content = self._message(user_prompt)
+
+        prompt_tokens = sum(len(m["content"]) for m in payload["messages"]) // 4
+        completion_tokens = len(content) // 4
+        return httpx.Response(200, json={
+            "choices": [{"message": {"role": "assistant", "content": content}}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    @staticmethod
+    def _message(seed: str) -> str:
+        tag = zlib.crc32(seed.encode()) % 1000
+        return f"Hi! Your pick is still here - reply YES and we'll hold it for you. #{tag}"
+
+    def transport(self) -> httpx.MockTransport:
+        """Transport that routes every request to this fake."""
+        return httpx.MockTransport(self)
+
+
+class FakeTwilioClient(FakeService):
+    """Twilio REST client exposing ``messages.create``."""
+
+    name = "twilio"
+
+    def __init__(self, faults: Optional[Faults] = None, seed: Optional[int] = None):
+        super().__init__(faults, seed)
+        self.messages = self
+        self._sent = 0
+
+    def create(self, body: str, from_: str, to: str) -> SimpleNamespace:
+        outcome = self._call("messages.create")
+        uri = "/2010-04-01/Accounts/ACbench/Messages.json"
+        if outcome == RATE_LIMITED:
+            raise TwilioRestException(429, uri, msg="Too Many Requests", method="POST")
+        if outcome == ERROR:
+            raise TwilioRestException(503, uri, msg="Service Unavailable", method="POST")
+        with self._lock:
+            self._sent += 1
+            sid = f"SM{self._sent:032x}"
+        return SimpleNamespace(sid=sid)
+
+
+class FakeSheetError(Exception):
+    """Raised by the fake worksheet for injected failures."""
+
+
+class FakeWorksheet(FakeService):
+    """
+    In-memory gspread worksheet (plus its spreadsheet) holding ``rows``.
+
+    Supports the calls the pipeline makes: full and ranged reads, cell and
+    batch updates and ``values_batch_update`` on the spreadsheet.
+    """
+
+    name = "sheets"
+
+    def __init__(self, rows: List[list], title: str = "Leads",
+                 faults: Optional[Faults] = None, seed: Optional[int] = None):
+        super().__init__(faults, seed)
+        self.rows = [list(row) for row in rows]
+        self.title = title
+        self.spreadsheet = self
+
+    @property
+    def row_count(self) -> int:
+        return len(self.rows)
+
+    def _check(self, endpoint: str) -> None:
+        outcome = self._call(endpoint)
+        if outcome == RATE_LIMITED:
+            raise FakeSheetError("429: Quota exceeded for read/write requests")
+        if outcome == ERROR:
+            raise FakeSheetError("503: The service is currently unavailable")
+
+    def get_all_values(self) -> List[list]:
+        self._check("get_all_values")
+        return [list(row) for row in self.rows]
+
+    def get(self, range_name: str) -> List[list]:
+        self._check("get")
+        start, end = range_name.split(":")
+        first_row, first_col = a1_to_rowcol(start)
+        last_row, last_col = a1_to_rowcol(end)
+        return [
+            row[first_col - 1:last_col]
+            for row in self.rows[first_row - 1:last_row]
+        ]
+
+    def update_cell(self, row: int, col: int, value: str) -> None:
+        self._check("update_cell")
+        self._set(row, col, value)
+
+    def batch_update(self, data: List[dict], **kwargs) -> None:
+        self._check("batch_update")
+        self._apply(data)
+
+    def values_batch_update(self, body: dict) -> None:
+        self._check("values_batch_update")
+        self._apply(body["data"])
+
+    def get_lastUpdateTime(self) -> str:
+        self._check("get_lastUpdateTime")
+        return "2024-01-01T00:00:00.000Z"
+
+    def _apply(self, data: List[dict]) -> None:
+        for entry in data:
+            cell = re.sub(r"^.*!", "", entry["range"]).split(":")[0]
+            row, col = a1_to_rowcol(cell)
+            self._set(row, col, entry["values"][0][0])
+
+    def _set(self, row: int, col: int, value: str) -> None:
+        with self._lock:
+            while len(self.rows) < row:
+                self.rows.append([])
+            cells = self.rows[row - 1]
+            cells.extend([""] * (col - len(cells)))
+            cells[col - 1] = value
+
+
+class BenchGroqClient(GroqClient):
+    """GroqClient whose HTTP clients talk to a ``FakeGroqAPI``."""
+
+    def __init__(self, settings: Settings, api: FakeGroqAPI):
+        super().__init__(settings)
+        self.api = api
+        self._client = httpx.Client(
+            transport=api.transport(), headers=self.headers, timeout=self.timeout
+        )
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                transport=self.api.transport(), headers=self.headers, timeout=self.timeout
+            )
+        return self._async_client
+
+
+class BenchSMSSender(SMSSender):
+    """SMSSender backed by a ``FakeTwilioClient``."""
+
+    def __init__(self, settings: Settings, client: FakeTwilioClient):
+        super().__init__(settings)
+        self._client = client
+
+
+class BenchSheetHandler(SheetHandler):
+    """SheetHandler that "connects" to a ``FakeWorksheet``."""
+
+    def __init__(self, settings: Settings, worksheet: FakeWorksheet, target=None):
+        super().__init__(settings, target)
+        self.fake_worksheet = worksheet
+
+    def connect(self, client=None) -> None:
+        self._worksheet = self.fake_worksheet
+
+
+def bench_settings(**overrides) -> Settings:
+    """Settings with dummy credentials and client-side rate limits disabled."""
+    values = dict(
+        google_sheet_id="bench-sheet",
+        google_credentials_path="unused.json",
+        worksheet_name="Leads",
+        groq_api_key="bench-key",
+        model_name="bench-model",
+        max_tokens=100,
+        temperature=0.7,
+        twilio_account_sid="ACbench",
+        twilio_auth_token="bench-token",
+        twilio_phone_number="+15550000000",
+        twilio_phone_numbers=["+15550000000"],
+        twilio_messages_per_second=0.0,
+        generation_cache=False,
+        groq_rpm=0,
+        groq_tpm=0,
+        sync_state_path="",
+        journal_path=None,
+        outbox_path=None,
+    )
+    values.update(overrides)
+    return Settings(**values)
+
+
+def make_sheet(size: int, followup_share: float = 0.3, seed: int = 0) -> List[list]:
+    """
+    Build a synthetic lead sheet (header row included).
+
+    Args:
+        size: Number of lead rows
+        followup_share: Share of rows already contacted with a customer reply
+        seed: Random seed for reproducible sheets
+
+    Returns:
+        Rows as returned by ``get_all_values``
+    """
+    rng = random.Random(seed)
+    rows = [list(SHEET_HEADERS)]
+    for i in range(size):
+        name = f"{rng.choice(FIRST_NAMES)} Lead{i}"
+        phone = f"+1555{i:07d}"
+        product = rng.choice(PRODUCTS)
+        if rng.random() < followup_share:
+            sent = f"Hi {name.split()[0]}! Still thinking about the {product}?"
+            history = (
+                f"[2024-01-01 10:00] ASSISTANT: {sent}\n"
+                f"[2024-01-01 10:30] CUSTOMER: Maybe, what's the price?"
+            )
+            rows.append([name, phone, product, "2024-01-01", sent, history])
+        else:
+            rows.append([name, phone, product, "2024-01-01", "", ""])
+    return rows
@@ -4,13 +4,28 @@ Roya SMS Agent - Entry Point
 Run manually to process leads and generate SMS messages.
 """
 
+from __future__ import annotations
+
+import argparse
+import os
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional
 from dotenv import load_dotenv
 
-from src.config import get_settings
-from src.services import SheetHandler, GroqClient, SMSSender
-from src.agent import run_agent
-from src.utils import is_valid_lead
+from src.config import get_settings, SheetTarget
+from src.utils import (
+    ServiceLimits, bounded_map, metrics, sms_info, ResultWriter, WorkPlan, WorkPlanner,
+)
+
+# Services and the agent graph (gspread, twilio, httpx, langgraph) are
+# imported where they are first needed, so --help and runs that skip a
+# backend don't pay for loading it
+if TYPE_CHECKING:
+    from src.agent import AgentOptions
+    from src.services import SheetHandler, IncrementalSync, RunJournal, Outbox
 
 
 def print_banner():
@@ -20,87 +35,697 @@ def print_banner():
     print("=" * 50 + "\n")
 
 
-def print_sms_output(lead, result, sent: bool = False):
+def print_sms_output(lead, result, sent: bool = False, phone: Optional[str] = None):
     """Display generated SMS."""
     print("-" * 40)
-    print(f"TO: {lead.name} ({lead.phone})")
+    print(f"TO: {lead.name} ({phone or lead.phone})")
     print(f"PRODUCT: {lead.product}")
     print(f"TYPE: {result['message_type'].upper()}")
     print("-" * 40)
     print(f"\nSMS MESSAGE:\n{result['generated_sms']}")
-    print(f"\n[{len(result['generated_sms'])} characters]")
+    info = sms_info(result["generated_sms"])
+    print(f"\n[{len(result['generated_sms'])} characters, {info.encoding}, {info.segments} segment(s)]")
     if sent:
         print("✓ SMS SENT!")
     print("-" * 40)
 
 
-def process_lead(lead, groq_client, sms_sender, sheet_handler, send_sms: bool = True):
-    """Process a single lead through the agent."""
-    is_valid, error = is_valid_lead(lead)
-    if not is_valid:
-        print(f"Skipping: {error}")
-        return False
+def print_outcome(outcome: dict):
+    """Display the result of processing one lead."""
+    lead = outcome["lead"]
+    if outcome["resumed"]:
+        print(f"Resuming {lead.name} from journal ({outcome['resumed']})")
+    elif outcome["drafted"]:
+        print(f"Using prepared draft for {lead.name}")
+    if outcome["status"] == "skipped":
+        print(f"Skipping: {outcome['error']}")
+    elif outcome["status"] == "error":
+        print(f"Error processing {lead.name}: {outcome['error']}")
+    else:
+        if outcome["send_error"]:
+            print(f"Failed to send SMS: {outcome['send_error']}")
+        print_sms_output(lead, outcome["result"], outcome["sent"], outcome["phone"])
+
+
+def new_outcome(lead, phone: str) -> dict:
+    """
+    Outcome dict of a lead before any work was done.
+
+    Keys: ``phone`` (the planned E.164 recipient); ``status`` ("ok",
+    "error", or "skipped" when send mode has no up-to-date draft) and
+    ``error``; the agent ``result``; ``send_future``, ``sent`` and
+    ``send_error`` for the SMS; ``resumed`` (journal stage) or ``drafted``
+    when the message was not generated in this run.
+    """
+    return {
+        "lead": lead,
+        "phone": phone,
+        "status": "ok",
+        "error": None,
+        "result": None,
+        "send_future": None,
+        "sent": False,
+        "send_error": None,
+        "resumed": None,
+        "drafted": False,
+    }
+
 
-    result = run_agent(lead, groq_client)
+def process_lead(lead, phone: str, groq_client, dispatcher, sheet_handler, send_sms: bool = True,
+                 options: AgentOptions = None, journal: RunJournal = None, outbox: Outbox = None,
+                 drafts_only: bool = False) -> dict:
+    """
+    Process a single lead through the agent.
+
+    Args:
+        lead: Lead to process
+        phone: Recipient in E.164 form, as validated by the planner
+            (see ``WorkPlan.items``)
+        groq_client: Configured Groq client
+        dispatcher: SMS dispatcher the message is queued on
+        sheet_handler: Connected sheet handler
+        send_sms: Whether to send the SMS and write it back to the sheet
+        options: Agent graph options (defaults if omitted)
+        journal: Run journal; unfinished work recorded there is resumed
+            instead of regenerating or re-sending
+        outbox: Prepared drafts; an up-to-date draft is sent instead of
+            generating a new message
+        drafts_only: Skip leads without an up-to-date draft instead of generating
+
+    Returns:
+        Outcome dict with status ("ok", "skipped" or "error"), agent result
+        and the pending send (see ``finish_send``). Nothing is printed so
+        outcomes can be reported in lead order when processing concurrently.
+    """
+    outcome = new_outcome(lead, phone)
+
+    entry = journal.get(lead) if journal is not None else None
+    draft = outbox.get(lead) if outbox is not None and entry is None else None
+    if entry is not None and entry.unconfirmed:
+        # An earlier send may have reached the lead: don't text them again
+        outcome.update(
+            status="error", resumed=entry.stage,
+            error=f"Earlier SMS to {lead.name} is unconfirmed; check Twilio before resending",
+        )
+        return outcome
+    if entry is not None:
+        # Generated (and maybe sent) by an interrupted run
+        result = entry.result(lead)
+        outcome["resumed"] = entry.stage
+    elif draft is not None:
+        result = draft.result(lead)
+        outcome["drafted"] = True
+    elif drafts_only:
+        outcome.update(status="skipped", error=f"No up-to-date draft for {lead.name}")
+        return outcome
+    else:
+        # Loaded on first generation: send mode never needs the agent graph
+        from src.agent import run_agent
+
+        result = run_agent(lead, groq_client, options)
+    outcome["result"] = result
 
     if result["error"]:
-        print(f"Error processing {lead.name}: {result['error']}")
-        return False
+        outcome.update(status="error", error=result["error"])
+        return outcome
 
-    # Send SMS
-    sent = False
-    if send_sms and result["generated_sms"]:
-        try:
-            sms_sender.send(lead.phone, result["generated_sms"])
-            sent = True
-            # Update sheet after successful send
-            sheet_handler.batch_update(
-                row_number=lead.row_number,
-                sms_sent=result["generated_sms"],
-                chat_history=result["updated_history"]
-            )
-        except Exception as e:
-            print(f"Failed to send SMS: {e}")
+    if not send_sms or not result["generated_sms"]:
+        return outcome
 
-    print_sms_output(lead, result, sent)
-    return True
+    if entry is not None and entry.sent:
+        # Already delivered: only the sheet write is missing
+        outcome["send_future"] = Future()
+        outcome["send_future"].set_result(entry.message_sid)
+        return outcome
 
+    if journal is not None and entry is None:
+        journal.generated(lead, result)
 
-def main():
-    """Main entry point."""
-    load_dotenv()
-    print_banner()
+    # Queue SMS; the worker moves on to the next generation meanwhile
+    future = dispatcher.submit(phone, result["generated_sms"])
+    if journal is not None:
+        future.add_done_callback(lambda f: _journal_sent(journal, lead.row_number, f))
+    outcome["send_future"] = future
+    return outcome
+
+
+def _journal_sent(journal: RunJournal, row_number: int, future: Future) -> None:
+    """Record a delivered (or possibly delivered) SMS as soon as the send finished."""
+    from src.services.sms_sender import UnconfirmedSendError
+
+    if future.cancelled():
+        return
+    if future.exception() is None:
+        journal.sent(row_number, future.result())
+    elif isinstance(future.exception(), UnconfirmedSendError):
+        journal.unconfirmed(row_number)
+
+
+def prepare_lead(lead, phone: str, groq_client, outbox: Outbox,
+                 options: AgentOptions = None) -> dict:
+    """
+    Generate and store a draft for a lead, unless an up-to-date one exists.
+
+    Returns:
+        Outcome dict like ``process_lead``'s, with ``drafted`` set when the
+        existing draft was still current (nothing was generated)
+    """
+    outcome = new_outcome(lead, phone)
+
+    draft = outbox.get(lead)
+    if draft is not None:
+        outcome.update(result=draft.result(lead), drafted=True)
+        return outcome
+
+    from src.agent import run_agent
+
+    result = run_agent(lead, groq_client, options)
+    outcome["result"] = result
+    if result["error"] or not result["generated_sms"]:
+        outcome.update(status="error", error=result["error"] or "Empty generation")
+        return outcome
+
+    outbox.put(lead, result)
+    return outcome
 
+
+def print_prepared(outcome: dict):
+    """Display the result of preparing one lead."""
+    lead = outcome["lead"]
+    if outcome["status"] == "error":
+        print(f"Error preparing {lead.name}: {outcome['error']}")
+    elif outcome["drafted"]:
+        print(f"Draft for {lead.name} is up to date")
+    else:
+        print_sms_output(lead, outcome["result"])
+
+
+def finish_send(outcome: dict, sheet_handler) -> dict:
+    """Wait for a queued SMS and queue the sheet update once it was sent."""
+    future = outcome["send_future"]
+    if future is None:
+        return outcome
+
+    lead = outcome["lead"]
+    result = outcome["result"]
     try:
-        settings = get_settings()
-        sheet_handler = SheetHandler(settings)
-        groq_client = GroqClient(settings)
-        sms_sender = SMSSender(settings)
+        future.result()
+        outcome["sent"] = True
+        # Queue sheet update after successful send (written in batches)
+        sheet_handler.queue_update(
+            row_number=lead.row_number,
+            sms_sent=result["generated_sms"],
+            chat_history=result["updated_history"]
+        )
+    except Exception as e:
+        outcome["send_error"] = str(e)
+    return outcome
+
+
+@dataclass
+class TargetRun:
+    """Per-worksheet state of a run: where leads come from and go back to."""
+
+    target: SheetTarget
+    sheet_handler: SheetHandler
+    journal: Optional[RunJournal] = None
+    sync: Optional[IncrementalSync] = None
+    outbox: Optional[Outbox] = None
+    plan: Optional[WorkPlan] = None
+    outcomes: List[dict] = field(default_factory=list)
+    processed: int = 0
+    sent: int = 0
+    errors: int = 0
+
+    def record(self, outcome: dict, collect: bool = True):
+        """Count an outcome (and keep it when ``collect`` is set)."""
+        self.processed += 1
+        self.sent += outcome["sent"]
+        self.errors += outcome["status"] == "error" or bool(outcome["send_error"])
+        if collect:
+            self.outcomes.append(outcome)
+
+
+def process_tasks(tasks: Iterable, groq_client, dispatcher, concurrency: int = 1,
+                  options: AgentOptions = None,
+                  collect: bool = True, drafts_only: bool = False, send_sms: bool = True,
+                  output: Optional[ResultWriter] = None) -> None:
+    """
+    Process ``(lead, phone, TargetRun)`` tasks from any number of worksheets in one pool.
+
+    Generation and sending share the worker pool and service limits; each
+    lead is journaled and written back through its own worksheet's
+    handler, and (with ``collect``) its outcome is added to that
+    worksheet's ``outcomes``. Outcomes are streamed to ``output`` when
+    given, else printed.
+    """
+    def work(task):
+        lead, phone, target_run = task
+        with metrics.timer("pipeline.lead"):
+            outcome = process_lead(lead, phone, groq_client, dispatcher, target_run.sheet_handler,
+                                   send_sms=send_sms, options=options,
+                                   journal=target_run.journal, outbox=target_run.outbox,
+                                   drafts_only=drafts_only)
+        return outcome, target_run
+
+    for outcome, target_run in bounded_map(work, tasks, concurrency):
+        finish_send(outcome, target_run.sheet_handler)
+        if output is not None:
+            output.write(outcome, target_run.target.key)
+        else:
+            print_outcome(outcome)
+            print()
+        target_run.record(outcome, collect)
+
+
+def prepare_tasks(tasks: Iterable, groq_client, concurrency: int = 1,
+                  options: AgentOptions = None,
+                  output: Optional[ResultWriter] = None) -> dict:
+    """
+    Fill each worksheet's outbox with drafts for ``(lead, phone, TargetRun)`` tasks.
+
+    Outcomes are streamed to ``output`` when given, else printed.
+
+    Returns:
+        Counts of drafts prepared, already up to date and failed
+    """
+    def work(task):
+        lead, phone, target_run = task
+        with metrics.timer("pipeline.prepare"):
+            return prepare_lead(
+                lead, phone, groq_client, target_run.outbox, options=options,
+            ), target_run
+
+    counts = {"prepared": 0, "up_to_date": 0, "errors": 0}
+    for outcome, target_run in bounded_map(work, tasks, concurrency):
+        if output is not None:
+            output.write(outcome, target_run.target.key)
+        else:
+            print_prepared(outcome)
+            print()
+        target_run.record(outcome, collect=False)
+        if outcome["status"] == "error":
+            counts["errors"] += 1
+        elif outcome["drafted"]:
+            counts["up_to_date"] += 1
+        else:
+            counts["prepared"] += 1
+    return counts
+
+
+def with_target(leads: Iterable, target_run: TargetRun) -> Iterator:
+    """Add the worksheet to planned ``(lead, phone)`` pairs."""
+    for lead, phone in leads:
+        yield lead, phone, target_run
+
+
+def round_robin(iterables: List[Iterable]) -> Iterator:
+    """Interleave items from several iterables, one from each in turn."""
+    iterators = [iter(it) for it in iterables]
+    while iterators:
+        for it in list(iterators):
+            try:
+                yield next(it)
+            except StopIteration:
+                iterators.remove(it)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Roya AI SMS Agent")
+    parser.add_argument(
+        "-c", "--concurrency",
+        type=int,
+        default=1,
+        help="Number of leads processed in parallel (default: 1, sequential)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only process rows that changed since the last incremental run",
+    )
+    parser.add_argument(
+        "--store",
+        metavar="PATH",
+        help="SQLite file mirroring the sheet for local queries (default: LEAD_STORE_PATH)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read the sheet page by page and start sending while it downloads",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        metavar="N",
+        help="Process at most N leads from each sheet target this run (default: MAX_LEADS_PER_RUN)",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        help="Write a JSON report of per-stage timings and counters",
+    )
+    parser.add_argument(
+        "--metrics-prom",
+        metavar="PATH",
+        help="Write the same metrics in Prometheus text format",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=("full", "generate", "prepare", "send"),
+        default="full",
+        help="full: generate and send; generate: dry run, only generate (no sending, "
+             "sheet writes or outbox); prepare: only generate drafts into the outbox; "
+             "send: only send up-to-date drafts from the outbox (default: full)",
+    )
+    parser.add_argument(
+        "-o", "--output",
+        metavar="PATH",
+        help="Stream per-lead results to a .jsonl or .csv file instead of printing them",
+    )
+    args = parser.parse_args(argv)
+    if args.stream and (args.incremental or args.store):
+        parser.error("--stream cannot be combined with --incremental or --store")
+    return args
 
-        print("Connecting to Google Sheet...")
-        sheet_handler.connect()
 
-        new_leads = sheet_handler.get_leads_needing_contact()
-        followup_leads = sheet_handler.get_leads_needing_followup()
+def print_write_summary(results):
+    """Report the outcome of batched sheet updates."""
+    if not results:
+        return
+    failed = [r for r in results if not r.success]
+    print(f"\nSheet updates: {len(results) - len(failed)} written, {len(failed)} failed")
+    for r in failed:
+        print(f"  Row {r.row_number}: {r.error}")
 
-        print(f"Found {len(new_leads)} new leads")
-        print(f"Found {len(followup_leads)} leads needing follow-up\n")
 
-        if new_leads:
-            print("\n=== NEW LEADS ===\n")
-            for lead in new_leads:
-                process_lead(lead, groq_client, sms_sender, sheet_handler)
-                print()
+def print_cache_stats(cache):
+    """Report generation cache effectiveness."""
+    if cache is None:
+        return
+    stats = cache.stats()
+    print(
+        f"Generation cache: {stats['hits']} hits, {stats['misses']} misses "
+        f"({stats['hit_rate']:.0%} hit rate)"
+    )
 
-        if followup_leads:
-            print("\n=== FOLLOW-UPS ===\n")
-            for lead in followup_leads:
-                process_lead(lead, groq_client, sms_sender, sheet_handler)
-                print()
 
-        if not new_leads and not followup_leads:
+def print_history_stats(history_manager):
+    """Report prompt tokens saved by history windowing."""
+    stats = history_manager.stats()
+    if stats["truncated"]:
+        print(
+            f"Chat history: {stats['truncated']} prompts windowed, "
+            f"~{stats['tokens_saved']} prompt tokens saved"
+        )
+
+
+def print_batch_stats(batch_generator):
+    """Report batched generation requests and fallbacks."""
+    if batch_generator is None:
+        return
+    stats = batch_generator.stats()
+    print(f"Batched generation: {stats['batches']} requests, {stats['fallbacks']} single-lead fallbacks")
+
+
+def print_metrics_summary(report: dict):
+    """Report where the run spent its time, per stage."""
+    stages = report["stages"]
+    if not stages:
+        return
+    print(f"\nStage timings ({report['duration_seconds']:.1f}s run):")
+    for name, stage in stages.items():
+        extra = ", ".join(
+            f"{stage[key]:g} {key}" for key in ("errors", "retries", "tokens") if stage.get(key)
+        )
+        print(
+            f"  {name:<20} {stage['calls']:>6} calls {stage['seconds']:>9.2f}s "
+            f"p50 {stage['p50_ms']:>8.1f}ms p99 {stage['p99_ms']:>8.1f}ms"
+            + (f"  ({extra})" if extra else "")
+        )
+
+
+def export_metrics(args):
+    """Print the stage summary and write the requested metrics files."""
+    print_metrics_summary(metrics.report())
+    if args.metrics:
+        metrics.write_json(args.metrics)
+        print(f"Metrics report written to {args.metrics}")
+    if args.metrics_prom:
+        metrics.write_prometheus(args.metrics_prom)
+        print(f"Prometheus metrics written to {args.metrics_prom}")
+
+
+def record_sync(sync, outcomes, write_results, deferred=()):
+    """
+    Acknowledge rows we wrote and mark unfinished or deferred leads for retry.
+
+    Leads skipped for lack of a draft are retried like deferred ones. Rows
+    the planner rejected stay acknowledged: they only change when edited.
+    """
+    written = {r.row_number for r in write_results if r.success}
+    for outcome in outcomes:
+        lead = outcome["lead"]
+        if outcome["sent"] and lead.row_number in written:
+            result = outcome["result"]
+            sync.acknowledge(lead.row_number, result["generated_sms"], result["updated_history"])
+        else:
+            sync.forget(lead.row_number)
+    for lead in deferred:
+        sync.forget(lead.row_number)
+    sync.save()
+
+
+def record_store(store, outcomes, write_results):
+    """Mirror sent messages into the local store and mark persisted rows clean."""
+    for outcome in outcomes:
+        if outcome["sent"]:
+            result = outcome["result"]
+            store.record_update(
+                outcome["lead"].row_number, result["generated_sms"], result["updated_history"]
+            )
+    store.mark_clean(r.row_number for r in write_results if r.success)
+
+
+def select_leads(settings, args, sheet_handler, store):
+    """
+    Read the sheet and collect candidate leads for planning.
+
+    Returns:
+        Tuple of (candidates, sync); sync is the IncrementalSync tracker
+        in incremental mode, else None
+    """
+    if args.incremental:
+        from src.services import IncrementalSync
+
+        sync = IncrementalSync(sheet_handler, settings.sync_state_path)
+        snapshot = sync.changed_snapshot()
+        print(f"Incremental sync: {len(snapshot)} changed rows")
+        if store is not None:
+            store.pull(snapshot.leads, full=False)
+        return list(snapshot.leads), sync
+
+    snapshot = sheet_handler.load_snapshot()
+    if store is not None:
+        store.pull(snapshot.leads)
+        return store.get_leads_needing_contact() + store.get_leads_needing_followup(), None
+    return list(snapshot.leads), None
+
+
+def print_target_summary(runs: List[TargetRun]):
+    """Report per-worksheet results when several worksheets were processed."""
+    if len(runs) < 2:
+        return
+    print("\nPer sheet:")
+    for target_run in runs:
+        results = target_run.sheet_handler.write_results
+        written = sum(1 for r in results if r.success)
+        print(
+            f"  {target_run.target.key}: {target_run.processed} processed, {target_run.sent} sent, "
+            f"{target_run.errors} errors, {written} rows written, {len(results) - written} failed"
+        )
+
+
+def use_outbox(settings, mode: str) -> bool:
+    """Whether this run reads or fills the outbox of prepared drafts."""
+    if not settings.outbox_path or mode == "generate":
+        return False
+    # Full runs only pick up drafts a prepare run left behind
+    return mode != "full" or os.path.exists(settings.outbox_path)
+
+
+def open_target(settings, target: SheetTarget, client=None, mode: str = "full") -> TargetRun:
+    """Connect to one worksheet (sharing ``client`` if given) and open its journal and outbox."""
+    from src.services import SheetHandler, RunJournal, Outbox
+
+    sheet_handler = SheetHandler(settings, target)
+    sheet_handler.connect(client)
+    target_run = TargetRun(target, sheet_handler)
+    if settings.journal_path and mode in ("full", "send"):
+        target_run.journal = RunJournal(settings.journal_path, target.key)
+        pending = target_run.journal.pending()
+        if pending:
+            print(f"Journal ({target.key}): {pending} leads from an interrupted run will be resumed")
+    if use_outbox(settings, mode):
+        target_run.outbox = Outbox(settings.outbox_path, target.key)
+    return target_run
+
+
+def close_target(target_run: TargetRun, store=None):
+    """Write back, then record what reached the sheet in the journal, outbox, sync state and store."""
+    sheet_handler = target_run.sheet_handler
+    sheet_handler.flush_updates()
+    written = sheet_handler.write_results
+    if target_run.journal is not None:
+        target_run.journal.persisted(r.row_number for r in written if r.success)
+        target_run.journal.close()
+    if target_run.outbox is not None:
+        target_run.outbox.remove(r.row_number for r in written if r.success)
+        target_run.outbox.close()
+    if target_run.sync is not None:
+        record_sync(target_run.sync, target_run.outcomes, written, target_run.plan.deferred)
+    if store is not None:
+        record_store(store, target_run.outcomes, written)
+
+
+def run(settings, args, groq_client=None):
+    """
+    Fetch leads from every sheet target and process them.
+
+    Only the clients and stages the mode needs are built: ``generate`` and
+    ``prepare`` never touch Twilio or write to the sheet, and ``send``
+    needs no Groq client (``groq_client`` may be None).
+    """
+    from src.agent import AgentOptions
+
+    targets = settings.sheet_targets
+    store_path = args.store or settings.lead_store_path
+    if store_path and len(targets) > 1:
+        raise ValueError("The local lead store supports a single sheet target")
+    if args.mode in ("prepare", "send") and not settings.outbox_path:
+        raise ValueError(f"OUTBOX_PATH is required for --mode {args.mode}")
+
+    prepare = args.mode == "prepare"
+    # Only full and send runs text leads and write results back to the sheet
+    sends = args.mode in ("full", "send")
+    limits = ServiceLimits.from_settings(settings)
+    dispatcher = None
+    if sends:
+        from src.services import SMSDispatcher, SMSSender
+
+        dispatcher = SMSDispatcher(
+            SMSSender(settings),
+            settings.twilio_phone_numbers,
+            messages_per_second=settings.twilio_messages_per_second,
+            workers=limits.twilio,
+            max_retries=settings.twilio_max_retries,
+        )
+    options = AgentOptions.from_settings(settings)
+    planner = WorkPlanner.from_settings(settings)
+    if args.limit is not None:
+        planner.max_leads = args.limit
+
+    print(f"Connecting to {len(targets)} Google Sheet(s)...")
+    # The first connection authorizes; the others share its client and session
+    runs = [open_target(settings, targets[0], mode=args.mode)]
+    with ThreadPoolExecutor(max_workers=max(1, len(targets) - 1)) as pool:
+        runs += pool.map(
+            lambda t: open_target(settings, t, runs[0].sheet_handler.client, args.mode), targets[1:]
+        )
+
+    # Like the sync state, the store is only updated by runs that send;
+    # generate and prepare runs read the sheet directly
+    store = None
+    if store_path and sends:
+        from src.services import LeadStore
+
+        store = LeadStore(store_path, settings.default_country_code)
+        pushed = store.push(runs[0].sheet_handler)
+        if pushed:
+            print(f"Wrote {pushed} pending local updates to the sheet")
+
+    def plan_target(target_run: TargetRun) -> TargetRun:
+        candidates, sync = select_leads(settings, args, target_run.sheet_handler, store)
+        # Runs that don't send don't consume changes: the next send run must still see them
+        target_run.sync = sync if sends else None
+        target_run.plan = planner.plan(candidates)
+        return target_run
+
+    if not args.stream:
+        # Read the worksheets concurrently (at most SHEETS_CONCURRENCY at once)
+        with ThreadPoolExecutor(max_workers=max(1, min(len(runs), limits.sheets))) as pool:
+            list(pool.map(plan_target, runs))
+        for target_run in runs:
+            label = f" ({target_run.target.key})" if len(runs) > 1 else ""
+            print(f"Work plan{label}: {target_run.plan.summary()}")
+        print()
+
+    output = ResultWriter(args.output) if args.output else None
+    try:
+        if args.stream:
+            print("\n=== STREAMING LEADS ===\n")
+            tasks = round_robin([
+                with_target(planner.stream(target_run.sheet_handler.iter_leads()), target_run)
+                for target_run in runs
+            ])
+        elif any(target_run.plan.queue for target_run in runs):
+            print("\n=== WORK QUEUE ===\n")
+            tasks = round_robin([with_target(target_run.plan.items(), target_run) for target_run in runs])
+        else:
+            tasks = None
             print("No leads to process.")
 
+        if tasks is not None and prepare:
+            counts = prepare_tasks(tasks, groq_client, concurrency=args.concurrency,
+                                   options=options, output=output)
+            print(
+                f"Outbox: {counts['prepared']} drafts prepared, {counts['up_to_date']} already "
+                f"up to date, {counts['errors']} errors"
+            )
+        elif tasks is not None:
+            process_tasks(tasks, groq_client, dispatcher, concurrency=args.concurrency,
+                          options=options, collect=sends and not args.stream,
+                          drafts_only=args.mode == "send", send_sms=sends, output=output)
+    finally:
+        if dispatcher is not None:
+            dispatcher.close()
+        if output is not None:
+            output.close()
+            print(f"Wrote {output.written} results to {output.path}")
+        for target_run in runs:
+            close_target(target_run, store)
+        if store is not None:
+            store.close()
+        print_write_summary([r for target_run in runs for r in target_run.sheet_handler.write_results])
+        print_target_summary(runs)
+        if groq_client is not None:
+            print_cache_stats(groq_client.cache)
+            # The graph module is only loaded once a lead was generated
+            graph = sys.modules.get("src.agent.graph")
+            agent = graph.cached_agent(groq_client, options) if graph is not None else None
+            if agent is not None:
+                print_history_stats(agent.history_manager)
+                print_batch_stats(agent.batch_generator)
+        export_metrics(args)
+
+
+def main(argv=None):
+    """Main entry point."""
+    args = parse_args(argv)
+    load_dotenv()
+    print_banner()
+
+    try:
+        from src.services import GroqClient
+
+        settings = get_settings()
+        metrics.enabled = settings.metrics_enabled
+        metrics.reset()
+        # Send-only runs never generate, so they don't need a Groq client
+        groq = GroqClient(settings) if args.mode != "send" else nullcontext()
+        with groq as groq_client:
+            run(settings, args, groq_client)
+
         print("\nDone!")
 
     except KeyboardInterrupt:
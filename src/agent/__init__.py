@@ -1,6 +1,23 @@
-"""Agent package exports."""
+"""Agent package exports (the LangGraph flow loads on first access)."""
 
-from .graph import create_sms_graph, run_agent
-from .state import AgentState
+from typing import TYPE_CHECKING
 
-__all__ = ["create_sms_graph", "run_agent", "AgentState"]
+from src.utils.lazy import lazy_exports
+
+_EXPORTS = {
+    "create_sms_graph": ".graph",
+    "run_agent": ".graph",
+    "get_agent": ".graph",
+    "SMSAgent": ".graph",
+    "AgentOptions": ".options",
+    "AgentState": ".state",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .graph import create_sms_graph, run_agent, get_agent, SMSAgent
+    from .options import AgentOptions
+    from .state import AgentState
+
+__all__ = ["create_sms_graph", "run_agent", "get_agent", "SMSAgent", "AgentOptions", "AgentState"]
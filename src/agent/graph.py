@@ -2,63 +2,211 @@
 LangGraph flow definition for the SMS agent.
 """
 
-from langgraph.graph import StateGraph, END
+import threading
+import weakref
 from functools import partial
+from typing import Dict, List, Optional, Union
 
-from src.agent.state import AgentState
-from src.agent.nodes import classify_message_type, generate_sms, update_history
-from src.services import GroqClient
-
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import StateGraph, END
 
-def create_sms_graph(groq_client: GroqClient) -> StateGraph:
+from src.agent.options import AgentOptions
+from src.agent.state import AgentState
+from src.agent.nodes import (
+    classify_message_type,
+    generate_sms,
+    agenerate_sms,
+    validate_sms,
+    route_after_validation,
+    update_history,
+)
+from src.services import GroqClient, BatchGenerator
+from src.utils import HistoryManager, SingleFlight, metrics
+
+
+def create_sms_graph(
+    groq_client: Union[GroqClient, BatchGenerator],
+    options: Optional[AgentOptions] = None,
+    history_manager: Optional[HistoryManager] = None,
+) -> StateGraph:
     """
     Create the LangGraph workflow for SMS generation.
 
     Args:
-        groq_client: Configured Groq client for AI generation
+        groq_client: Configured Groq client (or a BatchGenerator wrapping one)
+        options: Graph build options (defaults if omitted)
+        history_manager: Windows follow-up history (built from options if omitted)
 
     Returns:
         Compiled LangGraph workflow
     """
+    options = options or AgentOptions()
+    history_manager = history_manager or HistoryManager(
+        max_tokens=options.history_max_tokens,
+        summarize=options.history_summary,
+    )
     workflow = StateGraph(AgentState)
 
-    # Bind groq_client to generate_sms node
-    generate_sms_with_client = partial(generate_sms, groq_client=groq_client)
-
-    # Add nodes
-    workflow.add_node("classify", classify_message_type)
+    # Bind groq_client to the generate node; the async variant is used
+    # when the graph runs through ainvoke/abatch. Template reuse shares one
+    # generation per first-message prompt, with or without the cache.
+    node_kwargs = {
+        "groq_client": groq_client,
+        "templates": SingleFlight() if options.template_reuse else None,
+        "history_manager": history_manager,
+    }
+    generate_sms_with_client = RunnableLambda(
+        metrics.timed("node.generate")(partial(generate_sms, **node_kwargs)),
+        afunc=metrics.timed("node.generate")(partial(agenerate_sms, **node_kwargs)),
+        name="generate",
+    )
+
+    # Add nodes (each timed as a "node.<name>" stage)
+    workflow.add_node("classify", metrics.timed("node.classify")(classify_message_type))
     workflow.add_node("generate", generate_sms_with_client)
-    workflow.add_node("update_history", update_history)
-
-    # Define edges
+    workflow.add_node("validate", metrics.timed("node.validate")(partial(
+        validate_sms,
+        max_segments=options.sms_max_segments,
+        max_retries=options.sms_max_retries,
+    )))
+    workflow.add_node("update_history", metrics.timed("node.update_history")(update_history))
+
+    # Define edges; only leads whose draft fails validation loop back
     workflow.set_entry_point("classify")
     workflow.add_edge("classify", "generate")
-    workflow.add_edge("generate", "update_history")
+    workflow.add_edge("generate", "validate")
+    workflow.add_conditional_edges("validate", route_after_validation, {
+        "generate": "generate",
+        "update_history": "update_history",
+    })
     workflow.add_edge("update_history", END)
 
     return workflow.compile()
 
 
-def run_agent(lead, groq_client: GroqClient) -> AgentState:
+def _initial_state(lead) -> AgentState:
+    """Build the starting state for a lead."""
+    return {
+        "lead": lead,
+        "message_type": "",
+        "generated_sms": None,
+        "updated_history": None,
+        "error": None,
+        "sms_encoding": None,
+        "sms_segments": None,
+        "validation_attempts": 0,
+        "validation_feedback": None,
+    }
+
+
+class SMSAgent:
+    """
+    Compiled SMS workflow bound to a Groq client.
+
+    The graph does not depend on the lead, so it is compiled once and
+    reused for every lead processed with the same client and options.
+    With ``llm_batch_size > 1`` the generate node packs concurrent leads
+    (e.g. from ``batch`` or a worker pool) into shared requests.
+    """
+
+    def __init__(self, groq_client: GroqClient, options: Optional[AgentOptions] = None):
+        self.groq_client = groq_client
+        self.options = options or AgentOptions()
+        self.history_manager = HistoryManager(
+            max_tokens=self.options.history_max_tokens,
+            summarize=self.options.history_summary,
+        )
+        self.batch_generator: Optional[BatchGenerator] = None
+        if self.options.llm_batch_size > 1:
+            self.batch_generator = BatchGenerator(
+                groq_client,
+                batch_size=self.options.llm_batch_size,
+                max_wait=self.options.llm_batch_max_wait,
+                fallback=self.options.llm_batch_fallback,
+            )
+        self.graph = create_sms_graph(
+            self.batch_generator or groq_client, self.options, self.history_manager
+        )
+
+    def invoke(self, lead) -> AgentState:
+        """Run the workflow for a single lead."""
+        return self.graph.invoke(_initial_state(lead))
+
+    def batch(self, leads: List, max_concurrency: Optional[int] = None) -> List[AgentState]:
+        """
+        Run the workflow for many leads.
+
+        Args:
+            leads: Leads to process
+            max_concurrency: Max leads run in parallel (LangGraph default if None)
+
+        Returns:
+            Final states in the same order as ``leads``
+        """
+        if not leads:
+            return []
+        return self.graph.batch(
+            [_initial_state(lead) for lead in leads],
+            config={"max_concurrency": max_concurrency},
+        )
+
+    async def ainvoke(self, lead) -> AgentState:
+        """Async variant of :meth:`invoke`."""
+        return await self.graph.ainvoke(_initial_state(lead))
+
+    async def abatch(self, leads: List, max_concurrency: Optional[int] = None) -> List[AgentState]:
+        """Async variant of :meth:`batch`."""
+        if not leads:
+            return []
+        return await self.graph.abatch(
+            [_initial_state(lead) for lead in leads],
+            config={"max_concurrency": max_concurrency},
+        )
+
+
+_agents: "weakref.WeakKeyDictionary[GroqClient, Dict[AgentOptions, SMSAgent]]" = weakref.WeakKeyDictionary()
+_agents_lock = threading.Lock()
+
+
+def get_agent(groq_client: GroqClient, options: Optional[AgentOptions] = None) -> SMSAgent:
+    """
+    Get the compiled agent for a Groq client, compiling it on first use.
+
+    Args:
+        groq_client: Configured Groq client
+        options: Graph build options (defaults if omitted)
+
+    Returns:
+        Cached SMSAgent shared by all callers using this client and options.
+        The cached agent only holds a weak proxy of the client, so the cache
+        entry is dropped once the client is garbage collected.
+    """
+    options = options or AgentOptions()
+    with _agents_lock:
+        agents = _agents.setdefault(groq_client, {})
+        agent = agents.get(options)
+        if agent is None:
+            agent = SMSAgent(weakref.proxy(groq_client), options)
+            agents[options] = agent
+        return agent
+
+
+def cached_agent(groq_client: GroqClient, options: Optional[AgentOptions] = None) -> Optional[SMSAgent]:
+    """The agent ``get_agent`` compiled for a client and options, or None (never compiles)."""
+    with _agents_lock:
+        return _agents.get(groq_client, {}).get(options or AgentOptions())
+
+
+def run_agent(lead, groq_client: GroqClient, options: Optional[AgentOptions] = None) -> AgentState:
     """
     Run the SMS agent for a single lead.
 
     Args:
         lead: Lead object from Google Sheet
         groq_client: Configured Groq client
+        options: Graph build options (defaults if omitted)
 
     Returns:
         Final agent state with generated SMS
     """
-    graph = create_sms_graph(groq_client)
-
-    initial_state: AgentState = {
-        "lead": lead,
-        "message_type": "",
-        "generated_sms": None,
-        "updated_history": None,
-        "error": None,
-    }
-
-    result = graph.invoke(initial_state)
-    return result
+    return get_agent(groq_client, options).invoke(lead)
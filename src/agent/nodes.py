@@ -5,8 +5,23 @@ LangGraph node functions for the SMS agent.
 from src.agent.state import AgentState
 from src.config import MessageType
 from src.services import GroqClient
-from src.prompts import build_first_message_prompt, build_followup_prompt
-from src.utils import format_chat_history, append_to_history
+from src.prompts import (
+    build_first_message_prompt,
+    build_followup_prompt,
+    fill_template_name,
+    TEMPLATE_NAME,
+)
+from src.utils import (
+    format_chat_history,
+    HistoryManager,
+    metrics,
+    SingleFlight,
+    clean_sms,
+    fit_sms,
+    sms_info,
+    sms_capacity,
+)
+from src.utils.sms import GSM7, UCS2
 
 
 def classify_message_type(state: AgentState) -> AgentState:
@@ -21,45 +36,178 @@ def classify_message_type(state: AgentState) -> AgentState:
     return state
 
 
-def generate_sms(state: AgentState, groq_client: GroqClient) -> AgentState:
-    """Generate the SMS message using Groq."""
+def _build_prompt(
+    state: AgentState,
+    name: str | None = None,
+    history_manager: HistoryManager | None = None,
+) -> dict:
+    """Build the system/user prompt for the lead's message type."""
     lead = state["lead"]
-    message_type = state["message_type"]
 
+    if state["message_type"] == MessageType.FIRST.value:
+        prompt = build_first_message_prompt(
+            name=name or lead.first_name,
+            product=lead.product,
+            last_visit=lead.last_visit or "recently"
+        )
+    else:
+        prompt = build_followup_prompt(
+            name=name or lead.first_name,
+            product=lead.product,
+            chat_history=(
+                history_manager.render(lead.chat_history)
+                if history_manager
+                else format_chat_history(lead.chat_history)
+            )
+        )
+
+    # Regenerating after a failed validation: say what was wrong
+    if state.get("validation_feedback"):
+        prompt["user"] += f"\n\n{state['validation_feedback']}"
+    return prompt
+
+
+def _uses_template(state: AgentState, templates: SingleFlight | None) -> bool:
+    """First messages can share one generation per product in template mode."""
+    return (
+        templates is not None
+        and state["message_type"] == MessageType.FIRST.value
+        and not state.get("validation_feedback")
+    )
+
+
+def generate_sms(
+    state: AgentState,
+    groq_client: GroqClient,
+    templates: SingleFlight | None = None,
+    history_manager: HistoryManager | None = None,
+) -> AgentState:
+    """
+    Generate the SMS message using Groq.
+
+    With ``templates`` (template reuse), first messages are generated once
+    per prompt (keyed by the system and user prompt, which for a first
+    message with the stand-in name depend only on the product) and
+    personalised locally; leads waiting on the same template share the one
+    in-flight request.
+    """
     try:
-        if message_type == MessageType.FIRST.value:
-            prompt = build_first_message_prompt(
-                name=lead.first_name,
-                product=lead.product,
-                last_visit=lead.last_visit or "recently"
+        sms = None
+        if _uses_template(state, templates):
+            prompt = _build_prompt(state, name=TEMPLATE_NAME)
+            template = templates.get(
+                (prompt["system"], prompt["user"]),
+                lambda: groq_client.generate(prompt["system"], prompt["user"]),
             )
-        else:
-            prompt = build_followup_prompt(
-                name=lead.first_name,
-                product=lead.product,
-                chat_history=format_chat_history(lead.chat_history)
+            sms = fill_template_name(template, state["lead"].first_name)
+
+        if sms is None:
+            prompt = _build_prompt(state, history_manager=history_manager)
+            sms = groq_client.generate(prompt["system"], prompt["user"])
+        state["generated_sms"] = sms
+        state["error"] = None
+
+    except Exception as e:
+        metrics.count("node.generate", "errors")
+        state["error"] = str(e)
+        state["generated_sms"] = None
+
+    return state
+
+
+async def agenerate_sms(
+    state: AgentState,
+    groq_client: GroqClient,
+    templates: SingleFlight | None = None,
+    history_manager: HistoryManager | None = None,
+) -> AgentState:
+    """Async variant of :func:`generate_sms` used by ``ainvoke``/``abatch``."""
+    try:
+        sms = None
+        if _uses_template(state, templates):
+            prompt = _build_prompt(state, name=TEMPLATE_NAME)
+            template = await templates.aget(
+                (prompt["system"], prompt["user"]),
+                lambda: groq_client.agenerate(prompt["system"], prompt["user"]),
             )
+            sms = fill_template_name(template, state["lead"].first_name)
 
-        sms = groq_client.generate(prompt["system"], prompt["user"])
+        if sms is None:
+            prompt = _build_prompt(state, history_manager=history_manager)
+            sms = await groq_client.agenerate(prompt["system"], prompt["user"])
         state["generated_sms"] = sms
         state["error"] = None
 
     except Exception as e:
+        metrics.count("node.generate", "errors")
         state["error"] = str(e)
         state["generated_sms"] = None
 
     return state
 
 
+def validate_sms(state: AgentState, max_segments: int = 1, max_retries: int = 2) -> AgentState:
+    """
+    Clean the generated SMS and check it fits in ``max_segments`` parts.
+
+    A failing draft sets ``validation_feedback`` so the graph routes the
+    lead back to generate (at most ``max_retries`` times); after that it
+    is shortened locally instead.
+    """
+    state["validation_feedback"] = None
+    if state["error"] or state["generated_sms"] is None:
+        return state
+
+    sms = clean_sms(state["generated_sms"])
+    info = sms_info(sms)
+    if sms and info.segments <= max_segments:
+        state["generated_sms"] = sms
+        state["sms_encoding"], state["sms_segments"] = info.encoding, info.segments
+        return state
+
+    metrics.count("node.validate", "failed")
+    attempts = state.get("validation_attempts") or 0
+    if attempts < max_retries:
+        metrics.count("node.validate", "retries")
+        state["validation_attempts"] = attempts + 1
+        state["validation_feedback"] = _feedback(sms, info, max_segments)
+        return state
+
+    if not sms:
+        state["error"] = "Generated SMS is empty"
+        state["generated_sms"] = None
+        return state
+
+    metrics.count("node.validate", "truncated")
+    sms = fit_sms(sms, max_segments)
+    info = sms_info(sms)
+    state["generated_sms"] = sms
+    state["sms_encoding"], state["sms_segments"] = info.encoding, info.segments
+    return state
+
+
+def _feedback(sms: str, info, max_segments: int) -> str:
+    """Instruction appended to the prompt when a draft is regenerated."""
+    if not sms:
+        return "Your previous reply was empty. Output ONLY the SMS text."
+    limit = sms_capacity(GSM7, max_segments)
+    note = " Do not use emoji or special symbols." if info.encoding == UCS2 else ""
+    return (
+        f"Your previous draft was too long ({info.length} characters, {info.segments} "
+        f"SMS segments). Rewrite it in under {limit} characters.{note}"
+    )
+
+
+def route_after_validation(state: AgentState) -> str:
+    """Send rejected drafts back to generate, the rest on to update_history."""
+    return "generate" if state.get("validation_feedback") else "update_history"
+
+
 def update_history(state: AgentState) -> AgentState:
     """Update chat history with the new message."""
     if state["generated_sms"]:
-        lead = state["lead"]
-        new_history = append_to_history(
-            existing_history=lead.chat_history,
-            role="assistant",
-            message=state["generated_sms"]
-        )
-        state["updated_history"] = new_history
+        history = state["lead"].chat_history.copy()
+        history.append(role="assistant", message=state["generated_sms"])
+        state["updated_history"] = history.to_text()
 
     return state
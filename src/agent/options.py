@@ -0,0 +1,35 @@
+"""
+Options controlling how the SMS agent graph is built.
+"""
+
+from dataclasses import dataclass
+
+from src.config import Settings
+
+
+@dataclass(frozen=True)
+class AgentOptions:
+    """Graph build options (hashable, so compiled agents can be cached per option set)."""
+
+    template_reuse: bool = False
+    history_max_tokens: int = 400
+    history_summary: bool = True
+    llm_batch_size: int = 1
+    llm_batch_max_wait: float = 0.2
+    llm_batch_fallback: str = "single"
+    sms_max_segments: int = 1
+    sms_max_retries: int = 2
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "AgentOptions":
+        """Build agent options from application settings."""
+        return cls(
+            template_reuse=settings.template_reuse,
+            history_max_tokens=settings.history_max_tokens,
+            history_summary=settings.history_summary,
+            llm_batch_size=settings.llm_batch_size,
+            llm_batch_max_wait=settings.llm_batch_max_wait,
+            llm_batch_fallback=settings.llm_batch_fallback,
+            sms_max_segments=settings.sms_max_segments,
+            sms_max_retries=settings.sms_max_retries,
+        )
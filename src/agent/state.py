@@ -14,3 +14,7 @@ class AgentState(TypedDict):
     generated_sms: Optional[str]
     updated_history: Optional[str]
     error: Optional[str]
+    sms_encoding: Optional[str]  # "GSM-7" or "UCS-2" once validated
+    sms_segments: Optional[int]
+    validation_attempts: int  # Regenerations requested by the validate node
+    validation_feedback: Optional[str]  # Why the last draft was rejected
@@ -1,6 +1,6 @@
 """Config package exports."""
 
-from .settings import Settings, get_settings
+from .settings import Settings, SheetTarget, get_settings
 from .constants import SheetColumn, MessageType, MAX_SMS_LENGTH
 
-__all__ = ["Settings", "get_settings", "SheetColumn", "MessageType", "MAX_SMS_LENGTH"]
+__all__ = ["Settings", "SheetTarget", "get_settings", "SheetColumn", "MessageType", "MAX_SMS_LENGTH"]
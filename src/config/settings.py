@@ -3,8 +3,43 @@ Application settings loaded from environment variables.
 """
 
 import os
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+def _split_list(value: Optional[str]) -> List[str]:
+    """Split a comma-separated environment value into non-empty items."""
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean environment flag ("1", "true" or "yes" are true)."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class SheetTarget:
+    """One worksheet of one spreadsheet to read leads from."""
+
+    sheet_id: str
+    worksheet_name: str
+
+    @property
+    def key(self) -> str:
+        """Stable identifier, used to key per-sheet state."""
+        return f"{self.sheet_id}/{self.worksheet_name}"
+
+
+def _parse_targets(value: Optional[str], default_worksheet: str) -> List[SheetTarget]:
+    """Parse "sheet_id[:worksheet],..." into targets."""
+    targets = []
+    for item in _split_list(value):
+        sheet_id, _, worksheet = item.partition(":")
+        targets.append(SheetTarget(sheet_id.strip(), worksheet.strip() or default_worksheet))
+    return targets
 
 
 @dataclass
@@ -26,18 +61,103 @@ class Settings:
     twilio_account_sid: Optional[str]
     twilio_auth_token: Optional[str]
     twilio_phone_number: Optional[str]
+    twilio_phone_numbers: List[str] = field(default_factory=list)
+    twilio_messages_per_second: float = 1.0
+    twilio_max_retries: int = 3
+    # Country code for national numbers in the sheet ("" = use as written)
+    default_country_code: str = ""
+
+    # Generation cache (template_reuse: one first message per product,
+    # personalised with the lead's name locally)
+    generation_cache: bool = True
+    generation_cache_size: int = 1024
+    generation_cache_ttl: float = 86400.0
+    generation_cache_path: Optional[str] = None
+    template_reuse: bool = False
+
+    # Follow-up prompt history window (tokens) and summary of older turns
+    history_max_tokens: int = 400
+    history_summary: bool = True
+
+    # Batched LLM generation (1 disables; fallback is "single" or "error")
+    llm_batch_size: int = 1
+    llm_batch_max_wait: float = 0.2
+    llm_batch_fallback: str = "single"
+
+    # Generated messages must fit in this many SMS segments; failing drafts
+    # are regenerated up to sms_max_retries times, then shortened locally
+    sms_max_segments: int = 1
+    sms_max_retries: int = 2
+
+    # Every worksheet processed in a run (defaults to the one above)
+    sheet_targets: List[SheetTarget] = field(default_factory=list)
+
+    # Rows fetched per request when streaming the sheet
+    sheet_page_size: int = 500
+
+    # Batched sheet write-back
+    sheet_write_batch_size: int = 100
+    sheet_write_max_age: float = 10.0
+
+    # Incremental sync state file
+    sync_state_path: str = ".roya_sync.json"
+
+    # Optional local SQLite lead store (disabled when unset)
+    lead_store_path: Optional[str] = None
+
+    # Per-run caps applied by the work planner (0 = unlimited)
+    max_leads_per_run: int = 0
+    max_new_per_run: int = 0
+    max_followups_per_run: int = 0
+
+    # Write-ahead journal for resuming interrupted runs (disabled when empty)
+    journal_path: Optional[str] = ".roya_journal.db"
+
+    # Drafts pre-generated by --mode prepare for --mode send
+    outbox_path: Optional[str] = ".roya_outbox.db"
+
+    # Per-stage timing and counters (reported at the end of a run)
+    metrics_enabled: bool = True
+
+    # Concurrency (max in-flight calls per downstream service: Groq HTTP
+    # requests, SMS dispatcher workers, and worksheets read at once)
+    groq_concurrency: int = 4
+    twilio_concurrency: int = 4
+    sheets_concurrency: int = 4
+
+    # Groq HTTP connection pool
+    groq_http2: bool = True
+    groq_timeout: float = 30.0
+    groq_connect_timeout: float = 5.0
+    groq_max_connections: int = 20
+    groq_max_keepalive: int = 10
+    groq_keepalive_expiry: float = 30.0
+
+    # Groq quota (0 disables the limit) and retries
+    groq_rpm: int = 30
+    groq_tpm: int = 6000
+    groq_max_retries: int = 5
+
+    def __post_init__(self):
+        if not self.sheet_targets:
+            self.sheet_targets = [SheetTarget(self.google_sheet_id, self.worksheet_name)]
 
     @classmethod
     def from_env(cls) -> "Settings":
         """Load settings from environment variables."""
-        google_sheet_id = os.getenv("GOOGLE_SHEET_ID")
+        worksheet_name = os.getenv("WORKSHEET_NAME", "Sheet1")
+        sheet_targets = _parse_targets(os.getenv("SHEET_TARGETS"), worksheet_name)
+        google_sheet_id = os.getenv("GOOGLE_SHEET_ID") or (
+            sheet_targets[0].sheet_id if sheet_targets else None
+        )
         if not google_sheet_id:
-            raise ValueError("GOOGLE_SHEET_ID is required")
+            raise ValueError("GOOGLE_SHEET_ID (or SHEET_TARGETS) is required")
 
         return cls(
             google_sheet_id=google_sheet_id,
             google_credentials_path=os.getenv("GOOGLE_CREDENTIALS_PATH", "credentials.json"),
-            worksheet_name=os.getenv("WORKSHEET_NAME", "Sheet1"),
+            worksheet_name=worksheet_name,
+            sheet_targets=sheet_targets,
             groq_api_key=os.getenv("GROQ_API_KEY"),
             model_name=os.getenv("AI_MODEL", "llama-3.1-8b-instant"),
             max_tokens=int(os.getenv("MAX_TOKENS", "150")),
@@ -45,6 +165,46 @@ class Settings:
             twilio_account_sid=os.getenv("TWILIO_ACCOUNT_SID"),
             twilio_auth_token=os.getenv("TWILIO_AUTH_TOKEN"),
             twilio_phone_number=os.getenv("TWILIO_PHONE_NUMBER"),
+            twilio_phone_numbers=_split_list(os.getenv("TWILIO_PHONE_NUMBERS"))
+            or _split_list(os.getenv("TWILIO_PHONE_NUMBER")),
+            twilio_messages_per_second=float(os.getenv("TWILIO_MPS", "1")),
+            twilio_max_retries=int(os.getenv("TWILIO_MAX_RETRIES", "3")),
+            default_country_code=os.getenv("DEFAULT_COUNTRY_CODE", "").strip().lstrip("+"),
+            generation_cache=_env_bool("GENERATION_CACHE", True),
+            generation_cache_size=int(os.getenv("GENERATION_CACHE_SIZE", "1024")),
+            generation_cache_ttl=float(os.getenv("GENERATION_CACHE_TTL", "86400")),
+            generation_cache_path=os.getenv("GENERATION_CACHE_PATH") or None,
+            template_reuse=_env_bool("TEMPLATE_REUSE", False),
+            history_max_tokens=int(os.getenv("HISTORY_MAX_TOKENS", "400")),
+            history_summary=_env_bool("HISTORY_SUMMARY", True),
+            llm_batch_size=int(os.getenv("LLM_BATCH_SIZE", "1")),
+            llm_batch_max_wait=float(os.getenv("LLM_BATCH_MAX_WAIT", "0.2")),
+            llm_batch_fallback=os.getenv("LLM_BATCH_FALLBACK", "single"),
+            sms_max_segments=int(os.getenv("SMS_MAX_SEGMENTS", "1")),
+            sms_max_retries=int(os.getenv("SMS_MAX_RETRIES", "2")),
+            sheet_page_size=int(os.getenv("SHEET_PAGE_SIZE", "500")),
+            sheet_write_batch_size=int(os.getenv("SHEET_WRITE_BATCH_SIZE", "100")),
+            sheet_write_max_age=float(os.getenv("SHEET_WRITE_MAX_AGE", "10")),
+            sync_state_path=os.getenv("SYNC_STATE_PATH", ".roya_sync.json"),
+            lead_store_path=os.getenv("LEAD_STORE_PATH") or None,
+            max_leads_per_run=int(os.getenv("MAX_LEADS_PER_RUN", "0")),
+            max_new_per_run=int(os.getenv("MAX_NEW_PER_RUN", "0")),
+            max_followups_per_run=int(os.getenv("MAX_FOLLOWUPS_PER_RUN", "0")),
+            journal_path=os.getenv("JOURNAL_PATH", ".roya_journal.db") or None,
+            outbox_path=os.getenv("OUTBOX_PATH", ".roya_outbox.db") or None,
+            metrics_enabled=_env_bool("METRICS_ENABLED", True),
+            groq_concurrency=int(os.getenv("GROQ_CONCURRENCY", "4")),
+            twilio_concurrency=int(os.getenv("TWILIO_CONCURRENCY", "4")),
+            sheets_concurrency=int(os.getenv("SHEETS_CONCURRENCY", "4")),
+            groq_http2=_env_bool("GROQ_HTTP2", True),
+            groq_timeout=float(os.getenv("GROQ_TIMEOUT", "30")),
+            groq_connect_timeout=float(os.getenv("GROQ_CONNECT_TIMEOUT", "5")),
+            groq_max_connections=int(os.getenv("GROQ_MAX_CONNECTIONS", "20")),
+            groq_max_keepalive=int(os.getenv("GROQ_MAX_KEEPALIVE", "10")),
+            groq_keepalive_expiry=float(os.getenv("GROQ_KEEPALIVE_EXPIRY", "30")),
+            groq_rpm=int(os.getenv("GROQ_RPM", "30")),
+            groq_tpm=int(os.getenv("GROQ_TPM", "6000")),
+            groq_max_retries=int(os.getenv("GROQ_MAX_RETRIES", "5")),
         )
 
 
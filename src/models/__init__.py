@@ -1,5 +1,7 @@
 """Models package exports."""
 
+from .chat_history import ChatHistory, ChatTurn
 from .lead import Lead
+from .snapshot import LeadSnapshot
 
-__all__ = ["Lead"]
+__all__ = ["ChatHistory", "ChatTurn", "Lead", "LeadSnapshot"]
@@ -0,0 +1,181 @@
+"""
+Structured chat history stored in the sheet's Chat History cell.
+"""
+
+import re
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+
+# One history entry: "[timestamp] ROLE: message"
+HISTORY_LINE = re.compile(r"^\[(?P<timestamp>[^\]]*)\] (?P<role>[A-Za-z_]+): (?P<message>.*)$")
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+
+
+class ChatTurn:
+    """A single message in the conversation."""
+
+    __slots__ = ("timestamp", "role", "message")
+
+    def __init__(self, timestamp: Optional[str], role: Optional[str], message: str):
+        self.timestamp = timestamp
+        self.role = role
+        self.message = message
+
+    def render(self) -> str:
+        """Format the turn as it appears in the cell."""
+        if self.role is None:
+            return self.message
+        return f"[{self.timestamp}] {self.role}: {self.message}"
+
+    @property
+    def is_customer(self) -> bool:
+        return self.role is not None and self.role.upper() == "CUSTOMER"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ChatTurn):
+            return NotImplemented
+        return (self.timestamp, self.role, self.message) == (other.timestamp, other.role, other.message)
+
+    def __repr__(self) -> str:
+        return f"ChatTurn({self.timestamp!r}, {self.role!r}, {self.message!r})"
+
+
+class ChatHistory:
+    """
+    Ordered list of chat turns with O(1) append and last-turn access.
+
+    ``parse`` and ``to_text`` round-trip the cell format: lines that don't
+    start a new entry are kept as continuations of the previous message
+    (or as a role-less turn if they come first). Parsing is deferred until
+    turns are first accessed, so histories that are only checked for
+    emptiness or written back unchanged never pay for it. Blank cells
+    all share ``EMPTY_HISTORY``; ``copy()`` it before appending.
+    """
+
+    __slots__ = ("_text", "_turns")
+
+    def __init__(self, turns: Optional[List[ChatTurn]] = None):
+        self._text: Optional[str] = None
+        self._turns: Optional[List[ChatTurn]] = turns if turns is not None else []
+
+    @classmethod
+    def parse(cls, text: Optional[str]) -> "ChatHistory":
+        """
+        Wrap a Chat History cell (parsed lazily on first access).
+
+        Args:
+            text: Raw cell value (None or blank for no history)
+
+        Returns:
+            ChatHistory instance
+        """
+        text = text.strip() if text else ""
+        if not text:
+            return EMPTY_HISTORY
+        history = cls.__new__(cls)
+        history._text = text
+        history._turns = None
+        return history
+
+    @staticmethod
+    def _parse_turns(text: str) -> List[ChatTurn]:
+        turns: List[ChatTurn] = []
+        for line in text.splitlines():
+            match = HISTORY_LINE.match(line)
+            if match:
+                turns.append(ChatTurn(match["timestamp"], match["role"], match["message"]))
+            elif turns:
+                turns[-1].message = f"{turns[-1].message}\n{line}"
+            else:
+                turns.append(ChatTurn(None, None, line))
+        return turns
+
+    @property
+    def turns(self) -> List[ChatTurn]:
+        """Parsed turns (parsing the cell text on first access)."""
+        if self._turns is None:
+            self._turns = self._parse_turns(self._text)
+        return self._turns
+
+    def to_text(self) -> str:
+        """Serialize back to the cell format ("" when empty)."""
+        if self._text is None:
+            self._text = "\n".join(turn.render() for turn in self._turns)
+        return self._text
+
+    def append(self, role: str, message: str, timestamp: Optional[str] = None) -> ChatTurn:
+        """
+        Add a new message.
+
+        Args:
+            role: "assistant" or "customer"
+            message: The message text
+            timestamp: Defaults to now
+
+        Returns:
+            The appended turn
+        """
+        turn = ChatTurn(
+            timestamp or datetime.now().strftime(TIMESTAMP_FORMAT),
+            role.upper(),
+            message,
+        )
+        turns = self.turns
+        if self._text:
+            self._text = f"{self._text}\n{turn.render()}"
+        elif self._text is not None:
+            self._text = turn.render()
+        turns.append(turn)
+        return turn
+
+    def copy(self) -> "ChatHistory":
+        """Copy that can be appended to independently."""
+        history = ChatHistory.__new__(ChatHistory)
+        history._text = self._text
+        history._turns = list(self._turns) if self._turns is not None else None
+        return history
+
+    @property
+    def last(self) -> Optional[ChatTurn]:
+        """Most recent turn, if any."""
+        turns = self.turns
+        return turns[-1] if turns else None
+
+    def __len__(self) -> int:
+        return len(self.turns)
+
+    def __bool__(self) -> bool:
+        if self._turns is None:
+            return bool(self._text)
+        return bool(self._turns)
+
+    def __iter__(self) -> Iterator[ChatTurn]:
+        return iter(self.turns)
+
+    def __getitem__(self, index):
+        return self.turns[index]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ChatHistory):
+            return NotImplemented
+        return self.to_text() == other.to_text()
+
+    def __str__(self) -> str:
+        return self.to_text()
+
+    def __repr__(self) -> str:
+        return f"ChatHistory({len(self)} turns)"
+
+
+class _EmptyChatHistory(ChatHistory):
+    """Shared, read-only history for blank cells."""
+
+    __slots__ = ()
+
+    def append(self, role: str, message: str, timestamp: Optional[str] = None) -> ChatTurn:
+        raise TypeError("EMPTY_HISTORY is shared; append to a copy() instead")
+
+
+EMPTY_HISTORY: ChatHistory = _EmptyChatHistory()
@@ -3,12 +3,29 @@ Lead data model representing a row from Google Sheets.
 """
 
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterable, List, Optional
 
+from src.models.chat_history import ChatHistory, EMPTY_HISTORY
 
-@dataclass
+
+# Columns read from each sheet row (Name .. Chat History)
+_ROW_WIDTH = 6
+_PADDING = (None,) * _ROW_WIDTH
+
+
+def _cell(value) -> Optional[str]:
+    """Normalise a raw cell value (None for empty cells)."""
+    return str(value).strip() if value else None
+
+
+@dataclass(slots=True)
 class Lead:
-    """Represents a lead from the Google Sheet."""
+    """
+    Represents a lead from the Google Sheet.
+
+    Slotted to keep per-lead memory low on large sheets; derived values
+    are properties, so a lead stores only its cells.
+    """
 
     row_number: int
     name: str
@@ -16,27 +33,34 @@ class Lead:
     product: str
     last_visit: Optional[str] = None
     sms_sent: Optional[str] = None
-    chat_history: Optional[str] = None
+    chat_history: ChatHistory = field(default_factory=lambda: EMPTY_HISTORY)
+
+    def __post_init__(self):
+        # Accept the raw cell text as well as a parsed history
+        if type(self.chat_history) is str:
+            self.chat_history = ChatHistory.parse(self.chat_history)
+        elif self.chat_history is None:
+            self.chat_history = EMPTY_HISTORY
 
     @property
     def first_name(self) -> str:
         """Extract first name from full name."""
-        return self.name.split()[0] if self.name else ""
+        return self.name.split(None, 1)[0] if self.name else ""
 
     @property
     def has_been_contacted(self) -> bool:
         """Check if lead has received any SMS."""
-        return bool(self.sms_sent and self.sms_sent.strip())
+        return bool(self.sms_sent and not self.sms_sent.isspace())
 
     @property
     def has_chat_history(self) -> bool:
         """Check if lead has previous conversation."""
-        return bool(self.chat_history and self.chat_history.strip())
+        return bool(self.chat_history)
 
     @property
     def needs_followup(self) -> bool:
         """Check if lead needs a follow-up message."""
-        return self.has_chat_history
+        return bool(self.chat_history)
 
     def to_dict(self) -> dict:
         """Convert to dictionary for serialization."""
@@ -47,7 +71,7 @@ class Lead:
             "product": self.product,
             "last_visit": self.last_visit,
             "sms_sent": self.sms_sent,
-            "chat_history": self.chat_history,
+            "chat_history": self.chat_history.to_text() or None,
         }
 
     @classmethod
@@ -62,19 +86,38 @@ class Lead:
         Returns:
             Lead instance
         """
-        def safe_get(index: int) -> Optional[str]:
-            try:
-                value = row_data[index]
-                return str(value).strip() if value else None
-            except IndexError:
-                return None
+        if len(row_data) >= _ROW_WIDTH:
+            name, phone, product, last_visit, sms_sent, chat_history = row_data[:_ROW_WIDTH]
+        else:
+            name, phone, product, last_visit, sms_sent, chat_history = (
+                *row_data, *_PADDING[len(row_data):]
+            )
 
         return cls(
-            row_number=row_number,
-            name=safe_get(0) or "",
-            phone=safe_get(1) or "",
-            product=safe_get(2) or "",
-            last_visit=safe_get(3),
-            sms_sent=safe_get(4),
-            chat_history=safe_get(5),
+            row_number,
+            _cell(name) or "",
+            _cell(phone) or "",
+            _cell(product) or "",
+            _cell(last_visit),
+            _cell(sms_sent),
+            ChatHistory.parse(_cell(chat_history)),
         )
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[list], start_row: int = 2) -> List["Lead"]:
+        """
+        Create leads for many sheet rows in one pass.
+
+        Args:
+            rows: Row values, without the header row
+            start_row: Sheet row number of the first row
+
+        Returns:
+            Leads for every row that has a name
+        """
+        from_row = cls.from_row
+        return [
+            from_row(row_number, row)
+            for row_number, row in enumerate(rows, start=start_row)
+            if row and row[0]
+        ]
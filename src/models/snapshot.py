@@ -0,0 +1,67 @@
+"""
+Immutable, indexed snapshot of all leads in a worksheet.
+"""
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import List, Mapping, Tuple
+
+from src.models.lead import Lead
+from src.utils import normalize_phones
+
+
+@dataclass(frozen=True)
+class LeadSnapshot:
+    """
+    All leads read from the sheet in a single fetch, with precomputed indexes.
+
+    Built once per run so every query is answered locally instead of
+    re-downloading the worksheet.
+    """
+
+    leads: Tuple[Lead, ...]
+    not_contacted: Tuple[Lead, ...]
+    needs_followup: Tuple[Lead, ...]
+    by_phone: Mapping[str, Tuple[Lead, ...]]     # E.164 number -> leads (valid phones only)
+    by_row: Mapping[int, Lead]
+
+    @classmethod
+    def from_leads(cls, leads: List[Lead], default_country_code: str = "") -> "LeadSnapshot":
+        """
+        Build a snapshot and its indexes from parsed leads.
+
+        Args:
+            leads: Parsed leads
+            default_country_code: See ``normalize_phones``
+        """
+        by_phone = {}
+        phones, _ = normalize_phones((lead.phone for lead in leads), default_country_code)
+        for lead, phone in zip(leads, phones):
+            if phone is not None:
+                by_phone.setdefault(phone, []).append(lead)
+
+        return cls(
+            leads=tuple(leads),
+            not_contacted=tuple(lead for lead in leads if not lead.has_been_contacted),
+            needs_followup=tuple(lead for lead in leads if lead.needs_followup),
+            by_phone=MappingProxyType({k: tuple(v) for k, v in by_phone.items()}),
+            by_row=MappingProxyType({lead.row_number: lead for lead in leads}),
+        )
+
+    @classmethod
+    def from_rows(cls, rows: List[list], default_country_code: str = "") -> "LeadSnapshot":
+        """
+        Build a snapshot from raw worksheet values.
+
+        Args:
+            rows: All sheet values, including the header row
+            default_country_code: See ``normalize_phones``
+
+        Returns:
+            LeadSnapshot of every row that has a name
+        """
+        # Skip header row (index 0), start from row 2 in sheet terms
+        return cls.from_leads(Lead.from_rows(rows[1:], start_row=2), default_country_code)
+
+    def __len__(self) -> int:
+        return len(self.leads)
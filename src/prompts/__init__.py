@@ -1,9 +1,11 @@
 """Prompts package exports."""
 
-from .first_message import build_first_message_prompt
+from .first_message import build_first_message_prompt, fill_template_name, TEMPLATE_NAME
 from .followup_message import build_followup_prompt
 
 __all__ = [
     "build_first_message_prompt",
     "build_followup_prompt",
+    "fill_template_name",
+    "TEMPLATE_NAME",
 ]
@@ -29,3 +29,21 @@ def build_first_message_prompt(name: str, product: str, last_visit: str) -> dict
         "system": SYSTEM_PROMPT,
         "user": USER_PROMPT.format(name=name, product=product)
     }
+
+
+# Stand-in name used when one message is generated per product and
+# personalised locally (template reuse mode)
+TEMPLATE_NAME = "[FIRST_NAME]"
+
+
+def fill_template_name(template: str, name: str) -> str | None:
+    """
+    Personalise a message generated for ``TEMPLATE_NAME``.
+
+    Returns:
+        The message with the lead's name, or None if the model dropped
+        the placeholder (the caller should generate for the lead instead)
+    """
+    if TEMPLATE_NAME not in template:
+        return None
+    return template.replace(TEMPLATE_NAME, name)
@@ -1,7 +1,32 @@
-"""Services package exports."""
+"""Services package exports (each service and its SDK load on first access)."""
 
-from .sheet_handler import SheetHandler
-from .ai_client import GroqClient
-from .sms_sender import SMSSender
+from typing import TYPE_CHECKING
 
-__all__ = ["SheetHandler", "GroqClient", "SMSSender"]
+from src.utils.lazy import lazy_exports
+
+_EXPORTS = {
+    "SheetHandler": ".sheet_handler",
+    "GroqClient": ".ai_client",
+    "BatchGenerator": ".batch_generator",
+    "SMSSender": ".sms_sender",
+    "SMSDispatcher": ".sms_dispatcher",
+    "IncrementalSync": ".sheet_sync",
+    "LeadStore": ".lead_store",
+    "RunJournal": ".run_journal",
+    "Outbox": ".outbox",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .sheet_handler import SheetHandler
+    from .ai_client import GroqClient
+    from .batch_generator import BatchGenerator
+    from .sms_sender import SMSSender
+    from .sms_dispatcher import SMSDispatcher
+    from .sheet_sync import IncrementalSync
+    from .lead_store import LeadStore
+    from .run_journal import RunJournal
+    from .outbox import Outbox
+
+__all__ = ["SheetHandler", "GroqClient", "BatchGenerator", "SMSSender", "SMSDispatcher", "IncrementalSync", "LeadStore", "RunJournal", "Outbox"]
@@ -2,14 +2,43 @@
 Groq AI client for generating SMS messages.
 """
 
+import asyncio
+import json
+import threading
+import time
+import warnings
+from typing import Optional
+
 import httpx
 from src.config import Settings
+from src.services.generation_cache import GenerationCache
+from src.services.rate_limiter import RateLimiter, RetryPolicy, parse_retry_after
+from src.utils.metrics import metrics
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 
 class GroqClient:
-    """Client for Groq API (OpenAI-compatible)."""
+    """
+    Client for Groq API (OpenAI-compatible).
+
+    Keeps long-lived, connection-pooled HTTP clients so requests reuse
+    TCP/TLS connections. Use as a context manager or call ``close`` when
+    done; code that calls ``agenerate`` must use ``async with`` or
+    ``await aclose()`` instead, since only that closes the async client.
+
+    Requests go through a shared requests/tokens-per-minute limiter, at
+    most ``GROQ_CONCURRENCY`` are in flight at once, and they are retried with jittered exponential backoff on 429s, 5xx responses
+    and transport errors, honouring ``retry-after``. Identical requests
+    are served from the generation cache when one is configured.
+    """
 
     BASE_URL = "https://api.groq.com/openai/v1/chat/completions"
+    RETRYABLE_STATUS = {429, 500, 502, 503, 504}
 
     def __init__(self, settings: Settings):
         self.api_key = settings.groq_api_key
@@ -20,25 +49,79 @@ class GroqClient:
         if not self.api_key:
             raise ValueError("GROQ_API_KEY environment variable is required")
 
-    def generate(self, system_prompt: str, user_prompt: str) -> str:
-        """
-        Generate a response using Groq.
+        self.http2 = settings.groq_http2 and HTTP2_AVAILABLE
+        self.timeout = httpx.Timeout(settings.groq_timeout, connect=settings.groq_connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=settings.groq_max_connections,
+            max_keepalive_connections=settings.groq_max_keepalive,
+            keepalive_expiry=settings.groq_keepalive_expiry,
+        )
 
-        Args:
-            system_prompt: System instructions for the AI
-            user_prompt: User message/request
+        self.rate_limiter = RateLimiter(settings.groq_rpm, settings.groq_tpm)
+        # Requests in flight at once, held only around the HTTP call so
+        # batched callers can wait in the BatchGenerator without a slot
+        self.max_concurrency = max(1, settings.groq_concurrency)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._async_slots: Optional[asyncio.Semaphore] = None
+        self.retry_policy = RetryPolicy(max_retries=settings.groq_max_retries)
+        self.cache: Optional[GenerationCache] = None
+        if settings.generation_cache:
+            self.cache = GenerationCache(
+                max_entries=settings.generation_cache_size,
+                ttl=settings.generation_cache_ttl,
+                path=settings.generation_cache_path,
+            )
 
-        Returns:
-            Generated text response
-        """
-        headers = {
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._lock = threading.Lock()
+
+    @property
+    def headers(self) -> dict:
+        """Request headers for the Groq API."""
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
 
-        payload = {
+    @property
+    def client(self) -> httpx.Client:
+        """Get the pooled sync HTTP client, creating it on first use."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(
+                        headers=self.headers,
+                        timeout=self.timeout,
+                        limits=self.limits,
+                        http2=self.http2,
+                    )
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Get the pooled async HTTP client, creating it on first use."""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+            )
+        return self._async_client
+
+    @property
+    def async_slots(self) -> asyncio.Semaphore:
+        """Concurrency limit for async requests (same size as the sync one)."""
+        if self._async_slots is None:
+            self._async_slots = asyncio.Semaphore(self.max_concurrency)
+        return self._async_slots
+
+    def _build_payload(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> dict:
+        """Build the chat completions request body."""
+        return {
             "model": self.model,
-            "max_tokens": self.max_tokens,
+            "max_tokens": max_tokens or self.max_tokens,
             "temperature": self.temperature,
             "messages": [
                 {"role": "system", "content": system_prompt},
@@ -46,8 +129,201 @@ class GroqClient:
             ],
         }
 
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(self.BASE_URL, json=payload, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            return data["choices"][0]["message"]["content"].strip()
+    def _estimate_tokens(self, payload: dict) -> int:
+        """Rough token cost of a request (~4 chars/token plus max output)."""
+        prompt_chars = sum(len(m["content"]) for m in payload["messages"])
+        return prompt_chars // 4 + payload["max_tokens"]
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> Optional[float]:
+        """
+        Decide whether to retry a failed attempt.
+
+        Args:
+            attempt: 0-based attempt number that just failed
+            response: The response, or None for a transport error
+
+        Returns:
+            Seconds to wait before retrying, or None to give up
+        """
+        if attempt >= self.retry_policy.max_retries:
+            return None
+        if response is None:
+            return self.retry_policy.delay(attempt)
+        if response.status_code not in self.RETRYABLE_STATUS:
+            return None
+
+        retry_after = parse_retry_after(response.headers.get("retry-after"))
+        if response.status_code == 429 and retry_after is not None:
+            # Quota exhausted for everyone sharing this client, not just us
+            self.rate_limiter.pause(retry_after)
+        return self.retry_policy.delay(attempt, retry_after)
+
+    @staticmethod
+    def _record(response: httpx.Response) -> None:
+        """Count payload sizes and error responses for the run report."""
+        metrics.count("groq.request", "bytes_sent", len(response.request.content))
+        metrics.count("groq.request", "bytes_received", len(response.content))
+        if response.status_code == 429:
+            metrics.count("groq.request", "rate_limited")
+        elif response.is_error:
+            metrics.count("groq.request", "errors")
+
+    def _parse_response(self, response: httpx.Response, estimated_tokens: int) -> str:
+        """Extract the generated text from a chat completions response."""
+        response.raise_for_status()
+        data = response.json()
+        usage = data.get("usage") or {}
+        if "total_tokens" in usage:
+            self.rate_limiter.settle(estimated_tokens, usage["total_tokens"])
+            metrics.count("groq.request", "tokens", usage["total_tokens"])
+        return data["choices"][0]["message"]["content"].strip()
+
+    def cache_key(self, system_prompt: str, user_prompt: str) -> Optional[str]:
+        """Generation cache key for a request (None when caching is off)."""
+        if self.cache is None:
+            return None
+        return self.cache.key(self.model, self.temperature, system_prompt, user_prompt)
+
+    def generate(self, system_prompt: str, user_prompt: str, use_cache: bool = True) -> str:
+        """
+        Generate a response using Groq.
+
+        Args:
+            system_prompt: System instructions for the AI
+            user_prompt: User message/request
+            use_cache: Consult and fill the generation cache
+
+        Returns:
+            Generated text response
+        """
+        key = self.cache_key(system_prompt, user_prompt) if use_cache else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        text = self._complete(self._build_payload(system_prompt, user_prompt))
+        if key is not None:
+            self.cache.set(key, text)
+        return text
+
+    async def agenerate(self, system_prompt: str, user_prompt: str) -> str:
+        """Async variant of :meth:`generate`."""
+        key = self.cache_key(system_prompt, user_prompt)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        text = await self._acomplete(self._build_payload(system_prompt, user_prompt))
+        if key is not None:
+            self.cache.set(key, text)
+        return text
+
+    def generate_json(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> dict:
+        """
+        Generate a JSON object response (Groq JSON mode).
+
+        Args:
+            system_prompt: System instructions, which must ask for JSON
+            user_prompt: User message/request
+            max_tokens: Output token limit (defaults to the configured limit)
+
+        Returns:
+            The decoded JSON object
+
+        Raises:
+            ValueError: If the response is not a JSON object
+        """
+        payload = self._build_payload(system_prompt, user_prompt, max_tokens)
+        payload["response_format"] = {"type": "json_object"}
+        data = json.loads(self._complete(payload))
+        if not isinstance(data, dict):
+            raise ValueError("Expected a JSON object from the model")
+        return data
+
+    def _complete(self, payload: dict) -> str:
+        """Send a request with rate limiting and retries."""
+        tokens = self._estimate_tokens(payload)
+
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(tokens)
+            try:
+                with self._slots, metrics.timer("groq.request"):
+                    response = self.client.post(self.BASE_URL, json=payload)
+            except httpx.TransportError:
+                delay = self._retry_delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                self._record(response)
+                delay = self._retry_delay(attempt, response) if response.is_error else None
+                if delay is None:
+                    return self._parse_response(response, tokens)
+            metrics.count("groq.request", "retries")
+            time.sleep(delay)
+            attempt += 1
+
+    async def _acomplete(self, payload: dict) -> str:
+        """Async variant of :meth:`_complete`."""
+        tokens = self._estimate_tokens(payload)
+
+        attempt = 0
+        while True:
+            await self.rate_limiter.aacquire(tokens)
+            try:
+                async with self.async_slots:
+                    with metrics.timer("groq.request"):
+                        response = await self.async_client.post(self.BASE_URL, json=payload)
+            except httpx.TransportError:
+                delay = self._retry_delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                self._record(response)
+                delay = self._retry_delay(attempt, response) if response.is_error else None
+                if delay is None:
+                    return self._parse_response(response, tokens)
+            metrics.count("groq.request", "retries")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        """
+        Close the sync HTTP client and the generation cache.
+
+        The async client's connections belong to the event loop that used
+        them and can't be closed from sync code; if it is still open, a
+        ``ResourceWarning`` points to ``aclose``.
+        """
+        if self._async_client is not None and not self._async_client.is_closed:
+            warnings.warn(
+                "GroqClient.close() leaves the async HTTP client open; await aclose() instead",
+                ResourceWarning,
+                stacklevel=2,
+            )
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+        if self.cache is not None:
+            self.cache.close()
+
+    async def aclose(self) -> None:
+        """Close both HTTP clients and the generation cache."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        self.close()
+
+    def __enter__(self) -> "GroqClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "GroqClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
@@ -0,0 +1,174 @@
+"""
+Packs concurrent single-lead generations into one Groq request.
+"""
+
+import json
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from src.services.ai_client import GroqClient
+
+
+BATCH_SYSTEM_PROMPT = """You write SMS messages for several customers at once.
+Each request has an id, its own instructions and its own task.
+Follow each request's instructions independently.
+Respond with a JSON object of the form {"messages": {"<id>": "<sms text>", ...}}
+with exactly one entry per request id. Output only the JSON object."""
+
+FALLBACK_SINGLE = "single"
+FALLBACK_ERROR = "error"
+
+
+@dataclass(eq=False)
+class _Request:
+    id: str
+    system_prompt: str
+    user_prompt: str
+    future: Future = field(default_factory=Future)
+
+
+class BatchGenerator:
+    """
+    Drop-in ``generate`` that batches concurrent callers.
+
+    Calls from different threads (e.g. graph workers) are collected until
+    ``batch_size`` are waiting or ``max_wait`` seconds pass, then sent as a
+    single JSON-mode request keyed by request id. Items missing from or
+    invalid in the response are retried one by one (``fallback="single"``)
+    or fail (``fallback="error"``). Cached generations bypass the batch.
+    """
+
+    def __init__(
+        self,
+        groq_client: GroqClient,
+        batch_size: int = 8,
+        max_wait: float = 0.2,
+        fallback: str = FALLBACK_SINGLE,
+    ):
+        """
+        Initialize the batch generator.
+
+        Args:
+            groq_client: Client used for batched and fallback requests
+            batch_size: Max leads packed into one request
+            max_wait: Seconds the first caller waits for the batch to fill
+            fallback: "single" to retry failed items individually, "error" to fail them
+        """
+        if fallback not in (FALLBACK_SINGLE, FALLBACK_ERROR):
+            raise ValueError(f"Unknown batch fallback policy: {fallback}")
+
+        self.groq_client = groq_client
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.fallback = fallback
+        self.cache = groq_client.cache
+        self.batches = 0
+        self.fallbacks = 0
+        self._pending: List[_Request] = []
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def generate(self, system_prompt: str, user_prompt: str) -> str:
+        """Generate one message, sharing a request with concurrent callers."""
+        key = self.groq_client.cache_key(system_prompt, user_prompt)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        with self._lock:
+            self._next_id += 1
+            request = _Request(str(self._next_id), system_prompt, user_prompt)
+            self._pending.append(request)
+            batch = self._take() if len(self._pending) >= self.batch_size else None
+
+        if batch is not None:
+            self._run(batch)
+        else:
+            try:
+                request.future.result(timeout=self.max_wait)
+            except FutureTimeout:
+                # Batch didn't fill in time: send whatever is waiting
+                with self._lock:
+                    batch = self._take() if request in self._pending else None
+                if batch is not None:
+                    self._run(batch)
+
+        text = request.future.result()
+        if key is not None:
+            self.cache.set(key, text)
+        return text
+
+    async def agenerate(self, system_prompt: str, user_prompt: str) -> str:
+        """Async callers are not batched; delegates to the client."""
+        return await self.groq_client.agenerate(system_prompt, user_prompt)
+
+    def _take(self) -> List[_Request]:
+        """Remove up to ``batch_size`` pending requests (lock must be held)."""
+        batch = self._pending[:self.batch_size]
+        del self._pending[:self.batch_size]
+        return batch
+
+    def _run(self, batch: List[_Request]) -> None:
+        """Send a batch and resolve every request's future."""
+        if len(batch) == 1:
+            self._run_single(batch[0])
+            return
+
+        with self._lock:
+            self.batches += 1
+        try:
+            messages = self._request_batch(batch)
+        except Exception:
+            messages = {}
+
+        for request in batch:
+            text = messages.get(request.id)
+            if text:
+                request.future.set_result(text)
+            else:
+                self._fail(request)
+
+    def _request_batch(self, batch: List[_Request]) -> Dict[str, str]:
+        """Send one JSON-mode request for the batch and validate the reply."""
+        items = [
+            {"id": r.id, "instructions": r.system_prompt, "task": r.user_prompt}
+            for r in batch
+        ]
+        data = self.groq_client.generate_json(
+            BATCH_SYSTEM_PROMPT,
+            json.dumps({"requests": items}, ensure_ascii=False),
+            max_tokens=self.groq_client.max_tokens * len(batch),
+        )
+        messages = data.get("messages", data)
+        if not isinstance(messages, dict):
+            return {}
+        return {
+            str(k): v.strip()
+            for k, v in messages.items()
+            if isinstance(v, str) and v.strip()
+        }
+
+    def _fail(self, request: _Request) -> None:
+        """Apply the fallback policy to a request the batch didn't answer."""
+        if self.fallback == FALLBACK_ERROR:
+            request.future.set_exception(ValueError("Batched generation returned no message"))
+            return
+        with self._lock:
+            self.fallbacks += 1
+        self._run_single(request)
+
+    def _run_single(self, request: _Request) -> None:
+        try:
+            request.future.set_result(
+                self.groq_client.generate(request.system_prompt, request.user_prompt, use_cache=False)
+            )
+        except Exception as e:
+            request.future.set_exception(e)
+
+    def stats(self) -> dict:
+        """Counters for reporting."""
+        with self._lock:
+            return {"batches": self.batches, "fallbacks": self.fallbacks}
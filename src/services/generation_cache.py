@@ -0,0 +1,118 @@
+"""
+LRU/TTL cache for LLM generations, in memory with optional SQLite backing.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class GenerationCache:
+    """
+    Caches generated text keyed on the exact request.
+
+    Keys cover (model, temperature, system prompt, user prompt), so any
+    change to the prompt or sampling settings is a miss. Entries expire
+    after ``ttl`` seconds; the in-memory layer evicts least recently used
+    entries beyond ``max_entries``. With ``path`` set, entries are also
+    persisted to SQLite and survive between runs; expired rows are
+    deleted when the file is opened.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 86400.0, path: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Max entries kept in memory
+            ttl: Seconds an entry stays valid
+            path: Optional SQLite file for a persistent layer
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            with self._db:
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS generations "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+                self._db.execute("DELETE FROM generations WHERE expires_at <= ?", (time.time(),))
+
+    @staticmethod
+    def key(model: str, temperature: float, system_prompt: str, user_prompt: str) -> str:
+        """Build the cache key for a request."""
+        raw = json.dumps([model, temperature, system_prompt, user_prompt], ensure_ascii=False)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached generation.
+
+        Returns:
+            The cached text, or None on a miss or expired entry
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self._entries.pop(key, None)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM generations WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+                if row is not None:
+                    self._remember(key, row[0], row[1])
+                    self.hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """Store a generation."""
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, value, expires_at)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO generations VALUES (?, ?, ?)",
+                        (key, value, expires_at),
+                    )
+
+    def _remember(self, key: str, value: str, expires_at: float) -> None:
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for reporting."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+    def close(self) -> None:
+        """Close the persistent layer, if any."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
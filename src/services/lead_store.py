@@ -0,0 +1,212 @@
+"""
+Local SQLite mirror of the lead sheet.
+"""
+
+import sqlite3
+import threading
+from dataclasses import replace
+from typing import Iterable, List, Optional
+
+from src.models import ChatHistory, Lead
+from src.utils import normalize_phone, normalize_phones
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    row_number     INTEGER PRIMARY KEY,
+    name           TEXT NOT NULL,
+    phone          TEXT NOT NULL,
+    phone_key      TEXT NOT NULL,
+    product        TEXT NOT NULL,
+    last_visit     TEXT,
+    sms_sent       TEXT,
+    chat_history   TEXT,
+    contacted      INTEGER NOT NULL,
+    has_history    INTEGER NOT NULL,
+    last_activity  TEXT,
+    dirty          INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_leads_phone_key ON leads (phone_key);
+CREATE INDEX IF NOT EXISTS idx_leads_contacted ON leads (contacted);
+CREATE INDEX IF NOT EXISTS idx_leads_has_history ON leads (has_history);
+CREATE INDEX IF NOT EXISTS idx_leads_last_activity ON leads (last_activity);
+CREATE INDEX IF NOT EXISTS idx_leads_dirty ON leads (dirty) WHERE dirty = 1;
+"""
+
+COLUMNS = "row_number, name, phone, product, last_visit, sms_sent, chat_history"
+
+
+def last_activity(lead: Lead) -> Optional[str]:
+    """Latest chat history timestamp, falling back to the last visit."""
+    stamps = [turn.timestamp for turn in lead.chat_history if turn.timestamp]
+    if stamps:
+        return max(stamps)
+    return lead.last_visit
+
+
+class LeadStore:
+    """
+    Indexed local copy of the leads, kept in sync with Google Sheets.
+
+    Selection queries run against SQLite instead of scanning the sheet.
+    Local updates are flagged dirty until they have been written back,
+    and dirty rows are never overwritten by a pull from the sheet. Phones
+    are indexed by their E.164 form ("" when invalid).
+    """
+
+    def __init__(self, path: str, default_country_code: str = ""):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite database file (":memory:" for a temporary store)
+            default_country_code: See ``normalize_phones``
+        """
+        self.path = path
+        self.default_country_code = default_country_code
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "LeadStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def _params(lead: Lead, phone_key: Optional[str], dirty: int = 0) -> tuple:
+        return (
+            lead.row_number,
+            lead.name,
+            lead.phone,
+            phone_key or "",
+            lead.product,
+            lead.last_visit,
+            lead.sms_sent,
+            lead.chat_history.to_text() or None,
+            int(lead.has_been_contacted),
+            int(lead.has_chat_history),
+            last_activity(lead),
+            dirty,
+        )
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Lead]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {COLUMNS} FROM leads {sql}", params).fetchall()
+        return [Lead(*row) for row in rows]
+
+    def pull(self, leads: Iterable[Lead], full: bool = True) -> int:
+        """
+        Mirror leads read from the sheet into the store.
+
+        Args:
+            leads: Leads from a sheet snapshot
+            full: The leads are the whole sheet, so rows missing from it are removed
+
+        Returns:
+            Number of leads written
+        """
+        leads = list(leads)
+        keys, _ = normalize_phones((lead.phone for lead in leads), self.default_country_code)
+        params = [self._params(lead, key) for lead, key in zip(leads, keys)]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO leads VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (row_number) DO UPDATE SET
+                    name = excluded.name,
+                    phone = excluded.phone,
+                    phone_key = excluded.phone_key,
+                    product = excluded.product,
+                    last_visit = excluded.last_visit,
+                    sms_sent = excluded.sms_sent,
+                    chat_history = excluded.chat_history,
+                    contacted = excluded.contacted,
+                    has_history = excluded.has_history,
+                    last_activity = excluded.last_activity
+                WHERE leads.dirty = 0
+                """,
+                params,
+            )
+            if full:
+                self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen (row_number INTEGER PRIMARY KEY)")
+                self._conn.execute("DELETE FROM seen")
+                self._conn.executemany("INSERT INTO seen VALUES (?)", [(p[0],) for p in params])
+                self._conn.execute(
+                    "DELETE FROM leads WHERE dirty = 0 AND row_number NOT IN (SELECT row_number FROM seen)"
+                )
+        return len(params)
+
+    def push(self, sheet_handler) -> int:
+        """
+        Queue all dirty rows for write-back and flush them.
+
+        Rows that were written successfully are marked clean.
+
+        Returns:
+            Number of rows written
+        """
+        already_reported = len(sheet_handler.write_results)
+        for lead in self._query("WHERE dirty = 1 ORDER BY row_number"):
+            sheet_handler.queue_update(lead.row_number, lead.sms_sent, lead.chat_history.to_text())
+        sheet_handler.flush_updates()
+        results = sheet_handler.write_results[already_reported:]
+        written = [r.row_number for r in results if r.success]
+        self.mark_clean(written)
+        return len(written)
+
+    def record_update(self, row_number: int, sms_sent: str, chat_history: str) -> None:
+        """Apply a local SMS Sent / Chat History update and flag it dirty."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {COLUMNS} FROM leads WHERE row_number = ?", (row_number,)
+            ).fetchone()
+        if row is None:
+            return
+        lead = replace(Lead(*row), sms_sent=sms_sent, chat_history=ChatHistory.parse(chat_history))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO leads VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._params(lead, normalize_phone(lead.phone, self.default_country_code), dirty=1),
+            )
+
+    def mark_clean(self, row_numbers: Iterable[int]) -> None:
+        """Clear the dirty flag once rows are persisted to the sheet."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE leads SET dirty = 0 WHERE row_number = ?",
+                [(row,) for row in row_numbers],
+            )
+
+    def get_lead_by_row(self, row_number: int) -> Optional[Lead]:
+        """Get a lead by its sheet row number."""
+        leads = self._query("WHERE row_number = ?", (row_number,))
+        return leads[0] if leads else None
+
+    def get_leads_by_phone(self, phone: str) -> List[Lead]:
+        """Get all leads sharing a phone number (any format; none if it's invalid)."""
+        key = normalize_phone(phone, self.default_country_code)
+        if key is None:
+            return []
+        return self._query("WHERE phone_key = ? ORDER BY row_number", (key,))
+
+    def get_leads_needing_contact(self) -> List[Lead]:
+        """Get leads with no SMS sent, in sheet order."""
+        return self._query("WHERE contacted = 0 ORDER BY row_number")
+
+    def get_leads_needing_followup(self) -> List[Lead]:
+        """Get leads with chat history, in sheet order."""
+        return self._query("WHERE has_history = 1 ORDER BY row_number")
+
+    def get_leads_active_since(self, since: str) -> List[Lead]:
+        """Get leads whose last activity is at or after ``since`` ("YYYY-MM-DD HH:MM")."""
+        return self._query("WHERE last_activity >= ? ORDER BY last_activity DESC", (since,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
@@ -0,0 +1,128 @@
+"""
+Local outbox of pre-generated SMS drafts, prepared ahead of the send run.
+"""
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from src.models import Lead
+from src.services.run_journal import lead_fingerprint
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS drafts (
+    sheet            TEXT NOT NULL,
+    row_number       INTEGER NOT NULL,
+    fingerprint      TEXT NOT NULL,
+    message_type     TEXT NOT NULL,
+    generated_sms    TEXT NOT NULL,
+    updated_history  TEXT NOT NULL,
+    prepared_at      REAL NOT NULL,
+    PRIMARY KEY (sheet, row_number)
+);
+"""
+
+
+@dataclass
+class Draft:
+    """A prepared message for one lead."""
+
+    row_number: int
+    message_type: str
+    generated_sms: str
+    updated_history: str
+    prepared_at: float
+
+    def result(self, lead: Lead) -> dict:
+        """Agent result rebuilt from the draft (no generation needed)."""
+        return {
+            "lead": lead,
+            "message_type": self.message_type,
+            "generated_sms": self.generated_sms,
+            "updated_history": self.updated_history,
+            "error": None,
+        }
+
+
+class Outbox:
+    """
+    Drafts generated by a "prepare" run, waiting for a "send" run.
+
+    Each draft is keyed by sheet row and stores a fingerprint of the
+    lead's row when it was generated, so a draft is only used while the
+    row is unchanged; edited rows (e.g. a new customer reply) need a fresh
+    draft. Drafts are removed once the message has been written back.
+    """
+
+    def __init__(self, path: str, sheet_key: str):
+        """
+        Open (or create) the outbox.
+
+        Args:
+            path: SQLite database file
+            sheet_key: Identifies the sheet/worksheet the rows belong to
+        """
+        self.path = path
+        self.sheet_key = sheet_key
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "Outbox":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM drafts WHERE sheet = ?", (self.sheet_key,)
+            ).fetchone()
+        return count
+
+    def get(self, lead: Lead) -> Optional[Draft]:
+        """
+        Get the draft for a lead.
+
+        Returns:
+            The draft, or None if there is none or the row changed since it
+            was prepared
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, message_type, generated_sms, updated_history, prepared_at "
+                "FROM drafts WHERE sheet = ? AND row_number = ?",
+                (self.sheet_key, lead.row_number),
+            ).fetchone()
+        if row is None or row[0] != lead_fingerprint(lead):
+            return None
+        return Draft(lead.row_number, *row[1:])
+
+    def put(self, lead: Lead, result: dict) -> None:
+        """Store (or replace) the draft for a lead."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO drafts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.sheet_key, lead.row_number, lead_fingerprint(lead),
+                    result["message_type"], result["generated_sms"], result["updated_history"],
+                    time.time(),
+                ),
+            )
+
+    def remove(self, row_numbers: Iterable[int]) -> None:
+        """Drop drafts that have been sent and written back."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM drafts WHERE sheet = ? AND row_number = ?",
+                [(self.sheet_key, row) for row in row_numbers],
+            )
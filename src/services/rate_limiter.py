@@ -0,0 +1,151 @@
+"""
+Rate limiting and retry helpers for quota-bound APIs.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at a per-minute rate.
+
+    Callers reserve capacity up front and are told how long to wait, so
+    the bucket works for both threads (``time.sleep``) and coroutines
+    (``asyncio.sleep``). A rate of 0 disables the bucket.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self._available = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._available = min(self.capacity, self._available + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """
+        Take ``amount`` from the bucket, going into debt if needed.
+
+        Args:
+            amount: Units to consume (clamped to the bucket capacity)
+
+        Returns:
+            Seconds the caller must wait before using the reservation
+        """
+        if not self.enabled:
+            return 0.0
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            self._available -= amount
+            if self._available >= 0:
+                return 0.0
+            return -self._available / self.rate
+
+    def refund(self, amount: float) -> None:
+        """Return unused units (e.g. when a token estimate was too high)."""
+        if not self.enabled or amount <= 0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._available = min(self.capacity, self._available + amount)
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limiter.
+
+    One instance is shared by every worker using a client so the combined
+    throughput stays at the quota. ``pause`` holds back all callers, e.g.
+    while a ``retry-after`` from the server is in effect.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float) -> float:
+        """Reserve one request and ``tokens`` tokens; return seconds to wait."""
+        wait = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+        with self._lock:
+            pause = self._paused_until - time.monotonic()
+        return max(wait, pause, 0.0)
+
+    def acquire(self, tokens: float) -> None:
+        """Block the current thread until the request may be sent."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: float) -> None:
+        """Wait (without blocking the event loop) until the request may be sent."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def settle(self, estimated: float, actual: float) -> None:
+        """Refund the difference between estimated and actual token usage."""
+        self.tokens.refund(estimated - actual)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all callers for ``seconds`` from now."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    max_retries: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Seconds to wait before retry number ``attempt`` (0-based).
+
+        A server-provided ``retry_after`` takes precedence; a little jitter
+        is added so concurrent workers don't retry in lockstep.
+        """
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header value.
+
+    Args:
+        value: Delay in seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if missing/unparseable
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
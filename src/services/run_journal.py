@@ -0,0 +1,183 @@
+"""
+Write-ahead journal of per-lead progress, for resuming interrupted runs.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from src.models import Lead
+
+
+GENERATED = "generated"
+SENT = "sent"
+UNCONFIRMED = "unconfirmed"     # The send failed but Twilio may have accepted it
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    sheet            TEXT NOT NULL,
+    row_number       INTEGER NOT NULL,
+    fingerprint      TEXT NOT NULL,
+    stage            TEXT NOT NULL,
+    message_type     TEXT NOT NULL,
+    generated_sms    TEXT NOT NULL,
+    updated_history  TEXT NOT NULL,
+    message_sid      TEXT,
+    updated_at       REAL NOT NULL,
+    PRIMARY KEY (sheet, row_number)
+);
+"""
+
+
+def lead_fingerprint(lead: Lead) -> str:
+    """Hash of the lead's sheet cells, used to detect rows that changed since."""
+    cells = [
+        lead.name, lead.phone, lead.product, lead.last_visit or "",
+        lead.sms_sent or "", lead.chat_history.to_text(),
+    ]
+    return hashlib.blake2b("\x1f".join(cells).encode(), digest_size=8).hexdigest()
+
+
+@dataclass
+class JournalEntry:
+    """Unfinished work recorded for one lead."""
+
+    row_number: int
+    stage: str
+    message_type: str
+    generated_sms: str
+    updated_history: str
+    message_sid: Optional[str] = None
+
+    @property
+    def sent(self) -> bool:
+        return self.stage == SENT
+
+    @property
+    def unconfirmed(self) -> bool:
+        return self.stage == UNCONFIRMED
+
+    def result(self, lead: Lead) -> dict:
+        """Agent result rebuilt from the journal (no generation needed)."""
+        return {
+            "lead": lead,
+            "message_type": self.message_type,
+            "generated_sms": self.generated_sms,
+            "updated_history": self.updated_history,
+            "error": None,
+        }
+
+
+class RunJournal:
+    """
+    Durable record of which leads were generated and sent but not yet
+    persisted to the sheet.
+
+    Every stage change is committed to SQLite (WAL mode) before the run
+    moves on, so a crash or Ctrl-C loses at most the step in flight. On the
+    next run a lead whose row is unchanged resumes where it stopped: a
+    generated message is sent without calling the LLM again, and a sent
+    message only has its sheet write retried, so customers are never
+    texted twice. A send that failed after Twilio may have accepted it is
+    marked unconfirmed and never resent automatically; the entry stays
+    until the row changes (e.g. the sheet is updated by hand). Entries are
+    removed once the sheet write succeeds.
+    """
+
+    def __init__(self, path: str, sheet_key: str):
+        """
+        Open (or create) the journal.
+
+        Args:
+            path: SQLite database file
+            sheet_key: Identifies the sheet/worksheet the rows belong to
+        """
+        self.path = path
+        self.sheet_key = sheet_key
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "RunJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def pending(self) -> int:
+        """Number of leads with unfinished work."""
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM journal WHERE sheet = ?", (self.sheet_key,)
+            ).fetchone()
+        return count
+
+    def get(self, lead: Lead) -> Optional[JournalEntry]:
+        """
+        Look up unfinished work for a lead.
+
+        Returns:
+            The entry, or None if there is none or the row changed since
+            (stale entries are dropped)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, stage, message_type, generated_sms, updated_history, message_sid "
+                "FROM journal WHERE sheet = ? AND row_number = ?",
+                (self.sheet_key, lead.row_number),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[0] != lead_fingerprint(lead):
+                with self._conn:
+                    self._conn.execute(
+                        "DELETE FROM journal WHERE sheet = ? AND row_number = ?",
+                        (self.sheet_key, lead.row_number),
+                    )
+                return None
+        return JournalEntry(lead.row_number, *row[1:])
+
+    def generated(self, lead: Lead, result: dict) -> None:
+        """Record a generated (not yet sent) message."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO journal VALUES (?, ?, ?, ?, ?, ?, ?, NULL, ?)",
+                (
+                    self.sheet_key, lead.row_number, lead_fingerprint(lead), GENERATED,
+                    result["message_type"], result["generated_sms"], result["updated_history"],
+                    time.time(),
+                ),
+            )
+
+    def sent(self, row_number: int, message_sid: Optional[str] = None) -> None:
+        """Record that the message for a row was delivered to Twilio."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE journal SET stage = ?, message_sid = ?, updated_at = ? "
+                "WHERE sheet = ? AND row_number = ?",
+                (SENT, message_sid, time.time(), self.sheet_key, row_number),
+            )
+
+    def unconfirmed(self, row_number: int) -> None:
+        """Record that a row's send failed but may have been delivered."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE journal SET stage = ?, updated_at = ? WHERE sheet = ? AND row_number = ?",
+                (UNCONFIRMED, time.time(), self.sheet_key, row_number),
+            )
+
+    def persisted(self, row_numbers: Iterable[int]) -> None:
+        """Drop entries whose sheet write succeeded."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM journal WHERE sheet = ? AND row_number = ? AND stage = ?",
+                [(self.sheet_key, row, SENT) for row in row_numbers],
+            )
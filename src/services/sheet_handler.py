@@ -2,12 +2,17 @@
 Google Sheets integration for reading and writing lead data.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
+
 import gspread
 from google.oauth2.service_account import Credentials
-from typing import List, Optional
 
-from src.config import Settings, SheetColumn
-from src.models import Lead
+from src.config import Settings, SheetColumn, SheetTarget
+from src.config.constants import SHEET_HEADERS
+from src.models import Lead, LeadSnapshot
+from src.services.sheet_writer import SheetWriteBuffer, RowWriteResult
+from src.utils import metrics, normalize_phone
 
 
 SCOPES = [
@@ -17,29 +22,47 @@ SCOPES = [
 
 
 class SheetHandler:
-    """Handles all Google Sheets operations."""
+    """Handles all Google Sheets operations for one worksheet."""
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, target: Optional[SheetTarget] = None):
         """
         Initialize the sheet handler.
 
         Args:
             settings: Application settings containing credentials path and sheet ID
+            target: Worksheet to use (defaults to the first configured target)
         """
         self.settings = settings
+        self.target = target or settings.sheet_targets[0]
         self._client: Optional[gspread.Client] = None
         self._sheet: Optional[gspread.Spreadsheet] = None
         self._worksheet: Optional[gspread.Worksheet] = None
+        self._snapshot: Optional[LeadSnapshot] = None
+        self._write_buffer: Optional[SheetWriteBuffer] = None
+        self.write_results: List[RowWriteResult] = []
+
+    def connect(self, client: Optional[gspread.Client] = None) -> None:
+        """
+        Establish connection to Google Sheets.
 
-    def connect(self) -> None:
-        """Establish connection to Google Sheets."""
-        credentials = Credentials.from_service_account_file(
-            self.settings.google_credentials_path,
-            scopes=SCOPES
-        )
-        self._client = gspread.authorize(credentials)
-        self._sheet = self._client.open_by_key(self.settings.google_sheet_id)
-        self._worksheet = self._sheet.worksheet(self.settings.worksheet_name)
+        Args:
+            client: Authorized client to share (and its HTTP session) with
+                other handlers; a new one is authorized if omitted
+        """
+        if client is None:
+            credentials = Credentials.from_service_account_file(
+                self.settings.google_credentials_path,
+                scopes=SCOPES
+            )
+            client = gspread.authorize(credentials)
+        self._client = client
+        self._sheet = self._client.open_by_key(self.target.sheet_id)
+        self._worksheet = self._sheet.worksheet(self.target.worksheet_name)
+
+    @property
+    def client(self) -> Optional[gspread.Client]:
+        """The authorized gspread client (None until connected)."""
+        return self._client
 
     @property
     def worksheet(self) -> gspread.Worksheet:
@@ -48,6 +71,41 @@ class SheetHandler:
             self.connect()
         return self._worksheet
 
+    def get_last_modified(self) -> Optional[str]:
+        """
+        Get the spreadsheet's Drive ``modifiedTime``.
+
+        Returns:
+            RFC 3339 timestamp, or None if it can't be read
+        """
+        try:
+            return self.worksheet.spreadsheet.get_lastUpdateTime()
+        except gspread.exceptions.APIError:
+            return None
+
+    def load_snapshot(self) -> LeadSnapshot:
+        """
+        Download the worksheet once and index its leads.
+
+        Subsequent queries read from this snapshot; call again to refresh.
+
+        Returns:
+            The newly loaded snapshot
+        """
+        with metrics.timer("sheets.read"):
+            rows = self.worksheet.get_all_values()
+        metrics.count("sheets.read", "rows", len(rows))
+        with metrics.timer("sheets.parse"):
+            self._snapshot = LeadSnapshot.from_rows(rows, self.settings.default_country_code)
+        return self._snapshot
+
+    @property
+    def snapshot(self) -> LeadSnapshot:
+        """Get the current lead snapshot, loading it if needed."""
+        if self._snapshot is None:
+            self.load_snapshot()
+        return self._snapshot
+
     def get_all_leads(self) -> List[Lead]:
         """
         Fetch all leads from the sheet.
@@ -55,15 +113,54 @@ class SheetHandler:
         Returns:
             List of Lead objects (excludes header row)
         """
-        rows = self.worksheet.get_all_values()
-        leads = []
+        return list(self.snapshot.leads)
+
+    def _fetch_page(self, start_row: int, page_size: int) -> List[list]:
+        """Fetch one page of lead columns starting at ``start_row``."""
+        end_row = start_row + page_size - 1
+        last_col = self._col_letter(len(SHEET_HEADERS))
+        with metrics.timer("sheets.read"):
+            rows = self.worksheet.get(f"A{start_row}:{last_col}{end_row}")
+        metrics.count("sheets.read", "rows", len(rows))
+        return rows
+
+    def _page_starts(self, page_size: int) -> range:
+        """First row of every page (data starts at row 2)."""
+        return range(2, self.worksheet.row_count + 1, page_size)
+
+    @staticmethod
+    def _page_leads(start_row: int, rows: List[list]) -> Iterator[Lead]:
+        for offset, row in enumerate(rows):
+            if row and row[0]:  # Only include rows with a name
+                yield Lead.from_row(start_row + offset, row)
+
+    def iter_leads(self, page_size: Optional[int] = None) -> Iterator[Lead]:
+        """
+        Stream leads page by page instead of downloading the whole sheet.
 
-        # Skip header row (index 0), start from row 2 in sheet terms
-        for i, row in enumerate(rows[1:], start=2):
-            if row[0]:  # Only include rows with a name
-                leads.append(Lead.from_row(i, row))
+        The next page is fetched in the background while the current one
+        is being consumed, so processing starts after the first page.
 
-        return leads
+        Args:
+            page_size: Rows per request (defaults to settings)
+
+        Yields:
+            Lead objects in sheet order
+        """
+        page_size = page_size or self.settings.sheet_page_size
+        starts = iter(self._page_starts(page_size))
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheet-page") as prefetch:
+            start = next(starts, None)
+            page = prefetch.submit(self._fetch_page, start, page_size) if start is not None else None
+            while page is not None:
+                rows = page.result()
+                next_start = next(starts, None)
+                page = (
+                    prefetch.submit(self._fetch_page, next_start, page_size)
+                    if next_start is not None else None
+                )
+                yield from self._page_leads(start, rows)
+                start = next_start
 
     def get_lead_by_row(self, row_number: int) -> Optional[Lead]:
         """
@@ -75,10 +172,20 @@ class SheetHandler:
         Returns:
             Lead object or None if row is empty
         """
-        row_data = self.worksheet.row_values(row_number)
-        if row_data and row_data[0]:
-            return Lead.from_row(row_number, row_data)
-        return None
+        return self.snapshot.by_row.get(row_number)
+
+    def get_leads_by_phone(self, phone: str) -> List[Lead]:
+        """
+        Fetch all leads sharing a phone number.
+
+        Args:
+            phone: Phone number in any format
+
+        Returns:
+            Leads whose phone has the same E.164 form (empty if none or invalid)
+        """
+        key = normalize_phone(phone, self.settings.default_country_code)
+        return list(self.snapshot.by_phone.get(key, ())) if key else []
 
     def get_leads_needing_contact(self) -> List[Lead]:
         """
@@ -87,7 +194,7 @@ class SheetHandler:
         Returns:
             List of leads with no SMS sent
         """
-        return [lead for lead in self.get_all_leads() if not lead.has_been_contacted]
+        return list(self.snapshot.not_contacted)
 
     def get_leads_needing_followup(self) -> List[Lead]:
         """
@@ -96,7 +203,7 @@ class SheetHandler:
         Returns:
             List of leads who have replied and need follow-up
         """
-        return [lead for lead in self.get_all_leads() if lead.needs_followup]
+        return list(self.snapshot.needs_followup)
 
     def update_sms_sent(self, row_number: int, message: str) -> None:
         """
@@ -107,7 +214,8 @@ class SheetHandler:
             message: The SMS message that was sent
         """
         col = SheetColumn.SMS_SENT.value + 1  # gspread uses 1-indexed columns
-        self.worksheet.update_cell(row_number, col, message)
+        with metrics.timer("sheets.write"):
+            self.worksheet.update_cell(row_number, col, message)
 
     def update_chat_history(self, row_number: int, history: str) -> None:
         """
@@ -118,7 +226,8 @@ class SheetHandler:
             history: The updated chat history string
         """
         col = SheetColumn.CHAT_HISTORY.value + 1
-        self.worksheet.update_cell(row_number, col, history)
+        with metrics.timer("sheets.write"):
+            self.worksheet.update_cell(row_number, col, history)
 
     def batch_update(self, row_number: int, sms_sent: str, chat_history: str) -> None:
         """
@@ -132,8 +241,47 @@ class SheetHandler:
         sms_col = SheetColumn.SMS_SENT.value + 1
         history_col = SheetColumn.CHAT_HISTORY.value + 1
 
-        self.worksheet.update(f"{self._col_letter(sms_col)}{row_number}", [[sms_sent]])
-        self.worksheet.update(f"{self._col_letter(history_col)}{row_number}", [[chat_history]])
+        with metrics.timer("sheets.write"):
+            self.worksheet.batch_update([
+                {"range": f"{self._col_letter(sms_col)}{row_number}", "values": [[sms_sent]]},
+                {"range": f"{self._col_letter(history_col)}{row_number}", "values": [[chat_history]]},
+            ])
+
+    @property
+    def write_buffer(self) -> SheetWriteBuffer:
+        """Get the write buffer for coalesced updates, creating it if needed."""
+        if self._write_buffer is None:
+            self._write_buffer = SheetWriteBuffer(
+                self.worksheet,
+                max_rows=self.settings.sheet_write_batch_size,
+                max_age=self.settings.sheet_write_max_age,
+                on_flush=self.write_results.extend,
+            )
+        return self._write_buffer
+
+    def queue_update(self, row_number: int, sms_sent: str, chat_history: str) -> None:
+        """
+        Queue an SMS Sent / Chat History update for the next batched write.
+
+        Results of every flush are collected in ``write_results``.
+
+        Args:
+            row_number: The row to update
+            sms_sent: The SMS message sent
+            chat_history: The updated chat history
+        """
+        self.write_buffer.add(row_number, sms_sent, chat_history)
+
+    def flush_updates(self) -> List[RowWriteResult]:
+        """
+        Write all queued updates now.
+
+        Returns:
+            Results of this flush, one per row
+        """
+        if self._write_buffer is None:
+            return []
+        return self._write_buffer.flush()
 
     @staticmethod
     def _col_letter(col_num: int) -> str:
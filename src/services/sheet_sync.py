@@ -0,0 +1,132 @@
+"""
+Incremental sheet sync that only surfaces rows changed since the last run.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+from src.config import SheetColumn
+from src.config.constants import SHEET_HEADERS
+from src.models import Lead, LeadSnapshot
+from src.utils import metrics
+
+
+def row_hash(row: list) -> str:
+    """Content hash of the lead columns of a sheet row."""
+    cells = [str(value) for value in row[:len(SHEET_HEADERS)]]
+    cells += [""] * (len(SHEET_HEADERS) - len(cells))
+    return hashlib.blake2b("\x1f".join(cells).encode(), digest_size=8).hexdigest()
+
+
+class IncrementalSync:
+    """
+    Tracks per-row content hashes between runs.
+
+    The spreadsheet's Drive ``modifiedTime`` is checked first: if it hasn't
+    moved since the last sync, nothing is downloaded at all. Otherwise the
+    values are fetched once and only rows whose hash changed are parsed
+    into leads. State is persisted as JSON, keyed by sheet and worksheet.
+    """
+
+    def __init__(self, sheet_handler, state_path: str):
+        """
+        Initialize the sync tracker.
+
+        Args:
+            sheet_handler: Connected SheetHandler for the worksheet
+            state_path: JSON file holding sync state between runs
+        """
+        self.sheet_handler = sheet_handler
+        self.state_path = state_path
+        self.key = sheet_handler.target.key
+        self._state = self._load()
+        self._rows: Dict[int, list] = {}
+        self._modified_time: Optional[str] = None
+
+    def _load(self) -> dict:
+        """Read all persisted sync state (empty if none yet)."""
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @property
+    def _entry(self) -> dict:
+        return self._state.setdefault(self.key, {"modified_time": None, "rows": {}})
+
+    def changed_leads(self) -> List[Lead]:
+        """
+        Get leads whose rows changed since the last saved sync.
+
+        Returns:
+            Leads for new or modified rows (empty if the sheet is unchanged)
+        """
+        self._modified_time = self.sheet_handler.get_last_modified()
+        if self._modified_time and self._modified_time == self._entry["modified_time"]:
+            return []
+
+        with metrics.timer("sheets.read"):
+            rows = self.sheet_handler.worksheet.get_all_values()
+        metrics.count("sheets.read", "rows", len(rows))
+        known = self._entry["rows"]
+        current = {}
+        dirty = []
+
+        for i, row in enumerate(rows[1:], start=2):
+            if not row or not row[0]:  # Only rows with a name
+                continue
+            digest = row_hash(row)
+            current[str(i)] = digest
+            if known.get(str(i)) != digest:
+                self._rows[i] = row
+                dirty.append(Lead.from_row(i, row))
+
+        # Deleted rows drop out of the state
+        self._entry["rows"] = current
+        return dirty
+
+    def changed_snapshot(self) -> LeadSnapshot:
+        """Changed leads as an indexed snapshot."""
+        return LeadSnapshot.from_leads(
+            self.changed_leads(), self.sheet_handler.settings.default_country_code
+        )
+
+    def acknowledge(self, row_number: int, sms_sent: str, chat_history: str) -> None:
+        """
+        Record our own successful write-back so the row isn't seen as changed.
+
+        Args:
+            row_number: Row that was written
+            sms_sent: Value written to SMS Sent
+            chat_history: Value written to Chat History
+        """
+        row = list(self._rows.get(row_number, []))
+        row += [""] * (len(SHEET_HEADERS) - len(row))
+        row[SheetColumn.SMS_SENT.value] = sms_sent
+        row[SheetColumn.CHAT_HISTORY.value] = chat_history
+        self._entry["rows"][str(row_number)] = row_hash(row)
+
+    def forget(self, row_number: int) -> None:
+        """Drop a row's hash so it is reported as changed again next run."""
+        self._entry["rows"].pop(str(row_number), None)
+        # Don't let an unchanged modifiedTime skip the row next time
+        self._modified_time = None
+
+    def save(self) -> None:
+        """
+        Persist the sync state.
+
+        The ``modifiedTime`` stored is the one seen before our own writes, so
+        the next run re-checks hashes once and catches edits made mid-run.
+        Only this worksheet's entry is replaced, so trackers for other
+        worksheets sharing the file don't overwrite each other.
+        """
+        self._entry["modified_time"] = self._modified_time
+        state = self._load()
+        state[self.key] = self._entry
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
@@ -0,0 +1,127 @@
+"""
+Buffered write-back of lead updates to Google Sheets.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import gspread
+from gspread.utils import absolute_range_name, rowcol_to_a1
+
+from src.config import SheetColumn
+from src.utils.metrics import metrics
+
+
+@dataclass
+class RowWriteResult:
+    """Outcome of writing one row back to the sheet."""
+
+    row_number: int
+    success: bool
+    error: Optional[str] = None
+
+
+class SheetWriteBuffer:
+    """
+    Collects row updates and writes them with a single ``values_batch_update``.
+
+    The buffer flushes when it holds ``max_rows`` rows, when the oldest
+    pending update is older than ``max_age`` seconds (checked on ``add``),
+    and on ``close``. Later updates to the same row replace earlier ones.
+    """
+
+    def __init__(
+        self,
+        worksheet: gspread.Worksheet,
+        max_rows: int = 100,
+        max_age: float = 10.0,
+        on_flush: Optional[Callable[[List[RowWriteResult]], None]] = None,
+    ):
+        """
+        Initialize the write buffer.
+
+        Args:
+            worksheet: Worksheet the rows belong to
+            max_rows: Flush once this many rows are pending
+            max_age: Flush once the oldest pending row is this old (seconds)
+            on_flush: Optional callback receiving the results of every flush
+        """
+        self.worksheet = worksheet
+        self.max_rows = max_rows
+        self.max_age = max_age
+        self.on_flush = on_flush
+        self._pending: Dict[int, Tuple[str, str]] = {}
+        self._oldest: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, row_number: int, sms_sent: str, chat_history: str) -> List[RowWriteResult]:
+        """
+        Queue an update of the SMS Sent and Chat History cells of a row.
+
+        Returns:
+            Results of the flush this update triggered (empty if none)
+        """
+        with self._lock:
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            self._pending[row_number] = (sms_sent, chat_history)
+            should_flush = (
+                len(self._pending) >= self.max_rows
+                or time.monotonic() - self._oldest >= self.max_age
+            )
+        return self.flush() if should_flush else []
+
+    def flush(self) -> List[RowWriteResult]:
+        """
+        Write all pending rows in one API call.
+
+        Returns:
+            One result per row; rows fail together since the call is atomic
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._oldest = None
+        if not pending:
+            return []
+
+        data = []
+        for row_number, (sms_sent, chat_history) in sorted(pending.items()):
+            data.append(self._entry(row_number, SheetColumn.SMS_SENT, sms_sent))
+            data.append(self._entry(row_number, SheetColumn.CHAT_HISTORY, chat_history))
+
+        try:
+            with metrics.timer("sheets.write"):
+                self.worksheet.spreadsheet.values_batch_update(
+                    {"valueInputOption": "RAW", "data": data}
+                )
+            metrics.count("sheets.write", "rows", len(pending))
+            results = [RowWriteResult(row, True) for row in sorted(pending)]
+        except Exception as e:
+            results = [RowWriteResult(row, False, str(e)) for row in sorted(pending)]
+
+        if self.on_flush:
+            self.on_flush(results)
+        return results
+
+    def close(self) -> List[RowWriteResult]:
+        """Flush any remaining updates."""
+        return self.flush()
+
+    def __enter__(self) -> "SheetWriteBuffer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _entry(self, row_number: int, column: SheetColumn, value: str) -> dict:
+        """Build one ``data`` entry for a single cell."""
+        a1 = rowcol_to_a1(row_number, column.value + 1)  # gspread uses 1-indexed columns
+        return {
+            "range": absolute_range_name(self.worksheet.title, a1),
+            "values": [[value]],
+        }
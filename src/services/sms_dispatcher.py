@@ -0,0 +1,144 @@
+"""
+Queued, rate-limited SMS dispatch across one or more sender numbers.
+"""
+
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List
+
+# Twilio's HTTP client raises requests/urllib3 errors for transport
+# failures, so those (declared in requirements.txt) tell us whether the
+# request ever left
+import requests
+from twilio.base.exceptions import TwilioRestException
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from src.services.rate_limiter import RetryPolicy, TokenBucket
+from src.services.sms_sender import SMSSender, UnconfirmedSendError
+from src.utils.metrics import metrics
+
+
+def is_transient(error: Exception) -> bool:
+    """
+    Check if a send failure is safe to retry.
+
+    Creating a message is not idempotent, so only failures where Twilio
+    certainly did not accept it are retried: 429 rejections and errors
+    before the connection was made (connect timeout, refused, DNS). A 5xx,
+    read timeout or dropped connection may come after the message was
+    queued, so it is final; retrying could text the lead twice.
+    """
+    if isinstance(error, TwilioRestException):
+        return error.status == 429
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.ConnectionError):
+        cause = error.args[0] if error.args else None
+        return isinstance(cause, MaxRetryError) and isinstance(cause.reason, NewConnectionError)
+    return False
+
+
+def _may_have_sent(error: Exception) -> bool:
+    """Check if a failed send may still have been accepted by Twilio."""
+    if isinstance(error, TwilioRestException):
+        return error.status >= 500
+    return isinstance(error, requests.RequestException) and not is_transient(error)
+
+
+class SMSDispatcher:
+    """
+    Sends SMS from a worker pool so generation and sending overlap.
+
+    Each recipient is pinned to one sender number (so replies land in the
+    same thread) and each sender is throttled to its own messages-per-second
+    limit. Failures that certainly sent nothing (see ``is_transient``) are
+    retried with backoff; anything else fails the message, as an
+    ``UnconfirmedSendError`` when Twilio may have accepted it anyway.
+    """
+
+    def __init__(
+        self,
+        sms_sender: SMSSender,
+        from_numbers: List[str],
+        messages_per_second: float = 1.0,
+        workers: int = 4,
+        max_retries: int = 3,
+    ):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            sms_sender: Twilio sender used for the actual API calls
+            from_numbers: Sender numbers to spread messages across
+            messages_per_second: Throughput limit per sender number
+            workers: Max concurrent Twilio requests
+            max_retries: Retries for transient failures
+        """
+        if not from_numbers:
+            raise ValueError("At least one Twilio sender number is required")
+
+        self.sms_sender = sms_sender
+        self.from_numbers = list(from_numbers)
+        self.retry_policy = RetryPolicy(max_retries=max_retries)
+        self._buckets: Dict[str, TokenBucket] = {
+            number: TokenBucket(messages_per_second * 60, capacity=1)
+            for number in self.from_numbers
+        }
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sms")
+
+    def sender_for(self, to: str) -> str:
+        """Pick the sender number for an E.164 recipient (stable across runs)."""
+        return self.from_numbers[zlib.crc32(to.lstrip("+").encode()) % len(self.from_numbers)]
+
+    def submit(self, to: str, message: str) -> Future:
+        """
+        Queue an SMS for sending.
+
+        Args:
+            to: Recipient in E.164 form (see ``WorkPlanner``)
+            message: SMS text to send
+
+        Returns:
+            Future resolving to the message SID (or raising the send error;
+            ``UnconfirmedSendError`` if the message may have been sent)
+        """
+        return self._pool.submit(self._send, to, message)
+
+    def send(self, to: str, message: str) -> str:
+        """Send an SMS and wait for the result."""
+        return self.submit(to, message).result()
+
+    def _send(self, to: str, message: str) -> str:
+        from_number = self.sender_for(to)
+        bucket = self._buckets[from_number]
+
+        attempt = 0
+        while True:
+            wait = bucket.reserve()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                return self.sms_sender.send(to, message, from_number=from_number)
+            except Exception as e:
+                if not is_transient(e):
+                    if _may_have_sent(e):
+                        # Twilio may have queued it: never resend automatically
+                        metrics.count("twilio.send", "unconfirmed")
+                        raise UnconfirmedSendError(f"Send may have succeeded: {e}") from e
+                    raise
+                if attempt >= self.retry_policy.max_retries:
+                    raise
+            metrics.count("twilio.send", "retries")
+            time.sleep(self.retry_policy.delay(attempt))
+            attempt += 1
+
+    def close(self, wait: bool = True) -> None:
+        """Stop accepting messages, optionally waiting for queued sends."""
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+
+    def __enter__(self) -> "SMSDispatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
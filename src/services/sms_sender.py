@@ -2,42 +2,61 @@
 Twilio SMS sender for sending messages.
 """
 
-from twilio.rest import Client
+import threading
+from typing import Optional
+
 from src.config import Settings
+from src.utils.metrics import metrics
+
+
+class UnconfirmedSendError(Exception):
+    """A send failed in a way Twilio may still have accepted the message."""
 
 
 class SMSSender:
-    """Sends SMS via Twilio."""
+    """
+    Sends SMS via Twilio.
+
+    The Twilio client (and SDK) is only loaded when the first message is
+    sent, so runs that never send don't pay for it.
+    """
 
     def __init__(self, settings: Settings):
-        self.client = Client(settings.twilio_account_sid, settings.twilio_auth_token)
+        self.account_sid = settings.twilio_account_sid
+        self.auth_token = settings.twilio_auth_token
         self.from_number = settings.twilio_phone_number
+        self._client = None
+        self._lock = threading.Lock()
 
-    def send(self, to: str, message: str) -> str:
+    @property
+    def client(self):
+        """Get the Twilio REST client, creating it on first use."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from twilio.rest import Client
+
+                    self._client = Client(self.account_sid, self.auth_token)
+        return self._client
+
+    def send(self, to: str, message: str, from_number: Optional[str] = None) -> str:
         """
         Send an SMS message.
 
         Args:
-            to: Recipient phone number (E.164 format, e.g., +1234567890)
+            to: Recipient in E.164 form, e.g. +1234567890 (see ``normalize_phones``)
             message: SMS text to send
+            from_number: Sender number (defaults to the configured number)
 
         Returns:
             Message SID if successful
         """
-        # Clean phone number to E.164 format
-        to_clean = self._format_phone(to)
-
-        result = self.client.messages.create(
-            body=message,
-            from_=self.from_number,
-            to=to_clean
-        )
+        with metrics.timer("twilio.send") as stage:
+            result = self.client.messages.create(
+                body=message,
+                from_=from_number or self.from_number,
+                to=to
+            )
+        if stage is not None:
+            stage.count("bytes_sent", len(message.encode()))
         return result.sid
-
-    @staticmethod
-    def _format_phone(phone: str) -> str:
-        """Format phone to E.164 (+countrycode...)."""
-        digits = "".join(c for c in phone if c.isdigit())
-        if not digits.startswith("+"):
-            digits = "+" + digits
-        return digits
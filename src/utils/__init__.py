@@ -1,13 +1,46 @@
 """Utils package exports."""
 
-from .formatters import format_chat_history, append_to_history, truncate_sms, format_phone
-from .validators import is_valid_phone, is_valid_lead
+from .formatters import format_chat_history, truncate_sms, clean_phones
+from .sms import SmsInfo, sms_info, sms_capacity, clean_sms, fit_sms
+from .output import ResultWriter
+from .validators import (
+    is_valid_phone,
+    is_valid_lead,
+    normalize_phone,
+    normalize_phones,
+    validate_leads,
+    LeadValidation,
+    RejectReason,
+)
+from .concurrency import ServiceLimits, SingleFlight, bounded_map
+from .history import HistoryManager
+from .metrics import Metrics, metrics
+from .planning import Priority, WorkPlan, WorkPlanner
 
 __all__ = [
     "format_chat_history",
-    "append_to_history",
     "truncate_sms",
-    "format_phone",
+    "clean_phones",
+    "SmsInfo",
+    "sms_info",
+    "sms_capacity",
+    "clean_sms",
+    "fit_sms",
+    "ResultWriter",
     "is_valid_phone",
     "is_valid_lead",
+    "normalize_phone",
+    "normalize_phones",
+    "validate_leads",
+    "LeadValidation",
+    "RejectReason",
+    "ServiceLimits",
+    "SingleFlight",
+    "bounded_map",
+    "HistoryManager",
+    "Metrics",
+    "metrics",
+    "Priority",
+    "WorkPlan",
+    "WorkPlanner",
 ]
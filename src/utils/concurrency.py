@@ -0,0 +1,161 @@
+"""
+Concurrency helpers for limiting parallel calls to external services.
+"""
+
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, Iterator, Optional, Tuple, TypeVar
+
+from src.config import Settings
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass(frozen=True)
+class ServiceLimits:
+    """
+    Per-service concurrency limits shared by all pipeline workers.
+
+    Each limit is applied where that service is called:
+
+    - Groq: ``GroqClient`` holds one of ``GROQ_CONCURRENCY`` slots around
+      each HTTP request (not around the whole agent run, so batched leads
+      can gather in the ``BatchGenerator`` without holding a slot)
+    - ``twilio`` is the number of ``SMSDispatcher`` workers sending at once;
+      each sender number is also paced by its own ``TokenBucket``
+      (``TWILIO_MPS``)
+    - ``sheets`` is the number of worksheets read at once; write-back is
+      batched per worksheet by ``SheetWriteBuffer``
+    """
+
+    twilio: int = 1
+    sheets: int = 1
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ServiceLimits":
+        """Read the configured per-service limits."""
+        return cls(
+            twilio=settings.twilio_concurrency,
+            sheets=settings.sheets_concurrency,
+        )
+
+
+def bounded_map(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    workers: int,
+    max_pending: Optional[int] = None,
+) -> Iterator[R]:
+    """
+    Ordered, lazily-fed parallel map.
+
+    Unlike ``ThreadPoolExecutor.map``, items are pulled from ``items`` only
+    as workers free up, so generators (e.g. streamed sheet pages) are
+    consumed incrementally and memory stays bounded.
+
+    Args:
+        fn: Function applied to each item
+        items: Input items (any iterable, consumed lazily)
+        workers: Worker threads (1 or less runs sequentially)
+        max_pending: Max items submitted but not yet yielded (default 2x workers)
+
+    Yields:
+        Results in the same order as ``items``
+    """
+    if workers <= 1:
+        yield from map(fn, items)
+        return
+
+    max_pending = max_pending or workers * 2
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lead")
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+class SingleFlight:
+    """
+    Computes a value once per key and shares it with every caller.
+
+    Callers arriving while the value is being computed wait for it instead
+    of starting their own computation, from threads (``get``) as well as
+    coroutines (``aget``). Results are kept for the object's lifetime;
+    failures are not, so the next caller for the key tries again.
+    """
+
+    def __init__(self):
+        self._futures: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    def _claim(self, key: Hashable) -> Tuple[Future, bool]:
+        """The key's future, and whether this caller has to compute it."""
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                return future, False
+            future = self._futures[key] = Future()
+            return future, True
+
+    def _fail(self, key: Hashable, future: Future, error: BaseException) -> None:
+        with self._lock:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+        future.set_exception(error)
+
+    def get(self, key: Hashable, compute: Callable[[], R]) -> R:
+        """
+        Get the value for ``key``, computing it if no one has yet.
+
+        Args:
+            key: Identifies the value
+            compute: Called (by one caller only) to produce the value
+
+        Returns:
+            The shared value
+        """
+        while True:
+            future, owner = self._claim(key)
+            if not owner:
+                try:
+                    return future.result()
+                except Exception:
+                    continue  # The owner failed: compute it ourselves
+            try:
+                value = compute()
+            except BaseException as e:
+                self._fail(key, future, e)
+                raise
+            future.set_result(value)
+            return value
+
+    async def aget(self, key: Hashable, compute: Callable[[], Awaitable[R]]) -> R:
+        """Async variant of :meth:`get`; ``compute`` returns an awaitable."""
+        while True:
+            future, owner = self._claim(key)
+            if not owner:
+                try:
+                    return await asyncio.wrap_future(future)
+                except Exception:
+                    continue
+            try:
+                value = await compute()
+            except BaseException as e:
+                self._fail(key, future, e)
+                raise
+            future.set_result(value)
+            return value
@@ -2,45 +2,45 @@
 Message and data formatting utilities.
 """
 
-from datetime import datetime
-from src.config import MAX_SMS_LENGTH
-
+from typing import Iterable, List, Optional
 
-def format_chat_history(history: str | None) -> str:
-    """Format chat history for prompt inclusion."""
-    if not history or not history.strip():
-        return "No previous conversation."
-    return history.strip()
+from src.config import MAX_SMS_LENGTH
 
 
-def append_to_history(existing_history: str | None, role: str, message: str) -> str:
-    """
-    Append a new message to chat history.
+# Separators people type in phone numbers; deleting them with str.translate
+# leaves just digits (and a leading "+") for well-formed numbers
+PHONE_SEPARATORS = str.maketrans("", "", " \t()-./\u00a0")
 
-    Args:
-        existing_history: Current chat history string
-        role: "assistant" or "customer"
-        message: The message to append
 
-    Returns:
-        Updated history string
-    """
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-    new_entry = f"[{timestamp}] {role.upper()}: {message}"
-
-    if existing_history and existing_history.strip():
-        return f"{existing_history.strip()}\n{new_entry}"
-    return new_entry
+def format_chat_history(history) -> str:
+    """Format chat history (a ChatHistory or raw cell text) for prompt inclusion."""
+    text = str(history).strip() if history else ""
+    if not text:
+        return "No previous conversation."
+    return text
 
 
 def truncate_sms(message: str, max_length: int = MAX_SMS_LENGTH) -> str:
-    """Truncate SMS to max length if needed."""
+    """Truncate SMS to max length if needed, preferring a word boundary."""
     if len(message) <= max_length:
         return message
-    return message[:max_length - 3] + "..."
+    cut = message[:max_length - 3]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0].rstrip(" ,;:-")
+    return cut + "..."
 
 
-def format_phone(phone: str) -> str:
-    """Clean and format phone number."""
-    digits = "".join(c for c in phone if c.isdigit())
-    return digits
+def clean_phones(phones: Iterable[Optional[str]]) -> List[str]:
+    """
+    Strip separators from a whole column of phone numbers in one pass.
+
+    The column is joined into one string so ``str.translate`` runs once in
+    C instead of once per row. Anything left besides digits and "+" (letters,
+    extensions...) is kept for the caller to reject.
+    """
+    phones = [phone or "" for phone in phones]
+    cleaned = "\n".join(phones).translate(PHONE_SEPARATORS).split("\n")
+    if len(cleaned) != len(phones):
+        # A cell contained a newline; fall back to row by row
+        cleaned = [phone.replace("\n", "").translate(PHONE_SEPARATORS) for phone in phones]
+    return cleaned
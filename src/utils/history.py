@@ -0,0 +1,109 @@
+"""
+Chat history windowing for follow-up prompts.
+"""
+
+import threading
+from typing import List, Optional
+
+from src.models.chat_history import ChatHistory, ChatTurn
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+class HistoryManager:
+    """
+    Keeps follow-up prompts within a token budget.
+
+    The most recent turns that fit in ``max_tokens`` are kept verbatim.
+    Older turns are either dropped or, with ``summarize``, condensed into a
+    single line listing what the customer said earlier. The number of
+    prompt tokens saved versus sending the full history is tracked.
+    """
+
+    SUMMARY_SNIPPET_CHARS = 60
+    SUMMARY_SHARE = 0.25  # Part of the budget reserved for the summary line
+
+    def __init__(self, max_tokens: int = 400, summarize: bool = True):
+        """
+        Initialize the history manager.
+
+        Args:
+            max_tokens: Token budget for the rendered history
+            summarize: Condense turns outside the window into a summary line
+        """
+        self.max_tokens = max_tokens
+        self.summarize = summarize
+        self.tokens_saved = 0
+        self.truncated = 0
+        self._lock = threading.Lock()
+
+    def render(self, history: ChatHistory | str | None) -> str:
+        """
+        Render the history for prompt inclusion.
+
+        Args:
+            history: Parsed history or raw chat history cell
+
+        Returns:
+            Windowed (and possibly summarised) history text
+        """
+        turns = history if isinstance(history, ChatHistory) else ChatHistory.parse(history)
+        if not turns:
+            return "No previous conversation."
+
+        lines = [turn.render() for turn in turns]
+        full_text = "\n".join(lines)
+        if estimate_tokens(full_text) <= self.max_tokens:
+            return full_text
+
+        # Walk back from the latest turn; always keep at least one
+        kept: List[str] = []
+        reserved = int(self.max_tokens * self.SUMMARY_SHARE) if self.summarize else 0
+        budget = self.max_tokens - reserved
+        for line in reversed(lines):
+            cost = estimate_tokens(line) + 1
+            if kept and cost > budget:
+                break
+            kept.append(line)
+            budget -= cost
+        kept.reverse()
+        older = turns[:len(turns) - len(kept)]
+
+        if self.summarize and older:
+            summary = self._summarize(older, budget + reserved)
+            if summary:
+                kept.insert(0, summary)
+
+        text = "\n".join(kept)
+        with self._lock:
+            self.truncated += 1
+            self.tokens_saved += estimate_tokens(full_text) - estimate_tokens(text)
+        return text
+
+    def _summarize(self, turns: List[ChatTurn], budget: int) -> Optional[str]:
+        """Condense older turns into one line that fits the remaining budget."""
+        snippets = []
+        for turn in turns:
+            if not turn.is_customer:
+                continue
+            snippet = " ".join(turn.message.split())
+            if len(snippet) > self.SUMMARY_SNIPPET_CHARS:
+                snippet = snippet[:self.SUMMARY_SNIPPET_CHARS - 3] + "..."
+            snippets.append(f'"{snippet}"')
+
+        prefix = f"(Earlier: {len(turns)} older messages"
+        summary = f"{prefix}; customer said {'; '.join(snippets)})" if snippets else f"{prefix})"
+        # Drop the oldest snippets until the summary fits
+        while snippets and estimate_tokens(summary) > budget:
+            snippets.pop(0)
+            summary = f"{prefix}; customer said {'; '.join(snippets)})" if snippets else f"{prefix})"
+        if estimate_tokens(summary) > budget:
+            return None
+        return summary
+
+    def stats(self) -> dict:
+        """Counters for reporting."""
+        return {"truncated": self.truncated, "tokens_saved": self.tokens_saved}
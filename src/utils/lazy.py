@@ -0,0 +1,37 @@
+"""
+Lazy package exports (PEP 562), so importing a package stays cheap.
+"""
+
+import importlib
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """
+    Build a package's module-level ``__getattr__`` and ``__dir__``.
+
+    Each exported name is imported from its submodule the first time it
+    is accessed and then cached in the package namespace, so later
+    lookups are plain attribute reads.
+
+    Args:
+        package: The package's ``__name__``
+        exports: Exported name -> relative submodule (e.g. ``".sms_sender"``)
+
+    Returns:
+        ``(__getattr__, __dir__)`` to assign in the package ``__init__``
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str):
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(submodule, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
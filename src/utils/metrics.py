@@ -0,0 +1,216 @@
+"""
+Lightweight per-stage timing and counters for a pipeline run.
+"""
+
+import functools
+import inspect
+import json
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+
+# Latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, math.inf,
+)
+
+
+class Stage:
+    """Timings and counters for one stage (e.g. ``groq.request``)."""
+
+    __slots__ = ("name", "buckets", "total", "max", "counters", "_lock")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.total = 0.0
+        self.max = 0.0
+        self.counters: Dict[str, float] = {"calls": 0, "errors": 0}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, error: bool = False) -> None:
+        """Record one timed call."""
+        index = bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            self.buckets[index] += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+            self.counters["calls"] += 1
+            if error:
+                self.counters["errors"] += 1
+
+    def count(self, name: str, amount: float = 1) -> None:
+        """Add to a named counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def percentile(self, pct: float) -> float:
+        """Latency percentile estimated from the histogram (interpolated within a bucket)."""
+        observed = sum(self.buckets)
+        if not observed:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * observed))
+        seen = 0
+        lower = 0.0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            if count and seen + count >= rank:
+                upper = min(bound, self.max)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return self.max
+
+    def report(self) -> dict:
+        with self._lock:
+            observed = sum(self.buckets)
+            return {
+                **self.counters,
+                "seconds": round(self.total, 6),
+                "mean_ms": round(self.total / observed * 1000, 3) if observed else 0.0,
+                "p50_ms": round(self.percentile(50) * 1000, 3),
+                "p99_ms": round(self.percentile(99) * 1000, 3),
+                "max_ms": round(self.max * 1000, 3),
+                "histogram": {
+                    _bound_label(bound): count
+                    for bound, count in zip(LATENCY_BUCKETS, self.buckets)
+                },
+            }
+
+
+def _bound_label(bound: float) -> str:
+    return "+Inf" if bound == math.inf else f"{bound:g}"
+
+
+class Metrics:
+    """
+    Registry of pipeline stages, cheap enough to leave on.
+
+    Stages are named ``<area>.<step>`` (``sheets.read``, ``node.generate``,
+    ``groq.request``, ``twilio.send``...). Each timed call costs two
+    ``perf_counter`` reads and one uncontended lock; with ``enabled`` off
+    timers and counters return immediately.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.started_at = time.time()
+        self._stages: Dict[str, Stage] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str) -> Stage:
+        """Get a stage, creating it on first use."""
+        stage = self._stages.get(name)
+        if stage is None:
+            with self._lock:
+                stage = self._stages.setdefault(name, Stage(name))
+        return stage
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[Optional[Stage]]:
+        """
+        Time a block as one call of ``name``; exceptions count as errors.
+
+        Yields:
+            The stage (for extra counters), or None when disabled
+        """
+        if not self.enabled:
+            yield None
+            return
+        stage = self.stage(name)
+        start = time.perf_counter()
+        try:
+            yield stage
+        except BaseException:
+            stage.observe(time.perf_counter() - start, error=True)
+            raise
+        stage.observe(time.perf_counter() - start)
+
+    def timed(self, name: str) -> Callable[[Callable], Callable]:
+        """Decorator timing every call of a (sync or async) function."""
+        def decorator(fn: Callable) -> Callable:
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    with self.timer(name):
+                        return await fn(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name: str, counter: str, amount: float = 1) -> None:
+        """Add to a counter of a stage (e.g. ``count("groq.request", "retries")``)."""
+        if self.enabled and amount:
+            self.stage(name).count(counter, amount)
+
+    def reset(self) -> None:
+        """Drop all recorded data and restart the run clock."""
+        with self._lock:
+            self._stages = {}
+            self.started_at = time.time()
+
+    def report(self) -> dict:
+        """JSON-serialisable run report."""
+        with self._lock:
+            stages = dict(self._stages)
+        return {
+            "started_at": datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+            "duration_seconds": round(time.time() - self.started_at, 3),
+            "stages": {name: stages[name].report() for name in sorted(stages)},
+        }
+
+    def write_json(self, path: str) -> None:
+        """Write the run report as JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def to_prometheus(self, prefix: str = "roya") -> str:
+        """
+        Render the report in the Prometheus text exposition format.
+
+        Latencies become a ``<prefix>_stage_duration_seconds`` histogram and
+        counters become ``<prefix>_stage_<counter>_total``, labelled by stage.
+        """
+        report = self.report()["stages"]
+        metric = f"{prefix}_stage_duration_seconds"
+        lines = [
+            f"# HELP {metric} Time spent per call of a pipeline stage.",
+            f"# TYPE {metric} histogram",
+        ]
+        counters: Dict[str, list] = {}
+        for name, stage in report.items():
+            cumulative = 0
+            for le, count in stage["histogram"].items():
+                cumulative += count
+                lines.append(f'{metric}_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {stage["seconds"]}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {stage["calls"]}')
+            for counter in stage:
+                if counter in ("calls", "seconds", "histogram") or counter.endswith("_ms"):
+                    continue
+                counters.setdefault(counter, []).append((name, stage[counter]))
+
+        for counter, values in sorted(counters.items()):
+            total = f"{prefix}_stage_{counter}_total"
+            lines.append(f"# TYPE {total} counter")
+            lines.extend(f'{total}{{stage="{name}"}} {value:g}' for name, value in values)
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Write the Prometheus text format (e.g. for node_exporter's textfile collector)."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+
+
+# Process-wide registry used by the agent graph and service clients
+metrics = Metrics()
@@ -0,0 +1,96 @@
+"""
+Per-lead results streamed to a JSONL or CSV file.
+"""
+
+import csv
+import json
+import threading
+from typing import Optional
+
+from src.utils.sms import sms_info
+
+
+FIELDS = [
+    "sheet", "row_number", "name", "phone", "product", "status", "source",
+    "message_type", "sms", "characters", "encoding", "segments", "sent", "error",
+]
+
+
+class ResultWriter:
+    """
+    Writes one record per processed lead as soon as it completes.
+
+    The format follows the file extension (``.csv``, anything else is
+    JSON Lines). The file is line-buffered, so it can be followed with
+    ``tail -f`` during long runs and a crash loses at most one record.
+    """
+
+    def __init__(self, path: str, fmt: Optional[str] = None):
+        """
+        Open the output file (truncating it).
+
+        Args:
+            path: Output file
+            fmt: "jsonl" or "csv" (from the extension if omitted)
+        """
+        self.path = path
+        self.format = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+        if self.format not in ("jsonl", "csv"):
+            raise ValueError(f"Unknown output format: {self.format}")
+        self.written = 0
+        self._file = open(path, "w", encoding="utf-8", newline="", buffering=1)
+        self._csv = None
+        if self.format == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=FIELDS)
+            self._csv.writeheader()
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the output file."""
+        self._file.close()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def record(outcome: dict, sheet: str = "") -> dict:
+        """Flatten a lead outcome (see ``main.process_lead``) into one record."""
+        lead = outcome["lead"]
+        result = outcome.get("result") or {}
+        sms = result.get("generated_sms")
+        info = sms_info(sms) if sms else None
+        if outcome.get("resumed"):
+            source = "journal"
+        elif outcome.get("drafted"):
+            source = "outbox"
+        else:
+            source = "generated" if sms else ""
+        return {
+            "sheet": sheet,
+            "row_number": lead.row_number,
+            "name": lead.name,
+            "phone": outcome.get("phone") or lead.phone,
+            "product": lead.product,
+            "status": outcome["status"],
+            "source": source,
+            "message_type": result.get("message_type", ""),
+            "sms": sms or "",
+            "characters": len(sms) if sms else 0,
+            "encoding": info.encoding if info else "",
+            "segments": info.segments if info else 0,
+            "sent": bool(outcome.get("sent")),
+            "error": outcome.get("error") or outcome.get("send_error") or "",
+        }
+
+    def write(self, outcome: dict, sheet: str = "") -> None:
+        """Append the record for one lead outcome."""
+        record = self.record(outcome, sheet)
+        with self._lock:
+            if self._csv is not None:
+                self._csv.writerow(record)
+            else:
+                self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.written += 1
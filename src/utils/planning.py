@@ -0,0 +1,196 @@
+"""
+Work planning: one deduplicated, prioritised queue of leads per run.
+"""
+
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.models.lead import Lead
+from src.utils.validators import RejectReason, validate_leads
+
+
+class Priority(IntEnum):
+    """Processing order of lead kinds (lowest first)."""
+
+    REPLY = 0      # Customer wrote last and is waiting for an answer
+    NEW = 1        # Never contacted
+    FOLLOWUP = 2   # We wrote last; nudge
+
+
+def priority(lead: Lead) -> Optional[Priority]:
+    """Classify a lead, or None if there is nothing to send."""
+    if lead.has_chat_history:
+        last = lead.chat_history.last
+        return Priority.REPLY if last is not None and last.is_customer else Priority.FOLLOWUP
+    if not lead.has_been_contacted:
+        return Priority.NEW
+    return None
+
+
+def _sort_key(lead: Lead, tier: Priority) -> tuple:
+    if tier == Priority.REPLY:
+        # Longest-waiting reply first
+        return (tier, lead.chat_history.last.timestamp or "", lead.row_number)
+    return (tier, "", lead.row_number)
+
+
+@dataclass(frozen=True)
+class WorkPlan:
+    """Leads to process this run, plus what was left out and why."""
+
+    queue: Tuple[Lead, ...]
+    duplicates: Tuple[Lead, ...] = ()
+    deferred: Tuple[Lead, ...] = ()
+    counts: Dict[Priority, int] = field(default_factory=dict)
+    rejected: Tuple[Tuple[Lead, RejectReason], ...] = ()
+    phones: Tuple[str, ...] = ()    # E.164 number of each queued lead
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def items(self) -> Iterator[Tuple[Lead, str]]:
+        """Queued leads with the E.164 number to text them on."""
+        return zip(self.queue, self.phones)
+
+    def summary(self) -> str:
+        """One-line description for the console."""
+        kinds = ", ".join(f"{self.counts.get(p, 0)} {p.name.lower()}" for p in Priority)
+        summary = (
+            f"{len(self.queue)} leads queued ({kinds}); "
+            f"{len(self.duplicates)} duplicate phones merged, "
+            f"{len(self.deferred)} deferred by run caps"
+        )
+        if self.rejected:
+            reasons: Dict[str, int] = {}
+            for _, reason in self.rejected:
+                reasons[reason.value] = reasons.get(reason.value, 0) + 1
+            details = ", ".join(f"{count} {reason}" for reason, count in sorted(reasons.items()))
+            summary += f", {len(self.rejected)} rejected ({details})"
+        return summary
+
+
+class WorkPlanner:
+    """
+    Builds the run's work queue from candidate leads.
+
+    Candidates are validated in one bulk pass and rows that can't be
+    messaged are set aside with a reason. Every remaining lead is
+    classified once (so a row can't be both a new lead and a follow-up),
+    rows sharing a normalised phone number are merged into the
+    highest-priority one, and per-run caps are applied in priority order.
+    Caps of 0 mean unlimited. The E.164 numbers found while validating
+    are handed on with the queue, so nothing downstream re-validates.
+    """
+
+    def __init__(self, max_leads: int = 0, max_new: int = 0, max_followups: int = 0,
+                 default_country_code: str = ""):
+        """
+        Initialize the planner.
+
+        Args:
+            max_leads: Max leads processed per run
+            max_new: Max first-contact messages per run
+            max_followups: Max follow-ups (including replies) per run
+            default_country_code: Country code for national phone numbers
+        """
+        self.max_leads = max_leads
+        self.max_new = max_new
+        self.max_followups = max_followups
+        self.default_country_code = default_country_code
+
+    @classmethod
+    def from_settings(cls, settings) -> "WorkPlanner":
+        return cls(
+            max_leads=settings.max_leads_per_run,
+            max_new=settings.max_new_per_run,
+            max_followups=settings.max_followups_per_run,
+            default_country_code=settings.default_country_code,
+        )
+
+    def _within_caps(self, tier: Priority, taken: Dict[Priority, int], total: int) -> bool:
+        if self.max_leads and total >= self.max_leads:
+            return False
+        if tier == Priority.NEW:
+            return not self.max_new or taken[Priority.NEW] < self.max_new
+        followups = taken[Priority.REPLY] + taken[Priority.FOLLOWUP]
+        return not self.max_followups or followups < self.max_followups
+
+    def plan(self, leads: Iterable[Lead]) -> WorkPlan:
+        """
+        Plan a run from all candidate leads.
+
+        Args:
+            leads: Candidate leads (may contain the same row more than once)
+
+        Returns:
+            WorkPlan with the queue in processing order
+        """
+        by_row: Dict[int, Tuple[tuple, Lead, Priority]] = {}
+        for lead in leads:
+            tier = priority(lead)
+            if tier is not None and lead.row_number not in by_row:
+                by_row[lead.row_number] = (_sort_key(lead, tier), lead, tier)
+
+        # One bulk pass validates every candidate and yields its E.164 number
+        candidates = list(by_row.values())
+        validation = validate_leads([lead for _, lead, _ in candidates], self.default_country_code)
+        valid: List[Tuple[tuple, Lead, Priority, str]] = []
+        rejected: List[Tuple[Lead, RejectReason]] = []
+        for (sort_key, lead, tier), phone, reason in zip(candidates, validation.phones, validation.reasons):
+            if reason is None:
+                valid.append((sort_key, lead, tier, phone))
+            else:
+                rejected.append((lead, reason))
+
+        queue: List[Lead] = []
+        phones: List[str] = []
+        duplicates: List[Lead] = []
+        deferred: List[Lead] = []
+        taken = {p: 0 for p in Priority}
+        seen: Set[str] = set()
+        for _, lead, tier, phone in sorted(valid, key=lambda item: item[0]):
+            if phone in seen:
+                duplicates.append(lead)
+                continue
+            seen.add(phone)
+            if not self._within_caps(tier, taken, len(queue)):
+                deferred.append(lead)
+                continue
+            taken[tier] += 1
+            queue.append(lead)
+            phones.append(phone)
+
+        return WorkPlan(tuple(queue), tuple(duplicates), tuple(deferred), taken,
+                        tuple(rejected), tuple(phones))
+
+    def stream(self, leads: Iterable[Lead]) -> Iterator[Tuple[Lead, str]]:
+        """
+        Filter a lead stream without reordering it.
+
+        Streaming can't look ahead, so leads are taken in sheet order: the
+        first row seen for a phone number wins and caps stop the stream.
+        Invalid rows are dropped.
+
+        Yields:
+            ``(lead, E.164 phone)`` pairs, like ``WorkPlan.items``
+        """
+        taken = {p: 0 for p in Priority}
+        seen: Set[str] = set()
+        total = 0
+        for lead in leads:
+            tier = priority(lead)
+            if tier is None:
+                continue
+            validation = validate_leads([lead], self.default_country_code)
+            phone = validation.phones[0]
+            if phone is None or phone in seen:
+                continue
+            seen.add(phone)
+            if self.max_leads and total >= self.max_leads:
+                return
+            if not self._within_caps(tier, taken, total):
+                continue
+            taken[tier] += 1
+            total += 1
+            yield lead, phone
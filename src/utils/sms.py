@@ -0,0 +1,147 @@
+"""
+SMS encoding, segment counting and clean-up of generated messages.
+"""
+
+import re
+from dataclasses import dataclass
+
+from src.config import MAX_SMS_LENGTH
+from src.utils.formatters import truncate_sms
+
+
+GSM7 = "GSM-7"
+UCS2 = "UCS-2"
+
+# GSM 03.38 basic character set (one septet each) and the extension table
+# (escape + character, two septets each)
+GSM7_BASIC = (
+    "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+GSM7_EXTENDED = "\f^{}\\[~]|€"
+
+_NON_GSM7 = re.compile("[^" + re.escape(GSM7_BASIC + GSM7_EXTENDED) + "]")
+_GSM7_EXTENDED = re.compile("[" + re.escape(GSM7_EXTENDED) + "]")
+
+# Single-message capacity and per-part capacity of concatenated messages
+# (the rest of each part carries the concatenation header)
+CAPACITY = {
+    GSM7: (MAX_SMS_LENGTH, 153),
+    UCS2: (70, 67),
+}
+
+# Typographic characters models like to emit that have a GSM-7 equivalent;
+# a single one would otherwise switch the whole message to UCS-2
+GSM7_LOOKALIKES = str.maketrans({
+    "‘": "'", "’": "'", "‚": "'", "′": "'",
+    "“": '"', "”": '"', "„": '"', "″": '"',
+    "–": "-", "—": "-", "−": "-", "•": "-",
+    "…": "...", "\u00a0": " ", "\u200b": "",
+})
+
+# Labels the model sometimes puts before the message ("SMS:", "Here's the
+# message:", a copied "[timestamp] ASSISTANT:" history prefix...)
+_PREFIX = re.compile(
+    r"^\s*(?:\[[^\]]*\]\s*)?"
+    r"(?:(?:here(?:'s| is)\s+(?:the|my|a|your)\s+)?(?:sms|text|message|reply|response|assistant)"
+    r"(?:\s+(?:text|message))?\s*:\s*)+",
+    re.IGNORECASE,
+)
+_QUOTES = "\"'`“”‘’«»"
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class SmsInfo:
+    """How a message is encoded and billed."""
+
+    encoding: str   # GSM7 or UCS2
+    length: int     # Septets (GSM-7) or UTF-16 code units (UCS-2)
+    segments: int   # Billable message parts
+
+
+def sms_capacity(encoding: str, segments: int = 1) -> int:
+    """Max length (in the encoding's units) that fits in ``segments`` parts."""
+    single, part = CAPACITY[encoding]
+    return single if segments <= 1 else part * segments
+
+
+def sms_info(text: str) -> SmsInfo:
+    """
+    Work out the encoding, billed length and segment count of a message.
+
+    Args:
+        text: Message body
+
+    Returns:
+        SmsInfo; messages with any character outside GSM-7 are sent as UCS-2
+    """
+    if _NON_GSM7.search(text) is None:
+        encoding = GSM7
+        units = [2 if c in GSM7_EXTENDED else 1 for c in text]
+    else:
+        encoding = UCS2
+        # Characters outside the BMP (most emoji) take a surrogate pair
+        units = [2 if ord(c) > 0xFFFF else 1 for c in text]
+
+    length = sum(units)
+    single, part = CAPACITY[encoding]
+    if length <= single:
+        return SmsInfo(encoding, length, 1 if length else 0)
+
+    # Escape sequences and surrogate pairs are never split across parts
+    segments, used = 1, 0
+    for size in units:
+        if used + size > part:
+            segments += 1
+            used = 0
+        used += size
+    return SmsInfo(encoding, length, segments)
+
+
+def clean_sms(text: str) -> str:
+    """
+    Normalise a generated message before it is validated and sent.
+
+    Strips labels and wrapping quotes, folds whitespace (newlines would
+    break the chat history cell) and swaps typographic characters for
+    their GSM-7 equivalents.
+    """
+    text = _WHITESPACE.sub(" ", text.translate(GSM7_LOOKALIKES)).strip()
+    previous = None
+    while text != previous:
+        previous = text
+        text = _PREFIX.sub("", text)
+        if _wrapped_in_quotes(text):
+            text = text[1:-1].strip()
+    return text
+
+
+def _wrapped_in_quotes(text: str) -> bool:
+    """True for '"whole message"' but not for '"Hi" and "bye"'."""
+    if len(text) < 2 or text[0] not in _QUOTES or text[-1] not in _QUOTES:
+        return False
+    # Apostrophes inside a single-quoted message are fine
+    return text[0] == "'" or text[0] not in text[1:-1]
+
+
+def fit_sms(text: str, max_segments: int = 1) -> str:
+    """
+    Shorten a message until it fits in ``max_segments`` parts.
+
+    Characters forcing UCS-2 (emoji, symbols) are dropped first, since
+    that alone more than doubles the capacity; the rest is truncated.
+    """
+    if sms_info(text).segments <= max_segments:
+        return text
+    if _NON_GSM7.search(text) is not None:
+        text = _WHITESPACE.sub(" ", _NON_GSM7.sub("", text)).strip()
+
+    # Extension characters cost two septets: shrink by the overflow until it fits
+    capacity = sms_capacity(GSM7, max_segments)
+    max_length = capacity
+    fitted = truncate_sms(text, max_length)
+    while sms_info(fitted).segments > max_segments:
+        max_length -= max(1, (sms_info(fitted).length - capacity) // 2)
+        fitted = truncate_sms(text, max_length)
+    return fitted
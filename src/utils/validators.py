@@ -2,29 +2,168 @@
 Input validation utilities.
 """
 
-import re
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from src.utils.formatters import clean_phones
+
+
+# Digits in a number including its country code (E.164 allows 15)
+MIN_PHONE_DIGITS = 10
+MAX_PHONE_DIGITS = 15
+
+
+class RejectReason(str, Enum):
+    """Why a lead row can't be messaged."""
+    MISSING_NAME = "missing_name"
+    MISSING_PHONE = "missing_phone"
+    INVALID_PHONE = "invalid_phone"      # Letters or symbols besides separators
+    NO_COUNTRY_CODE = "no_country_code"  # National number (leading 0) and no default code
+    PHONE_TOO_SHORT = "phone_too_short"
+    PHONE_TOO_LONG = "phone_too_long"
+    MISSING_PRODUCT = "missing_product"
+
+
+def _to_e164(cleaned: str, default_country_code: str) -> Tuple[Optional[str], Optional[RejectReason]]:
+    """Turn a separator-free number into E.164, or say why it can't be."""
+    if cleaned.isdigit():
+        if cleaned.startswith("00"):
+            # International call prefix
+            digits = cleaned[2:]
+        elif default_country_code and (cleaned[0] == "0" or len(cleaned) <= MIN_PHONE_DIGITS):
+            # National number: drop the trunk prefix, add the country code
+            digits = default_country_code + (cleaned[1:] if cleaned[0] == "0" else cleaned)
+        else:
+            digits = cleaned
+    elif cleaned[:1] == "+" and cleaned[1:].isdigit():
+        digits = cleaned[1:]
+    elif not cleaned:
+        return None, RejectReason.MISSING_PHONE
+    else:
+        return None, RejectReason.INVALID_PHONE
+
+    if len(digits) < MIN_PHONE_DIGITS:
+        return None, RejectReason.PHONE_TOO_SHORT
+    if len(digits) > MAX_PHONE_DIGITS:
+        return None, RejectReason.PHONE_TOO_LONG
+    if digits[0] == "0":
+        return None, RejectReason.NO_COUNTRY_CODE
+    return "+" + digits, None
+
+
+def normalize_phones(
+    phones: Iterable[Optional[str]],
+    default_country_code: str = "",
+) -> Tuple[List[Optional[str]], List[Optional[RejectReason]]]:
+    """
+    Normalise a column of phone numbers to E.164 in one pass.
+
+    Args:
+        phones: Raw phone cells
+        default_country_code: Digits added to national numbers written
+            without "+" or "00" (e.g. "1"); numbers are used as written if empty
+
+    Returns:
+        Tuple of (E.164 numbers, reasons), aligned with ``phones``; each
+        row has either a number or a reason
+    """
+    numbers: List[Optional[str]] = []
+    reasons: List[Optional[RejectReason]] = []
+    shortest, longest = MIN_PHONE_DIGITS + 1, MAX_PHONE_DIGITS + 1
+    for cleaned in clean_phones(phones):
+        # Fast path: already E.164 once separators are gone
+        if (cleaned[:1] == "+" and shortest <= len(cleaned) <= longest
+                and cleaned[1:].isdigit() and cleaned[1] != "0"):
+            numbers.append(cleaned)
+            reasons.append(None)
+            continue
+        number, reason = _to_e164(cleaned, default_country_code)
+        numbers.append(number)
+        reasons.append(reason)
+    return numbers, reasons
+
+
+def normalize_phone(phone: Optional[str], default_country_code: str = "") -> Optional[str]:
+    """E.164 form of one phone number, or None if it isn't valid."""
+    return normalize_phones([phone], default_country_code)[0][0]
 
 
 def is_valid_phone(phone: str) -> bool:
     """Check if phone number is valid (basic check)."""
-    digits = "".join(c for c in phone if c.isdigit())
-    return 10 <= len(digits) <= 15
+    return normalize_phone(phone) is not None
+
 
+def _field_reason(name: Optional[str], product: Optional[str],
+                  phone_reason: Optional[RejectReason]) -> Optional[RejectReason]:
+    """First failing check of a row, in the order they are reported."""
+    if not name or name.isspace():
+        return RejectReason.MISSING_NAME
+    if phone_reason is not None:
+        return phone_reason
+    if not product or product.isspace():
+        return RejectReason.MISSING_PRODUCT
+    return None
 
-def is_valid_lead(lead) -> tuple[bool, str]:
+
+@dataclass(frozen=True)
+class LeadValidation:
+    """Bulk validation result, aligned with the validated leads."""
+
+    phones: List[Optional[str]]               # E.164 numbers (None when rejected)
+    reasons: List[Optional[RejectReason]]     # None for valid rows
+
+    def __len__(self) -> int:
+        return len(self.reasons)
+
+    @property
+    def rejected(self) -> int:
+        return sum(reason is not None for reason in self.reasons)
+
+    def counts(self) -> dict:
+        """Number of rejected rows per reason."""
+        counts = {}
+        for reason in self.reasons:
+            if reason is not None:
+                counts[reason] = counts.get(reason, 0) + 1
+        return counts
+
+
+def validate_leads(leads: Sequence, default_country_code: str = "") -> LeadValidation:
+    """
+    Validate and normalise a whole batch of leads at once.
+
+    Phones are cleaned as one column (see ``normalize_phones``), so large
+    sheets don't pay a Python-level character loop per row.
+
+    Args:
+        leads: Leads (anything with ``name``, ``phone`` and ``product``)
+        default_country_code: See ``normalize_phones``
+
+    Returns:
+        LeadValidation with E.164 numbers and a reason per rejected lead
+    """
+    phones, phone_reasons = normalize_phones((lead.phone for lead in leads), default_country_code)
+    reasons = [
+        _field_reason(lead.name, lead.product, phone_reason)
+        for lead, phone_reason in zip(leads, phone_reasons)
+    ]
+    phones = [phone if reason is None else None for phone, reason in zip(phones, reasons)]
+    return LeadValidation(phones, reasons)
+
+
+def is_valid_lead(lead, default_country_code: str = "") -> tuple[bool, str]:
     """
     Validate a lead has required fields.
 
     Returns:
         Tuple of (is_valid, error_message)
     """
-    if not lead.name or not lead.name.strip():
+    reason = validate_leads([lead], default_country_code).reasons[0]
+    if reason is None:
+        return True, ""
+    if reason == RejectReason.MISSING_NAME:
         return False, "Lead missing name"
-
-    if not lead.phone or not is_valid_phone(lead.phone):
-        return False, f"Invalid phone for {lead.name}"
-
-    if not lead.product or not lead.product.strip():
+    if reason == RejectReason.MISSING_PRODUCT:
         return False, f"Lead {lead.name} missing product interest"
-
-    return True, ""
+    return False, f"Invalid phone for {lead.name}"
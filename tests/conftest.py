@@ -0,0 +1,63 @@
+"""Shared fixtures: test settings and a fake clock for the rate limiters."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.config import Settings
+from src.services import ai_client, rate_limiter, sms_dispatcher
+
+
+class FakeClock:
+    """Stands in for the ``time`` module; ``sleep`` advances the clock instantly."""
+
+    def __init__(self, start: float = 1_700_000_000.0):
+        self.now = start
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake clock for rate limiting and retries, with jitter fixed at its maximum."""
+    fake = FakeClock()
+    for module in (rate_limiter, ai_client, sms_dispatcher):
+        monkeypatch.setattr(module, "time", fake)
+    monkeypatch.setattr(rate_limiter, "random", SimpleNamespace(uniform=lambda low, high: high))
+    return fake
+
+
+@pytest.fixture
+def make_settings():
+    """Build Settings with dummy credentials; keyword arguments override fields."""
+    def make(**overrides) -> Settings:
+        values = dict(
+            google_sheet_id="test-sheet",
+            google_credentials_path="unused.json",
+            worksheet_name="Leads",
+            groq_api_key="test-key",
+            model_name="test-model",
+            max_tokens=100,
+            temperature=0.7,
+            twilio_account_sid="ACtest",
+            twilio_auth_token="test-token",
+            twilio_phone_number="+15550000000",
+            twilio_phone_numbers=["+15550000000"],
+            generation_cache=False,
+            groq_rpm=0,
+            groq_tpm=0,
+            journal_path=None,
+            outbox_path=None,
+        )
+        values.update(overrides)
+        return Settings(**values)
+    return make
@@ -0,0 +1,77 @@
+"""Tests for the compiled SMS agent and its per-client cache."""
+
+import asyncio
+import gc
+import weakref
+
+from src.agent import AgentOptions, get_agent
+from src.agent.graph import SMSAgent
+from src.models import Lead
+
+
+class StubGroqClient:
+    """Answers async requests only, so sync generation fails loudly."""
+
+    def __init__(self):
+        self.async_calls = 0
+
+    def generate(self, system_prompt, user_prompt):
+        raise AssertionError("abatch must use the async client")
+
+    async def agenerate(self, system_prompt, user_prompt):
+        self.async_calls += 1
+        await asyncio.sleep(0)
+        return "Hi! The desk you liked is back in stock."
+
+
+def make_leads(count):
+    return [Lead(row_number=i + 2, name=f"Lead{i}", phone="+15550000000", product="Desk")
+            for i in range(count)]
+
+
+def test_abatch_runs_every_lead_on_the_async_path():
+    client = StubGroqClient()
+    leads = make_leads(5)
+
+    states = asyncio.run(SMSAgent(client).abatch(leads, max_concurrency=2))
+
+    assert [state["lead"] for state in states] == leads
+    assert all(state["error"] is None and state["generated_sms"] for state in states)
+    assert all(state["updated_history"] for state in states)
+    assert client.async_calls == 5
+
+
+def test_abatch_of_no_leads():
+    assert asyncio.run(SMSAgent(StubGroqClient()).abatch([])) == []
+
+
+def test_agents_are_cached_per_client_and_options():
+    client = StubGroqClient()
+    agent = get_agent(client)
+
+    assert get_agent(client) is agent
+    assert get_agent(client, AgentOptions(template_reuse=True)) is not agent
+    assert get_agent(StubGroqClient()) is not agent
+
+
+def test_cached_agent_does_not_keep_its_client_alive():
+    client = StubGroqClient()
+    agent = get_agent(client)
+    asyncio.run(agent.abatch(make_leads(1)))
+    ref = weakref.ref(client)
+
+    del client, agent
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_cached_agent_never_compiles():
+    from src.agent.graph import cached_agent
+
+    client = StubGroqClient()
+    assert cached_agent(client) is None
+
+    agent = get_agent(client)
+    assert cached_agent(client) is agent
+    assert cached_agent(client, AgentOptions(template_reuse=True)) is None
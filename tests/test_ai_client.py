@@ -0,0 +1,172 @@
+"""Tests for Groq request retries, backoff and rate limiting."""
+
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from src.services import GroqClient
+from src.services.rate_limiter import RateLimiter, RetryPolicy, parse_retry_after
+
+
+def completion(text="Hi Ann!", total_tokens=None):
+    body = {"choices": [{"message": {"role": "assistant", "content": f" {text} "}}]}
+    if total_tokens is not None:
+        body["usage"] = {"total_tokens": total_tokens}
+    return httpx.Response(200, json=body)
+
+
+class FakeGroqAPI:
+    """Replays queued responses (or raises queued errors) and records requests."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(json.loads(request.content))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def make_client(make_settings, clock):
+    clients = []
+
+    def make(api, **overrides):
+        client = GroqClient(make_settings(**overrides))
+        client._client = httpx.Client(transport=httpx.MockTransport(api), headers=client.headers)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+def test_successful_request(make_client):
+    api = FakeGroqAPI(completion("Hi Ann!"))
+
+    assert make_client(api).generate("system", "user") == "Hi Ann!"
+    assert api.requests[0]["messages"][1] == {"role": "user", "content": "user"}
+
+
+def test_429_honours_retry_after(make_client, clock):
+    api = FakeGroqAPI(httpx.Response(429, headers={"retry-after": "7"}), completion())
+    client = make_client(api)
+
+    assert client.generate("system", "user") == "Hi Ann!"
+    assert len(api.requests) == 2
+    # retry-after plus at most base_delay of jitter
+    assert clock.sleeps == [7 + client.retry_policy.base_delay]
+
+
+def test_429_pauses_every_caller_sharing_the_client(make_client, clock):
+    client = make_client(FakeGroqAPI())
+
+    delay = client._retry_delay(0, httpx.Response(429, headers={"retry-after": "5"}))
+
+    assert delay == 5.5
+    assert client.rate_limiter.reserve(0) == 5
+    clock.sleep(5)
+    assert client.rate_limiter.reserve(0) == 0
+
+
+def test_retry_gives_up_after_max_retries(make_client):
+    client = make_client(FakeGroqAPI(), groq_max_retries=2)
+
+    assert client._retry_delay(1, httpx.Response(503)) is not None
+    assert client._retry_delay(2, httpx.Response(503)) is None
+    assert client._retry_delay(2) is None
+
+
+def test_server_errors_back_off_exponentially_then_give_up(make_client, clock):
+    api = FakeGroqAPI(*[httpx.Response(503) for _ in range(4)])
+    client = make_client(api, groq_max_retries=3)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        client.generate("system", "user")
+
+    assert len(api.requests) == 4
+    assert clock.sleeps == [0.5, 1.0, 2.0]
+
+
+def test_client_errors_are_not_retried(make_client, clock):
+    api = FakeGroqAPI(httpx.Response(400, json={"error": {"message": "bad request"}}))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        make_client(api).generate("system", "user")
+
+    assert len(api.requests) == 1
+    assert clock.sleeps == []
+
+
+def test_transport_errors_are_retried(make_client, clock):
+    api = FakeGroqAPI(httpx.ConnectError("refused"), httpx.ReadTimeout("slow"), completion())
+
+    assert make_client(api).generate("system", "user") == "Hi Ann!"
+    assert len(api.requests) == 3
+    assert clock.sleeps == [0.5, 1.0]
+
+
+def test_backoff_is_capped():
+    policy = RetryPolicy(base_delay=0.5, max_delay=4.0)
+
+    for attempt in range(10):
+        assert 0 <= policy.delay(attempt) <= 4.0
+    assert policy.delay(3, retry_after=10) <= 10.5
+
+
+def test_parse_retry_after(clock):
+    later = datetime.fromtimestamp(clock.now + 30, tz=timezone.utc)
+
+    assert parse_retry_after("12") == 12
+    assert parse_retry_after("-3") == 0
+    assert parse_retry_after(format_datetime(later, usegmt=True)) == pytest.approx(30)
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_request_and_token_limits(clock):
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=600)
+
+    assert limiter.reserve(600) == 0
+    # Token bucket empty: 60 more tokens refill at 10/s
+    assert limiter.reserve(60) == pytest.approx(6)
+    clock.sleep(6)
+    assert limiter.reserve(0) == 0
+
+
+def test_requests_per_minute(clock):
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=0)
+
+    waits = [limiter.reserve(0) for _ in range(61)]
+
+    assert waits[:60] == [0] * 60
+    assert waits[60] == pytest.approx(1)
+
+
+def test_actual_token_usage_is_settled(make_client, clock):
+    api = FakeGroqAPI(completion(total_tokens=20))
+    client = make_client(api, groq_tpm=600)
+
+    client.generate("system", "user")
+
+    # The estimate (prompt/4 + max_tokens) was refunded down to the 20 used
+    assert client.rate_limiter.reserve(580) == 0
+    assert client.rate_limiter.reserve(1) > 0
+
+
+def test_unsettled_estimate_stays_reserved(make_client, clock):
+    api = FakeGroqAPI(completion())
+    client = make_client(api, groq_tpm=600)
+
+    client.generate("system", "user")
+
+    estimate = (len("system") + len("user")) // 4 + client.max_tokens
+    assert client.rate_limiter.reserve(600 - estimate - 1) == 0
+    assert client.rate_limiter.reserve(2) > 0
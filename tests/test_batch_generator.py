@@ -0,0 +1,143 @@
+"""Tests for batched generation and its per-lead fallback."""
+
+import json
+import threading
+
+import pytest
+
+from src.services.batch_generator import BatchGenerator
+from src.services.generation_cache import GenerationCache
+
+
+class StubGroqClient:
+    """Groq client whose batch replies are built by a scripted function."""
+
+    max_tokens = 100
+
+    def __init__(self, reply, cache=None):
+        self.reply = reply
+        self.cache = cache
+        self.batch_sizes = []
+        self.singles = []
+
+    def cache_key(self, system_prompt, user_prompt):
+        if self.cache is None:
+            return None
+        return GenerationCache.key("test-model", 0.7, system_prompt, user_prompt)
+
+    def generate_json(self, system_prompt, user_prompt, max_tokens=None):
+        requests = json.loads(user_prompt)["requests"]
+        self.batch_sizes.append(len(requests))
+        assert max_tokens == self.max_tokens * len(requests)
+        return self.reply({r["id"]: r["task"] for r in requests})
+
+    def generate(self, system_prompt, user_prompt, use_cache=True):
+        assert not use_cache
+        self.singles.append(user_prompt)
+        return f"single: {user_prompt}"
+
+
+def generate_all(generator, tasks):
+    """Call ``generate`` from one thread per task, like the graph workers."""
+    results = {}
+
+    def worker(task):
+        try:
+            results[task] = generator.generate("Be brief.", task)
+        except Exception as e:
+            results[task] = e
+
+    threads = [threading.Thread(target=worker, args=(task,)) for task in tasks]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def answer_all(tasks):
+    return {"messages": {id: f"batch: {task}" for id, task in tasks.items()}}
+
+
+def test_concurrent_callers_share_one_request():
+    client = StubGroqClient(answer_all)
+    generator = BatchGenerator(client, batch_size=3, max_wait=5)
+
+    results = generate_all(generator, ["a", "b", "c"])
+
+    assert results == {"a": "batch: a", "b": "batch: b", "c": "batch: c"}
+    assert client.batch_sizes == [3]
+    assert generator.stats() == {"batches": 1, "fallbacks": 0}
+
+
+def test_partial_batch_is_sent_after_max_wait():
+    client = StubGroqClient(answer_all)
+    generator = BatchGenerator(client, batch_size=8, max_wait=0.01)
+
+    assert generator.generate("Be brief.", "a") == "single: a"
+    assert client.batch_sizes == []
+
+
+def test_missing_and_invalid_items_fall_back_to_single_requests():
+    def partial(tasks):
+        ids = sorted(tasks, key=lambda id: tasks[id])
+        return {"messages": {ids[0]: f"batch: {tasks[ids[0]]}", ids[1]: "  ", ids[2]: 42}}
+
+    client = StubGroqClient(partial)
+    generator = BatchGenerator(client, batch_size=4, max_wait=5)
+
+    results = generate_all(generator, ["a", "b", "c", "d"])
+
+    assert results == {"a": "batch: a", "b": "single: b", "c": "single: c", "d": "single: d"}
+    assert sorted(client.singles) == ["b", "c", "d"]
+    assert generator.stats() == {"batches": 1, "fallbacks": 3}
+
+
+@pytest.mark.parametrize("reply", [
+    lambda tasks: {"messages": ["not", "a", "dict"]},
+    lambda tasks: {"unexpected": "shape"},
+])
+def test_malformed_response_falls_back_for_every_item(reply):
+    client = StubGroqClient(reply)
+    generator = BatchGenerator(client, batch_size=2, max_wait=5)
+
+    assert generate_all(generator, ["a", "b"]) == {"a": "single: a", "b": "single: b"}
+    assert generator.stats() == {"batches": 1, "fallbacks": 2}
+
+
+def test_failed_batch_request_falls_back_for_every_item():
+    def fail(tasks):
+        raise ValueError("Groq returned invalid JSON")
+
+    generator = BatchGenerator(StubGroqClient(fail), batch_size=2, max_wait=5)
+
+    assert generate_all(generator, ["a", "b"]) == {"a": "single: a", "b": "single: b"}
+
+
+def test_error_policy_fails_unanswered_items():
+    def first_only(tasks):
+        id = min(tasks, key=lambda id: tasks[id])
+        return {"messages": {id: f"batch: {tasks[id]}"}}
+
+    client = StubGroqClient(first_only)
+    generator = BatchGenerator(client, batch_size=2, max_wait=5, fallback="error")
+
+    results = generate_all(generator, ["a", "b"])
+
+    assert results["a"] == "batch: a"
+    assert isinstance(results["b"], ValueError)
+    assert client.singles == []
+
+
+def test_unknown_fallback_policy_is_rejected():
+    with pytest.raises(ValueError):
+        BatchGenerator(StubGroqClient(answer_all), fallback="retry")
+
+
+def test_cached_generations_skip_the_batch():
+    client = StubGroqClient(answer_all, cache=GenerationCache())
+    generator = BatchGenerator(client, batch_size=2, max_wait=5)
+    generate_all(generator, ["a", "b"])
+
+    assert generator.generate("Be brief.", "a") == "batch: a"
+    assert client.batch_sizes == [2]
@@ -0,0 +1,74 @@
+"""Tests for the structured Chat History cell."""
+
+import pytest
+
+from src.models import ChatHistory, Lead
+from src.models.chat_history import EMPTY_HISTORY
+
+
+CELL = (
+    "[2024-05-01 10:00] ASSISTANT: Hey! Still interested?\n"
+    "[2024-05-01 12:30] CUSTOMER: Yes, what colours\n"
+    "do you have?"
+)
+
+
+def test_parse_and_format_round_trip():
+    history = ChatHistory.parse(CELL)
+
+    assert history.to_text() == CELL
+    assert len(history) == 2
+    assert history[0].role == "ASSISTANT"
+    assert history.last.is_customer
+    assert history.last.timestamp == "2024-05-01 12:30"
+    # Lines that don't start an entry continue the previous message
+    assert history.last.message == "Yes, what colours\ndo you have?"
+
+
+def test_leading_line_without_header_is_kept():
+    history = ChatHistory.parse("note from the shop\n[2024-05-01 10:00] CUSTOMER: hi")
+
+    assert history[0].role is None
+    assert history[0].message == "note from the shop"
+    assert history.to_text() == "note from the shop\n[2024-05-01 10:00] CUSTOMER: hi"
+
+
+@pytest.mark.parametrize("cell", [None, "", "  \n "])
+def test_blank_cells_share_empty_history(cell):
+    history = ChatHistory.parse(cell)
+
+    assert history is EMPTY_HISTORY
+    assert not history
+    assert history.last is None
+    assert history.to_text() == ""
+
+
+def test_empty_history_is_read_only():
+    with pytest.raises(TypeError):
+        EMPTY_HISTORY.append("assistant", "hi")
+
+    history = EMPTY_HISTORY.copy()
+    history.append("assistant", "hi", timestamp="2024-05-01 10:00")
+
+    assert history.to_text() == "[2024-05-01 10:00] ASSISTANT: hi"
+    assert not EMPTY_HISTORY
+
+
+def test_append_to_copy_leaves_original_unchanged():
+    original = ChatHistory.parse(CELL)
+    history = original.copy()
+    history.append("assistant", "We have red and blue.", timestamp="2024-05-01 13:00")
+
+    assert history.to_text() == CELL + "\n[2024-05-01 13:00] ASSISTANT: We have red and blue."
+    assert ChatHistory.parse(history.to_text()) == history
+    assert original.to_text() == CELL
+    assert len(original) == 2
+
+
+def test_lead_rows_parse_history():
+    lead = Lead.from_row(2, ["Ann Lee", "+15551234567", "Desk", "", "Hi", CELL])
+    blank = Lead.from_row(3, ["Bo", "+15551234568", "Desk"])
+
+    assert lead.needs_followup and lead.chat_history.to_text() == CELL
+    assert blank.chat_history is EMPTY_HISTORY
+    assert not blank.needs_followup
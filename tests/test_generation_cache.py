@@ -0,0 +1,171 @@
+"""Tests for the generation cache and single-flight template sharing."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.agent import AgentOptions, get_agent
+from src.models import Lead
+from src.prompts.first_message import TEMPLATE_NAME
+from src.services import generation_cache
+from src.services.generation_cache import GenerationCache
+from src.utils import SingleFlight
+
+
+@pytest.fixture(autouse=True)
+def fake_time(clock, monkeypatch):
+    monkeypatch.setattr(generation_cache, "time", clock)
+
+
+def test_key_covers_the_whole_request():
+    key = GenerationCache.key("model", 0.7, "system", "user")
+
+    assert key == GenerationCache.key("model", 0.7, "system", "user")
+    assert key != GenerationCache.key("model", 0.2, "system", "user")
+    assert key != GenerationCache.key("other", 0.7, "system", "user")
+    assert key != GenerationCache.key("model", 0.7, "system", "user 2")
+
+
+def test_hits_and_misses():
+    cache = GenerationCache()
+    assert cache.get("a") is None
+    cache.set("a", "Hi!")
+
+    assert cache.get("a") == "Hi!"
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1}
+
+
+def test_entries_expire(clock):
+    cache = GenerationCache(ttl=60)
+    cache.set("a", "Hi!")
+
+    clock.sleep(59)
+    assert cache.get("a") == "Hi!"
+    clock.sleep(1)
+    assert cache.get("a") is None
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = GenerationCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_entries_persist_between_runs(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = GenerationCache(path=path)
+    cache.set("a", "Hi!")
+    cache.close()
+
+    reopened = GenerationCache(max_entries=1, path=path)
+    assert reopened.get("a") == "Hi!"
+    reopened.close()
+
+
+def test_expired_rows_are_pruned_on_open(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    cache = GenerationCache(ttl=60, path=path)
+    cache.set("old", "1")
+    clock.sleep(30)
+    cache.set("new", "2")
+    cache.close()
+
+    clock.sleep(45)
+    reopened = GenerationCache(ttl=60, path=path)
+    (rows,) = reopened._db.execute("SELECT COUNT(*) FROM generations").fetchone()
+    assert rows == 1
+    assert reopened.get("new") == "2"
+    reopened.close()
+
+
+def test_single_flight_shares_one_call_between_threads():
+    flight = SingleFlight()
+    calls, arrived = [], []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return "template"
+
+    def worker():
+        arrived.append(1)
+        results.append(flight.get("key", compute))
+
+    results = []
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while len(arrived) < len(threads):
+        time.sleep(0.001)
+    time.sleep(0.05)  # Let the last arrivals reach the shared future
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["template"] * 8
+    assert len(calls) == 1
+    assert flight.get("key", compute) == "template"
+    assert len(calls) == 1
+
+
+def test_single_flight_shares_one_call_between_coroutines():
+    flight = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "template"
+
+    async def main():
+        return await asyncio.gather(*(flight.aget("key", compute) for _ in range(8)))
+
+    assert asyncio.run(main()) == ["template"] * 8
+    assert len(calls) == 1
+
+
+def test_single_flight_does_not_keep_failures():
+    flight = SingleFlight()
+
+    def fail():
+        raise RuntimeError("503")
+
+    with pytest.raises(RuntimeError):
+        flight.get("key", fail)
+    assert len(flight) == 0
+    assert flight.get("key", lambda: "template") == "template"
+
+
+class TemplateClient:
+    """Answers template prompts with the name placeholder."""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, system_prompt, user_prompt):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.01)
+        return f"Hi {TEMPLATE_NAME}! The desk you looked at is back in stock."
+
+
+def test_template_reuse_generates_once_per_product():
+    client = TemplateClient()
+    leads = [Lead(row_number=i + 2, name=f"Lead{i} Smith", phone="+15550000000", product="Desk")
+             for i in range(10)]
+
+    agent = get_agent(client, AgentOptions(template_reuse=True))
+    states = agent.batch(leads, max_concurrency=10)
+
+    assert client.calls == 1
+    assert states[3]["generated_sms"].startswith("Hi Lead3!")
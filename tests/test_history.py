@@ -0,0 +1,100 @@
+"""Tests for follow-up history windowing."""
+
+from src.models import ChatHistory
+from src.utils import HistoryManager
+from src.utils.history import estimate_tokens
+
+
+def conversation(turns):
+    """Alternating assistant/customer turns with numbered messages."""
+    history = ChatHistory()
+    for i in range(turns):
+        role = "CUSTOMER" if i % 2 else "ASSISTANT"
+        history.append(role, f"message {i}" + " about the oak desk" * 4, timestamp="2024-05-01 10:00")
+    return history
+
+
+def test_short_history_is_kept_verbatim():
+    manager = HistoryManager(max_tokens=400)
+    history = conversation(2)
+
+    assert manager.render(history) == history.to_text()
+    assert manager.render(history.to_text()) == history.to_text()
+    assert manager.stats() == {"truncated": 0, "tokens_saved": 0}
+
+
+def test_empty_history():
+    assert HistoryManager().render("") == "No previous conversation."
+    assert HistoryManager().render(None) == "No previous conversation."
+
+
+def test_long_history_keeps_latest_turns_and_summarises_the_rest():
+    manager = HistoryManager(max_tokens=120)
+    history = conversation(12)
+
+    text = manager.render(history)
+    lines = text.splitlines()
+
+    assert estimate_tokens(text) <= 120
+    assert lines[-1] == history.last.render()
+    kept = len(lines) - 1
+    assert lines[1:] == [turn.render() for turn in history.turns[-kept:]]
+    assert lines[0].startswith(f"(Earlier: {12 - kept} older messages; customer said ")
+    # Only what the customer said goes into the summary
+    latest_older = [t for t in history.turns[:12 - kept] if t.is_customer][-1]
+    assert lines[0].endswith(f'"{latest_older.message[:57]}...")')
+    assert "message 0" not in lines[0]
+
+
+def test_summary_snippets_are_shortened():
+    manager = HistoryManager(max_tokens=150)
+    history = ChatHistory()
+    history.append("CUSTOMER", "x" * 200, timestamp="2024-05-01 10:00")
+    history.append("ASSISTANT", "y" * 400, timestamp="2024-05-01 10:05")
+
+    summary = manager.render(history).splitlines()[0]
+
+    assert summary == f'(Earlier: 1 older messages; customer said "{"x" * 57}...")'
+
+
+def test_oldest_snippets_are_dropped_to_fit_the_budget():
+    manager = HistoryManager(max_tokens=60)
+    history = conversation(10)
+
+    summary = manager.render(history).splitlines()[0]
+
+    assert summary.startswith("(Earlier: ")
+    assert "message 1 " not in summary
+    assert estimate_tokens(summary) <= 60
+
+
+def test_windowing_without_summary():
+    manager = HistoryManager(max_tokens=120, summarize=False)
+    history = conversation(12)
+
+    text = manager.render(history)
+
+    assert estimate_tokens(text) <= 120
+    assert not text.startswith("(Earlier")
+    assert text.splitlines()[-1] == history.last.render()
+
+
+def test_latest_turn_is_always_kept():
+    manager = HistoryManager(max_tokens=10, summarize=False)
+    history = ChatHistory()
+    history.append("ASSISTANT", "Hi!", timestamp="2024-05-01 10:00")
+    history.append("CUSTOMER", "z" * 200, timestamp="2024-05-01 10:05")
+
+    assert manager.render(history) == history.last.render()
+
+
+def test_tokens_saved_are_tracked():
+    manager = HistoryManager(max_tokens=120)
+    history = conversation(12)
+
+    text = manager.render(history)
+    manager.render(history)
+
+    saved = estimate_tokens(history.to_text()) - estimate_tokens(text)
+    assert saved > 0
+    assert manager.stats() == {"truncated": 2, "tokens_saved": 2 * saved}
@@ -0,0 +1,134 @@
+"""Tests for the local SQLite mirror of the lead sheet."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.models import Lead
+from src.services.lead_store import LeadStore, last_activity
+
+
+HISTORY = (
+    "[2024-05-01 10:00] ASSISTANT: Hi Ann!\n"
+    "[2024-05-03 09:30] CUSTOMER: Still have the desk?"
+)
+
+
+def lead(row, phone="+15551234567", sms_sent="", history="", last_visit="", name="Ann"):
+    return Lead.from_row(row, [name, phone, "Desk", last_visit, sms_sent, history])
+
+
+class FakeSheetHandler:
+    """Collects queued updates; flushing reports them written (or failed)."""
+
+    def __init__(self, fail_rows=()):
+        self.fail_rows = set(fail_rows)
+        self.queued = []
+        self.write_results = []
+
+    def queue_update(self, row_number, sms_sent, chat_history):
+        self.queued.append((row_number, sms_sent, chat_history))
+
+    def flush_updates(self):
+        for row_number, _, _ in self.queued:
+            self.write_results.append(SimpleNamespace(
+                row_number=row_number, success=row_number not in self.fail_rows,
+            ))
+        self.queued = []
+
+
+@pytest.fixture
+def store():
+    with LeadStore(":memory:", default_country_code="1") as store:
+        yield store
+
+
+def test_last_activity_prefers_history_timestamps():
+    assert last_activity(lead(2, history=HISTORY, last_visit="2024-04-01")) == "2024-05-03 09:30"
+    assert last_activity(lead(2, last_visit="2024-04-01")) == "2024-04-01"
+    assert last_activity(lead(2)) is None
+
+
+def test_leads_active_since(store):
+    store.pull([
+        lead(2, history=HISTORY),
+        lead(3, phone="+15550000003", last_visit="2024-04-01"),
+        lead(4, phone="+15550000004", last_visit="2024-05-02 12:00"),
+    ])
+
+    active = store.get_leads_active_since("2024-05-01")
+
+    # Most recent first
+    assert [l.row_number for l in active] == [2, 4]
+
+
+def test_phones_are_keyed_in_e164(store):
+    store.pull([lead(2, phone="(555) 123-4567"), lead(3, phone="call me")])
+
+    assert [l.row_number for l in store.get_leads_by_phone("+15551234567")] == [2]
+    assert [l.row_number for l in store.get_leads_by_phone("555.123.4567")] == [2]
+    assert store.get_leads_by_phone("call me") == []
+
+
+def test_pull_inserts_and_updates_rows(store):
+    assert store.pull([lead(2), lead(3, phone="+15550000003")]) == 2
+    store.pull([lead(2, sms_sent="Hi", history=HISTORY), lead(3, phone="+15550000003")])
+
+    updated = store.get_lead_by_row(2)
+    assert updated.sms_sent == "Hi"
+    assert updated.chat_history.to_text() == HISTORY
+    assert len(store) == 2
+    assert store.get_lead_by_row(99) is None
+
+
+def test_full_pull_removes_rows_missing_from_the_sheet(store):
+    store.pull([lead(2), lead(3, phone="+15550000003")])
+
+    store.pull([lead(2)], full=False)
+    assert len(store) == 2
+
+    store.pull([lead(2)])
+    assert len(store) == 1
+    assert store.get_lead_by_row(3) is None
+
+
+def test_selection_queries(store):
+    store.pull([
+        lead(2),
+        lead(3, phone="+15550000003", sms_sent="Hi", history=HISTORY),
+        lead(4, phone="+15550000004", sms_sent="Hi"),
+    ])
+
+    assert [l.row_number for l in store.get_leads_needing_contact()] == [2]
+    assert [l.row_number for l in store.get_leads_needing_followup()] == [3]
+
+
+def test_local_updates_stay_dirty_until_pushed(store):
+    store.pull([lead(2), lead(3, phone="+15550000003")])
+    store.record_update(2, "Hi Ann", "[2024-05-01 10:00] ASSISTANT: Hi Ann")
+    store.record_update(3, "Hi Bo", "[2024-05-01 10:00] ASSISTANT: Hi Bo")
+
+    # A pull from the (stale) sheet never overwrites unpushed updates
+    store.pull([lead(2), lead(3, phone="+15550000003")])
+    assert store.get_lead_by_row(2).sms_sent == "Hi Ann"
+    assert store.get_leads_needing_contact() == []
+
+    handler = FakeSheetHandler(fail_rows={3})
+    assert store.push(handler) == 1
+    assert [r.row_number for r in handler.write_results] == [2, 3]
+
+    # Row 2 is clean again, row 3 is retried by the next push
+    store.pull([lead(2), lead(3, phone="+15550000003")])
+    assert [l.row_number for l in store.get_leads_needing_contact()] == [2]
+    assert store.push(FakeSheetHandler()) == 1
+
+
+def test_store_persists_to_disk(tmp_path):
+    path = str(tmp_path / "leads.db")
+    with LeadStore(path) as store:
+        store.pull([lead(2, history=HISTORY)])
+        store.record_update(2, "Hi", HISTORY)
+
+    with LeadStore(path) as store:
+        assert store.get_lead_by_row(2).chat_history.to_text() == HISTORY
+        assert store.push(FakeSheetHandler()) == 1
@@ -0,0 +1,118 @@
+"""Tests for run metrics and their JSON and Prometheus reports."""
+
+import asyncio
+import json
+
+import pytest
+
+from src.utils.metrics import Metrics
+
+
+@pytest.fixture
+def registry():
+    registry = Metrics()
+    stage = registry.stage("groq.request")
+    for seconds in (0.02, 0.02, 0.3, 1.5):
+        stage.observe(seconds)
+    registry.count("groq.request", "retries", 2)
+    return registry
+
+
+def test_report_summarises_each_stage(registry):
+    report = registry.report()["stages"]["groq.request"]
+
+    assert report["calls"] == 4
+    assert report["errors"] == 0
+    assert report["retries"] == 2
+    assert report["seconds"] == pytest.approx(1.84)
+    assert report["mean_ms"] == pytest.approx(460.0)
+    assert report["max_ms"] == pytest.approx(1500.0)
+    assert report["histogram"]["0.025"] == 2
+    assert report["histogram"]["0.5"] == 1
+    assert report["histogram"]["2.5"] == 1
+    assert report["histogram"]["+Inf"] == 0
+    # Percentiles interpolate within the bucket, capped at the slowest call
+    assert 10.0 < report["p50_ms"] <= 25.0
+    assert report["p99_ms"] == pytest.approx(1500.0)
+
+
+def test_timer_counts_errors():
+    registry = Metrics()
+    with registry.timer("twilio.send"):
+        pass
+    with pytest.raises(RuntimeError):
+        with registry.timer("twilio.send"):
+            raise RuntimeError("503")
+
+    report = registry.report()["stages"]["twilio.send"]
+    assert report["calls"] == 2
+    assert report["errors"] == 1
+
+
+def test_timed_wraps_sync_and_async_functions():
+    registry = Metrics()
+
+    @registry.timed("node.generate")
+    def generate():
+        return "Hi"
+
+    @registry.timed("node.generate")
+    async def agenerate():
+        return "Hi"
+
+    assert generate() == "Hi"
+    assert asyncio.run(agenerate()) == "Hi"
+    assert registry.report()["stages"]["node.generate"]["calls"] == 2
+
+
+def test_disabled_registry_records_nothing():
+    registry = Metrics(enabled=False)
+    with registry.timer("sheets.read") as stage:
+        assert stage is None
+    registry.count("sheets.read", "rows", 10)
+
+    assert registry.report()["stages"] == {}
+
+
+def test_write_json(registry, tmp_path):
+    path = tmp_path / "metrics.json"
+    registry.write_json(str(path))
+
+    report = json.loads(path.read_text())
+    assert report["stages"]["groq.request"]["calls"] == 4
+    assert "started_at" in report and "duration_seconds" in report
+
+
+def test_prometheus_rendering(registry):
+    registry.count("twilio.send", "unconfirmed")
+    lines = registry.to_prometheus().splitlines()
+
+    assert lines[:2] == [
+        "# HELP roya_stage_duration_seconds Time spent per call of a pipeline stage.",
+        "# TYPE roya_stage_duration_seconds histogram",
+    ]
+    # Buckets are cumulative and end with +Inf equal to the count
+    assert 'roya_stage_duration_seconds_bucket{stage="groq.request",le="0.025"} 2' in lines
+    assert 'roya_stage_duration_seconds_bucket{stage="groq.request",le="1"} 3' in lines
+    assert 'roya_stage_duration_seconds_bucket{stage="groq.request",le="+Inf"} 4' in lines
+    assert 'roya_stage_duration_seconds_sum{stage="groq.request"} 1.84' in lines
+    assert 'roya_stage_duration_seconds_count{stage="groq.request"} 4' in lines
+    assert 'roya_stage_duration_seconds_count{stage="twilio.send"} 0' in lines
+
+    # One counter family per name, with a sample for every stage
+    assert lines[-7:] == [
+        "# TYPE roya_stage_errors_total counter",
+        'roya_stage_errors_total{stage="groq.request"} 0',
+        'roya_stage_errors_total{stage="twilio.send"} 0',
+        "# TYPE roya_stage_retries_total counter",
+        'roya_stage_retries_total{stage="groq.request"} 2',
+        "# TYPE roya_stage_unconfirmed_total counter",
+        'roya_stage_unconfirmed_total{stage="twilio.send"} 1',
+    ]
+
+def test_prometheus_prefix_and_file(registry, tmp_path):
+    assert registry.to_prometheus(prefix="sms").startswith("# HELP sms_stage_duration_seconds")
+
+    path = tmp_path / "metrics.prom"
+    registry.write_prometheus(str(path))
+    assert path.read_text() == registry.to_prometheus()
@@ -0,0 +1,122 @@
+"""Tests for building the run's work queue."""
+
+from src.models import Lead
+from src.utils.planning import Priority, WorkPlanner
+from src.utils.validators import RejectReason
+
+
+def new(row, phone, name="Ann"):
+    return Lead.from_row(row, [name, phone, "Desk"])
+
+
+def followup(row, phone):
+    return Lead.from_row(row, ["Bo", phone, "Desk", "", "Hi",
+                               "[2024-05-01 10:00] ASSISTANT: Hi Bo"])
+
+
+def reply(row, phone, timestamp):
+    return Lead.from_row(row, ["Cy", phone, "Desk", "", "Hi",
+                               f"[{timestamp}] CUSTOMER: still available?"])
+
+
+def test_queue_is_ordered_by_priority():
+    leads = [
+        new(2, "+15550000002"),
+        followup(3, "+15550000003"),
+        reply(4, "+15550000004", "2024-05-03 09:00"),
+        reply(5, "+15550000005", "2024-05-01 09:00"),
+        new(6, "+15550000006"),
+    ]
+
+    plan = WorkPlanner().plan(leads)
+
+    # Longest-waiting reply first, then new leads, then follow-ups
+    assert [lead.row_number for lead in plan.queue] == [5, 4, 2, 6, 3]
+    assert plan.counts == {Priority.REPLY: 2, Priority.NEW: 2, Priority.FOLLOWUP: 1}
+
+
+def test_contacted_leads_without_history_are_left_out():
+    contacted = Lead.from_row(2, ["Ann", "+15550000002", "Desk", "", "Hi"])
+
+    assert len(WorkPlanner().plan([contacted])) == 0
+
+
+def test_duplicate_phones_merge_into_highest_priority():
+    leads = [
+        new(2, "(555) 000-0007"),
+        reply(3, "+1 555 000 0007", "2024-05-01 09:00"),
+        new(2, "(555) 000-0007"),   # Same row listed twice
+    ]
+
+    plan = WorkPlanner(default_country_code="1").plan(leads)
+
+    assert [lead.row_number for lead in plan.queue] == [3]
+    assert [lead.row_number for lead in plan.duplicates] == [2]
+
+
+def test_caps_apply_per_type():
+    leads = [new(row, f"+1555000{row:04d}") for row in range(2, 6)]
+    leads += [followup(row, f"+1555000{row:04d}") for row in range(6, 9)]
+
+    plan = WorkPlanner(max_new=2, max_followups=1).plan(leads)
+
+    assert plan.counts[Priority.NEW] == 2
+    assert plan.counts[Priority.FOLLOWUP] == 1
+    assert [lead.row_number for lead in plan.queue] == [2, 3, 6]
+    assert [lead.row_number for lead in plan.deferred] == [4, 5, 7, 8]
+
+
+def test_max_leads_caps_the_whole_queue():
+    leads = [reply(2, "+15550000002", "2024-05-01 09:00")]
+    leads += [new(row, f"+1555000{row:04d}") for row in range(3, 6)]
+
+    plan = WorkPlanner(max_leads=2).plan(leads)
+
+    assert [lead.row_number for lead in plan.queue] == [2, 3]
+    assert len(plan.deferred) == 2
+
+
+def test_rejected_rows_keep_their_reason():
+    leads = [
+        new(2, "+15550000002", name=""),
+        new(3, "call after 5"),
+        Lead.from_row(4, ["Di", "+15550000004", ""]),
+        new(5, "+15550000005"),
+    ]
+
+    plan = WorkPlanner().plan(leads)
+
+    assert [(lead.row_number, reason) for lead, reason in plan.rejected] == [
+        (2, RejectReason.MISSING_NAME),
+        (3, RejectReason.INVALID_PHONE),
+        (4, RejectReason.MISSING_PRODUCT),
+    ]
+    assert "3 rejected" in plan.summary()
+
+
+def test_items_pair_leads_with_e164_numbers():
+    leads = [new(2, "(555) 000-0002"), reply(3, "00 44 7700 900123", "2024-05-01 09:00")]
+
+    plan = WorkPlanner(default_country_code="1").plan(leads)
+
+    assert [(lead.row_number, phone) for lead, phone in plan.items()] == [
+        (3, "+447700900123"),
+        (2, "+15550000002"),
+    ]
+
+
+def test_stream_keeps_sheet_order():
+    leads = [
+        new(2, "+15550000002"),
+        reply(3, "+15550000003", "2024-05-01 09:00"),
+        new(4, "555-000-0002"),     # Duplicate of row 2
+        new(5, "not a number"),
+        followup(6, "+15550000006"),
+        new(7, "+15550000007"),
+    ]
+
+    planner = WorkPlanner(max_new=1, default_country_code="1")
+    streamed = [(lead.row_number, phone) for lead, phone in planner.stream(leads)]
+
+    assert streamed == [(2, "+15550000002"), (3, "+15550000003"), (6, "+15550000006")]
+    assert [lead.row_number for lead, _ in WorkPlanner(max_leads=2).stream(leads)] == [2, 3]
@@ -0,0 +1,192 @@
+"""Tests for resuming interrupted runs from the journal and outbox."""
+
+from concurrent.futures import Future
+
+import pytest
+
+import main
+from src.config import MessageType
+from src.models import Lead
+from src.services.outbox import Outbox
+from src.services.run_journal import GENERATED, SENT, UNCONFIRMED, RunJournal
+from src.services.sms_sender import UnconfirmedSendError
+
+
+PHONE = "+15551234567"
+
+
+def make_lead(row_number=2, history=""):
+    return Lead.from_row(row_number, ["Ann Lee", PHONE, "Desk", "", "", history])
+
+
+def make_result(lead, sms="Hi Ann, the desk is back in stock!"):
+    return {
+        "lead": lead,
+        "message_type": MessageType.FIRST.value,
+        "generated_sms": sms,
+        "updated_history": f"[2024-05-01 10:00] ASSISTANT: {sms}",
+        "error": None,
+    }
+
+
+class FakeDispatcher:
+    """Records submitted messages and accepts them immediately."""
+
+    def __init__(self, error=None):
+        self.submitted = []
+        self.error = error
+
+    def submit(self, to, message):
+        self.submitted.append((to, message))
+        future = Future()
+        if self.error is not None:
+            future.set_exception(self.error)
+        else:
+            future.set_result(f"SM{len(self.submitted)}")
+        return future
+
+
+@pytest.fixture
+def journal(tmp_path):
+    with RunJournal(str(tmp_path / "journal.db"), "sheet-1") as journal:
+        yield journal
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    with Outbox(str(tmp_path / "outbox.db"), "sheet-1") as outbox:
+        yield outbox
+
+
+@pytest.fixture
+def no_agent(monkeypatch):
+    """Fail the test if a message is generated."""
+    import src.agent
+
+    def run_agent(*args, **kwargs):
+        raise AssertionError("the agent must not run")
+
+    monkeypatch.setattr(src.agent, "run_agent", run_agent)
+
+
+def test_journal_records_stages(journal):
+    lead = make_lead()
+    journal.generated(lead, make_result(lead))
+
+    entry = journal.get(lead)
+    assert journal.pending() == 1
+    assert entry.stage == GENERATED and not entry.sent
+    assert entry.result(lead)["generated_sms"] == make_result(lead)["generated_sms"]
+
+    journal.sent(lead.row_number, "SM42")
+    entry = journal.get(lead)
+    assert entry.stage == SENT and entry.sent
+    assert entry.message_sid == "SM42"
+
+
+def test_journal_drops_entries_for_changed_rows(journal):
+    lead = make_lead()
+    journal.generated(lead, make_result(lead))
+
+    replied = make_lead(history="[2024-05-02 09:00] CUSTOMER: still available?")
+    assert journal.get(replied) is None
+    assert journal.pending() == 0
+
+
+def test_persisted_only_drops_sent_entries(journal):
+    sent, generated = make_lead(2), make_lead(3)
+    journal.generated(sent, make_result(sent))
+    journal.generated(generated, make_result(generated))
+    journal.sent(sent.row_number, "SM1")
+
+    journal.persisted([sent.row_number, generated.row_number])
+
+    assert journal.get(sent) is None
+    assert journal.get(generated).stage == GENERATED
+
+
+def test_sent_entry_resumes_without_resending(journal, no_agent):
+    lead = make_lead()
+    journal.generated(lead, make_result(lead))
+    journal.sent(lead.row_number, "SM42")
+    dispatcher = FakeDispatcher()
+
+    outcome = main.process_lead(lead, PHONE, None, dispatcher, None, journal=journal)
+
+    assert dispatcher.submitted == []
+    assert outcome["status"] == "ok"
+    assert outcome["resumed"] == SENT
+    assert outcome["send_future"].result() == "SM42"
+
+
+def test_generated_entry_is_sent_without_regenerating(journal, no_agent):
+    lead = make_lead()
+    result = make_result(lead)
+    journal.generated(lead, result)
+    dispatcher = FakeDispatcher()
+
+    outcome = main.process_lead(lead, PHONE, None, dispatcher, None, journal=journal)
+
+    assert outcome["resumed"] == GENERATED
+    assert dispatcher.submitted == [(PHONE, result["generated_sms"])]
+    assert outcome["send_future"].result() == "SM1"
+    # Twilio accepted it, so a second interruption won't send it again
+    assert journal.get(lead).sent
+
+
+def test_unconfirmed_send_is_never_resent(journal, no_agent):
+    lead = make_lead()
+    journal.generated(lead, make_result(lead))
+    failing = FakeDispatcher(UnconfirmedSendError("Send may have succeeded: HTTP 503"))
+
+    outcome = main.process_lead(lead, PHONE, None, failing, None, journal=journal)
+    assert isinstance(outcome["send_future"].exception(), UnconfirmedSendError)
+    assert journal.get(lead).unconfirmed
+
+    dispatcher = FakeDispatcher()
+    outcome = main.process_lead(lead, PHONE, None, dispatcher, None, journal=journal)
+
+    assert dispatcher.submitted == []
+    assert outcome["status"] == "error"
+    assert outcome["resumed"] == UNCONFIRMED
+
+
+def test_failed_send_is_retried_next_run(journal, no_agent):
+    lead = make_lead()
+    journal.generated(lead, make_result(lead))
+    failing = FakeDispatcher(ValueError("Invalid 'To' number"))
+
+    main.process_lead(lead, PHONE, None, failing, None, journal=journal)
+
+    assert journal.get(lead).stage == GENERATED
+
+
+def test_outbox_draft_is_sent(outbox, no_agent):
+    lead = make_lead()
+    result = make_result(lead)
+    outbox.put(lead, result)
+    dispatcher = FakeDispatcher()
+
+    outcome = main.process_lead(lead, PHONE, None, dispatcher, None, outbox=outbox,
+                                drafts_only=True)
+
+    assert outcome["drafted"]
+    assert dispatcher.submitted == [(PHONE, result["generated_sms"])]
+
+
+def test_outbox_ignores_drafts_for_changed_rows(outbox, no_agent):
+    lead = make_lead()
+    outbox.put(lead, make_result(lead))
+    replied = make_lead(history="[2024-05-02 09:00] CUSTOMER: still available?")
+    dispatcher = FakeDispatcher()
+
+    assert outbox.get(lead) is not None
+    assert outbox.get(replied) is None
+
+    outcome = main.process_lead(replied, PHONE, None, dispatcher, None, outbox=outbox,
+                                drafts_only=True)
+    assert outcome["status"] == "skipped"
+    assert dispatcher.submitted == []
+
+    outbox.remove([lead.row_number])
+    assert len(outbox) == 0
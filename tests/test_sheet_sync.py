@@ -0,0 +1,119 @@
+"""Tests for incremental sync of changed sheet rows."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.config.constants import SHEET_HEADERS
+from src.services.sheet_sync import IncrementalSync, row_hash
+
+
+class FakeSheet:
+    """A worksheet's values plus its Drive modifiedTime; counts downloads."""
+
+    def __init__(self, rows, modified_time="2024-05-01T10:00:00Z", key="sheet-1:Leads"):
+        self.rows = [list(SHEET_HEADERS)] + [list(row) for row in rows]
+        self.modified_time = modified_time
+        self.downloads = 0
+        self.handler = SimpleNamespace(
+            target=SimpleNamespace(key=key),
+            settings=SimpleNamespace(default_country_code=""),
+            get_last_modified=lambda: self.modified_time,
+            worksheet=SimpleNamespace(get_all_values=self.get_all_values),
+        )
+
+    def get_all_values(self):
+        self.downloads += 1
+        return [list(row) for row in self.rows]
+
+    def edit(self, row_number, column, value, modified_time):
+        self.rows[row_number - 1][column] = value
+        self.modified_time = modified_time
+
+
+ROWS = [
+    ["Ann", "+15550000002", "Desk", "", "", ""],
+    ["Bo", "+15550000003", "Lamp", "", "", ""],
+    ["", "", "", "", "", ""],
+]
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    return str(tmp_path / "sync.json")
+
+
+def changed_rows(sheet, state_path, save=True):
+    sync = IncrementalSync(sheet.handler, state_path)
+    rows = [lead.row_number for lead in sync.changed_leads()]
+    if save:
+        sync.save()
+    return rows
+
+
+def test_row_hash_ignores_trailing_blank_cells():
+    assert row_hash(["Ann", "+1555", "Desk"]) == row_hash(["Ann", "+1555", "Desk", "", "", ""])
+    assert row_hash(["Ann", "+1555", "Desk"]) != row_hash(["Ann", "+1555", "Lamp"])
+
+
+def test_first_run_reports_every_named_row(state_path):
+    assert changed_rows(FakeSheet(ROWS), state_path) == [2, 3]
+
+
+def test_unchanged_modified_time_skips_the_download(state_path):
+    sheet = FakeSheet(ROWS)
+    changed_rows(sheet, state_path)
+
+    assert changed_rows(sheet, state_path) == []
+    assert sheet.downloads == 1
+
+
+def test_only_rows_with_a_new_hash_are_reported(state_path):
+    sheet = FakeSheet(ROWS)
+    changed_rows(sheet, state_path)
+
+    # Touched but not changed: downloaded, nothing reported
+    sheet.modified_time = "2024-05-01T11:00:00Z"
+    assert changed_rows(sheet, state_path) == []
+
+    sheet.edit(3, 2, "Floor Lamp", "2024-05-01T12:00:00Z")
+    assert changed_rows(sheet, state_path) == [3]
+    assert sheet.downloads == 3
+
+
+def test_acknowledged_writes_are_not_reported_as_changes(state_path):
+    sheet = FakeSheet(ROWS)
+    sync = IncrementalSync(sheet.handler, state_path)
+    sync.changed_leads()
+    sync.acknowledge(2, "Hi Ann", "[2024-05-01 10:05] ASSISTANT: Hi Ann")
+    sync.save()
+
+    sheet.edit(2, 4, "Hi Ann", "2024-05-01T10:05:00Z")
+    sheet.edit(2, 5, "[2024-05-01 10:05] ASSISTANT: Hi Ann", "2024-05-01T10:05:00Z")
+
+    assert changed_rows(sheet, state_path) == []
+
+
+def test_forgotten_rows_come_back_next_run(state_path):
+    sheet = FakeSheet(ROWS)
+    sync = IncrementalSync(sheet.handler, state_path)
+    sync.changed_leads()
+    sync.forget(3)
+    sync.save()
+
+    # Same modifiedTime, but the forgotten row forces a download
+    assert changed_rows(sheet, state_path) == [3]
+
+
+def test_worksheets_sharing_a_state_file_keep_their_own_state(state_path):
+    first = FakeSheet(ROWS, key="sheet-1:Leads")
+    second = FakeSheet(ROWS, key="sheet-2:Leads")
+    sync_first = IncrementalSync(first.handler, state_path)
+    sync_second = IncrementalSync(second.handler, state_path)
+    sync_first.changed_leads()
+    sync_second.changed_leads()
+    sync_first.save()
+    sync_second.save()
+
+    assert changed_rows(first, state_path) == []
+    assert changed_rows(second, state_path) == []
@@ -0,0 +1,119 @@
+"""Tests for batched write-back to the sheet."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.services import sheet_writer
+from src.services.sheet_writer import SheetWriteBuffer
+
+
+class FakeSpreadsheet:
+    """Records ``values_batch_update`` calls (optionally failing them)."""
+
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+
+    def values_batch_update(self, body):
+        self.calls.append(body)
+        if self.error is not None:
+            raise self.error
+
+
+@pytest.fixture
+def spreadsheet():
+    return FakeSpreadsheet()
+
+
+@pytest.fixture
+def worksheet(spreadsheet):
+    return SimpleNamespace(title="Leads", spreadsheet=spreadsheet)
+
+
+@pytest.fixture(autouse=True)
+def fake_time(clock, monkeypatch):
+    monkeypatch.setattr(sheet_writer, "time", clock)
+
+
+def test_rows_are_written_in_one_call(worksheet, spreadsheet):
+    buffer = SheetWriteBuffer(worksheet, max_rows=10)
+    buffer.add(3, "Hi Bo", "[2024-05-01 10:00] ASSISTANT: Hi Bo")
+    buffer.add(2, "Hi Ann", "[2024-05-01 10:00] ASSISTANT: Hi Ann")
+
+    assert spreadsheet.calls == []
+    results = buffer.flush()
+
+    assert [(r.row_number, r.success) for r in results] == [(2, True), (3, True)]
+    assert spreadsheet.calls == [{
+        "valueInputOption": "RAW",
+        "data": [
+            {"range": "'Leads'!E2", "values": [["Hi Ann"]]},
+            {"range": "'Leads'!F2", "values": [["[2024-05-01 10:00] ASSISTANT: Hi Ann"]]},
+            {"range": "'Leads'!E3", "values": [["Hi Bo"]]},
+            {"range": "'Leads'!F3", "values": [["[2024-05-01 10:00] ASSISTANT: Hi Bo"]]},
+        ],
+    }]
+
+
+def test_later_updates_replace_earlier_ones(worksheet, spreadsheet):
+    buffer = SheetWriteBuffer(worksheet)
+    buffer.add(2, "first", "history 1")
+    buffer.add(2, "second", "history 2")
+
+    assert len(buffer) == 1
+    buffer.flush()
+    assert [entry["values"] for entry in spreadsheet.calls[0]["data"]] == [[["second"]], [["history 2"]]]
+
+
+def test_flushes_when_full(worksheet, spreadsheet):
+    buffer = SheetWriteBuffer(worksheet, max_rows=2)
+
+    assert buffer.add(2, "a", "a") == []
+    results = buffer.add(3, "b", "b")
+
+    assert [r.row_number for r in results] == [2, 3]
+    assert len(spreadsheet.calls) == 1
+    assert len(buffer) == 0
+
+
+def test_flushes_when_the_oldest_update_is_too_old(worksheet, spreadsheet, clock):
+    buffer = SheetWriteBuffer(worksheet, max_rows=100, max_age=10)
+    buffer.add(2, "a", "a")
+    clock.sleep(9)
+    assert buffer.add(3, "b", "b") == []
+
+    clock.sleep(1)
+    results = buffer.add(4, "c", "c")
+
+    assert [r.row_number for r in results] == [2, 3, 4]
+
+
+def test_flushes_on_exit(worksheet, spreadsheet):
+    flushed = []
+    with SheetWriteBuffer(worksheet, on_flush=flushed.extend) as buffer:
+        buffer.add(2, "a", "a")
+        assert spreadsheet.calls == []
+
+    assert len(spreadsheet.calls) == 1
+    assert [r.row_number for r in flushed] == [2]
+
+
+def test_empty_flush_makes_no_call(worksheet, spreadsheet):
+    assert SheetWriteBuffer(worksheet).close() == []
+    assert spreadsheet.calls == []
+
+
+def test_failed_write_fails_every_row():
+    spreadsheet = FakeSpreadsheet(error=RuntimeError("quota exceeded"))
+    buffer = SheetWriteBuffer(SimpleNamespace(title="Leads", spreadsheet=spreadsheet))
+    buffer.add(2, "a", "a")
+    buffer.add(3, "b", "b")
+
+    results = buffer.flush()
+
+    assert [(r.row_number, r.success, r.error) for r in results] == [
+        (2, False, "quota exceeded"),
+        (3, False, "quota exceeded"),
+    ]
+    assert len(buffer) == 0
@@ -0,0 +1,92 @@
+"""Tests for SMS encoding, segment counts and message clean-up."""
+
+import pytest
+
+from src.utils.sms import GSM7, UCS2, clean_sms, fit_sms, sms_capacity, sms_info
+
+
+@pytest.mark.parametrize("length, segments", [
+    (0, 0), (1, 1), (160, 1), (161, 2), (306, 2), (307, 3),
+])
+def test_gsm7_segments(length, segments):
+    info = sms_info("a" * length)
+
+    assert info.encoding == GSM7
+    assert info.length == length
+    assert info.segments == segments
+
+
+def test_gsm7_extension_characters_count_twice():
+    info = sms_info("{" * 80)
+
+    assert info.encoding == GSM7
+    assert info.length == 160 and info.segments == 1
+    assert sms_info("€" + "a" * 159).segments == 2
+
+
+def test_escape_sequences_are_not_split_across_parts():
+    # 152 septets, then an extension character that would straddle the part
+    info = sms_info("a" * 152 + "€" + "a" * 10)
+
+    assert info.length == 164
+    assert info.segments == 2
+    assert sms_info("a" * 152 + "€" + "a" * 152).segments == 3
+
+
+@pytest.mark.parametrize("length, segments", [(70, 1), (71, 2), (134, 2), (135, 3)])
+def test_ucs2_segments(length, segments):
+    info = sms_info("ж" * length)
+
+    assert info.encoding == UCS2
+    assert info.segments == segments
+
+
+def test_emoji_take_two_units():
+    info = sms_info("Hi 😀")
+
+    assert info.encoding == UCS2
+    assert info.length == 5
+
+
+def test_capacity():
+    assert sms_capacity(GSM7) == 160
+    assert sms_capacity(GSM7, 2) == 306
+    assert sms_capacity(UCS2) == 70
+    assert sms_capacity(UCS2, 3) == 201
+
+
+def test_fit_sms_leaves_short_messages_alone():
+    assert fit_sms("Hi Ann, the desk is back!") == "Hi Ann, the desk is back!"
+
+
+def test_fit_sms_cuts_at_a_word_boundary():
+    text = " ".join(["word"] * 50)
+    fitted = fit_sms(text)
+
+    assert sms_info(fitted).segments == 1
+    assert fitted.endswith("word...")
+    assert len(fit_sms(text, max_segments=2)) > len(fitted)
+
+
+def test_fit_sms_drops_ucs2_characters_first():
+    text = "Hi Ann 😀 " + "x" * 100
+
+    assert fit_sms(text) == "Hi Ann " + "x" * 100
+
+
+def test_fit_sms_counts_extension_characters():
+    fitted = fit_sms("{} " * 60)
+
+    assert sms_info(fitted).segments == 1
+
+
+@pytest.mark.parametrize("raw, cleaned", [
+    ('"Hi Ann, the desk is back!"', "Hi Ann, the desk is back!"),
+    ("SMS: Hi Ann", "Hi Ann"),
+    ("Here's the message: 'Hi Ann'", "Hi Ann"),
+    ("[2024-05-01 10:00] ASSISTANT: Hi Ann", "Hi Ann"),
+    ("Hi Ann,\n\nit’s back — grab it…", "Hi Ann, it's back - grab it..."),
+    ('"Hi" and "bye"', '"Hi" and "bye"'),
+])
+def test_clean_sms(raw, cleaned):
+    assert clean_sms(raw) == cleaned
@@ -0,0 +1,127 @@
+"""Tests for SMS dispatch retries and per-sender pacing."""
+
+import pytest
+import requests
+from twilio.base.exceptions import TwilioRestException
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from src.services.sms_dispatcher import SMSDispatcher, is_transient
+from src.services.sms_sender import UnconfirmedSendError
+
+SENDERS = ["+15550000001", "+15550000002", "+15550000003"]
+
+
+def twilio_error(status):
+    return TwilioRestException(status, "https://api.twilio.com/Messages.json", msg=f"HTTP {status}")
+
+
+def refused():
+    reason = NewConnectionError(None, "Connection refused")
+    return requests.ConnectionError(MaxRetryError(None, "/Messages.json", reason))
+
+
+class StubSender:
+    """Twilio sender that fails with scripted errors before succeeding."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.sent = []
+
+    def send(self, to, message, from_number=None):
+        self.sent.append((to, from_number))
+        if self.errors:
+            raise self.errors.pop(0)
+        return f"SM{len(self.sent)}"
+
+
+@pytest.fixture
+def dispatch(clock):
+    dispatchers = []
+
+    def make(sender, **kwargs):
+        kwargs.setdefault("messages_per_second", 1000.0)
+        dispatcher = SMSDispatcher(sender, SENDERS[:1], workers=1, **kwargs)
+        dispatchers.append(dispatcher)
+        return dispatcher
+
+    yield make
+    for dispatcher in dispatchers:
+        dispatcher.close()
+
+
+@pytest.mark.parametrize("error", [
+    twilio_error(429),
+    requests.exceptions.ConnectTimeout("connect timed out"),
+    refused(),
+])
+def test_failures_before_twilio_accepted_the_message_are_retried(dispatch, clock, error):
+    sender = StubSender(error)
+
+    assert dispatch(sender).send("+15551234567", "Hi") == "SM2"
+    assert len(sender.sent) == 2
+    assert clock.sleeps == [0.5]
+
+
+def test_retries_are_limited(dispatch):
+    sender = StubSender(*[twilio_error(429)] * 3)
+
+    with pytest.raises(TwilioRestException):
+        dispatch(sender, max_retries=2).send("+15551234567", "Hi")
+    assert len(sender.sent) == 3
+
+
+def test_rejected_messages_are_not_retried(dispatch):
+    sender = StubSender(twilio_error(400))
+
+    with pytest.raises(TwilioRestException) as excinfo:
+        dispatch(sender).send("+15551234567", "Hi")
+    assert not isinstance(excinfo.value, UnconfirmedSendError)
+    assert len(sender.sent) == 1
+
+
+@pytest.mark.parametrize("error", [
+    twilio_error(500),
+    requests.exceptions.ReadTimeout("read timed out"),
+    requests.ConnectionError("connection reset by peer"),
+])
+def test_failures_after_the_request_was_sent_are_unconfirmed(dispatch, error):
+    sender = StubSender(error)
+
+    with pytest.raises(UnconfirmedSendError) as excinfo:
+        dispatch(sender).send("+15551234567", "Hi")
+    assert excinfo.value.__cause__ is error
+    assert len(sender.sent) == 1
+
+
+def test_is_transient_ignores_unrelated_errors():
+    assert not is_transient(ValueError("bad number"))
+
+
+def test_each_recipient_keeps_one_sender(clock):
+    sender = StubSender()
+    with SMSDispatcher(sender, SENDERS, messages_per_second=1000.0, workers=1) as dispatcher:
+        recipients = [f"+1555123{i:04d}" for i in range(30)]
+        for to in recipients * 2:
+            dispatcher.send(to, "Hi")
+
+    used = {}
+    for to, from_number in sender.sent:
+        assert used.setdefault(to, from_number) == from_number
+    assert set(used.values()) == set(SENDERS)
+    assert dispatcher.sender_for("+15551230000") == used["+15551230000"]
+
+
+def test_each_sender_is_paced_separately(clock):
+    sender = StubSender()
+    with SMSDispatcher(sender, SENDERS[:2], messages_per_second=1.0, workers=1) as dispatcher:
+        first, second = (
+            next(to for to in (f"+1555123{i:04d}" for i in range(100))
+                 if dispatcher.sender_for(to) == number)
+            for number in SENDERS[:2]
+        )
+        dispatcher.send(first, "Hi")
+        dispatcher.send(second, "Hi")
+        assert clock.sleeps == []
+
+        dispatcher.send(first, "Again")
+        assert clock.sleeps == [pytest.approx(1.0)]
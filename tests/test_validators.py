@@ -0,0 +1,79 @@
+"""Tests for phone normalisation and bulk lead validation."""
+
+import pytest
+
+from src.models import Lead
+from src.utils.validators import RejectReason, normalize_phone, normalize_phones, validate_leads
+
+
+@pytest.mark.parametrize("phone, country_code, expected", [
+    ("+15551234567", "", "+15551234567"),
+    ("+1 (555) 123-4567", "", "+15551234567"),
+    ("1.555.123.4567", "", "+15551234567"),
+    ("0044 7700 900123", "", "+447700900123"),
+    ("07700 900123", "44", "+447700900123"),
+    ("(555) 123-4567", "1", "+15551234567"),
+])
+def test_normalize_phone(phone, country_code, expected):
+    assert normalize_phone(phone, country_code) == expected
+
+
+@pytest.mark.parametrize("phone, country_code, reason", [
+    ("", "", RejectReason.MISSING_PHONE),
+    (None, "", RejectReason.MISSING_PHONE),
+    ("call after 5", "", RejectReason.INVALID_PHONE),
+    ("555-1234 ext 9", "1", RejectReason.INVALID_PHONE),
+    ("07700 900123", "", RejectReason.NO_COUNTRY_CODE),
+    ("+0 555 123 4567", "", RejectReason.NO_COUNTRY_CODE),
+    ("12345", "", RejectReason.PHONE_TOO_SHORT),
+    ("+1234567890123456", "", RejectReason.PHONE_TOO_LONG),
+])
+def test_normalize_phones_reject_reasons(phone, country_code, reason):
+    numbers, reasons = normalize_phones([phone], country_code)
+
+    assert numbers == [None]
+    assert reasons == [reason]
+
+
+def test_normalize_phones_keeps_rows_aligned():
+    numbers, reasons = normalize_phones(["+15551234567", "abc", "00447700900123", "line\nbreak"])
+
+    assert numbers == ["+15551234567", None, "+447700900123", None]
+    assert reasons == [None, RejectReason.INVALID_PHONE, None, RejectReason.INVALID_PHONE]
+
+
+def test_validate_leads_reports_first_failing_check():
+    leads = [
+        Lead.from_row(2, ["Ann", "+15551234567", "Desk"]),
+        Lead.from_row(3, ["", "bad", ""]),
+        Lead.from_row(4, ["Bo", "bad", ""]),
+        Lead.from_row(5, ["Cy", "+15551234568", "  "]),
+        Lead.from_row(6, ["Di", "", "Desk"]),
+    ]
+
+    validation = validate_leads(leads)
+
+    assert len(validation) == 5
+    assert validation.reasons == [
+        None,
+        RejectReason.MISSING_NAME,
+        RejectReason.INVALID_PHONE,
+        RejectReason.MISSING_PRODUCT,
+        RejectReason.MISSING_PHONE,
+    ]
+    # Rejected rows never hand out a number, even when the phone was fine
+    assert validation.phones == ["+15551234567", None, None, None, None]
+    assert validation.rejected == 4
+    assert validation.counts() == {
+        RejectReason.MISSING_NAME: 1,
+        RejectReason.INVALID_PHONE: 1,
+        RejectReason.MISSING_PRODUCT: 1,
+        RejectReason.MISSING_PHONE: 1,
+    }
+
+
+def test_validate_leads_uses_the_default_country_code():
+    leads = [Lead.from_row(2, ["Ann", "07700 900123", "Desk"])]
+
+    assert validate_leads(leads).reasons == [RejectReason.NO_COUNTRY_CODE]
+    assert validate_leads(leads, "44").phones == ["+447700900123"]